@@ -0,0 +1,149 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from config import DATA_DIR
+
+try:
+    import resource # 유닉스 전용 (Windows에서는 최대 메모리를 측정하지 않음)
+except ImportError:
+    resource = None
+
+# 벤치마크용 합성 CSV의 크기 (data/의 실제 파일은 수십 줄이라 차이가 드러나지 않음)
+DEFAULT_ROWS = {"characters": 200_000, "enemies": 500_000}
+GRADES = ["Common", "Rare", "Epic", "Legend", "Mythic"]
+ATTRIBUTES = ["Fire", "Water", "Earth", "Wind", "Electric", "Light", "Dark"]
+BIOMES = ["DemonSlayer", "Naruto", "OnePiece", "Bleach"]
+
+
+def write_synthetic_csvs(out_dir, rows):
+    """data/의 컬럼 구성을 그대로 따르는 대용량 CSV를 만듭니다. 반환값: {테이블명: 파일 경로}"""
+    rng = random.Random(0)
+    paths = {}
+    path = os.path.join(out_dir, "characters.csv")
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "origin", "grade", "attribute", "hp", "mp", "atk", "def", "agi", "sp_max",
+                         "description", "image", "sfx_type", "skill_name", "ult_name"])
+        for i in range(rows["characters"]):
+            writer.writerow([100 + i, f"캐릭터{i}", rng.choice(BIOMES), rng.choice(GRADES), rng.choice(ATTRIBUTES),
+                             rng.randint(100, 300), rng.randint(30, 80), rng.randint(20, 70), rng.randint(5, 30),
+                             rng.randint(10, 40), 100, f"대사, 번호 {i}!" if i % 7 else "", f"char_{i}.png",
+                             "SWORD", f"스킬{i}", f"궁극기{i}"])
+    paths["characters"] = path
+
+    path = os.path.join(out_dir, "enemies.csv")
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "biome", "tier", "role", "attribute", "hp", "atk", "def", "agi",
+                         "exp_reward", "image"])
+        for i in range(rows["enemies"]):
+            writer.writerow([1000 + i, f"적{i}", rng.choice(BIOMES), rng.randint(1, 5),
+                             "BOSS" if i % 50 == 0 else "MOB", rng.choice(ATTRIBUTES), rng.randint(30, 500),
+                             rng.randint(5, 60), rng.randint(1, 20), rng.randint(5, 30), rng.randint(5, 100),
+                             f"enemy_{i}.png"])
+    paths["enemies"] = path
+    return paths
+
+
+def load_with_pandas(conn, paths):
+    """기존 load_csv_to_db 방식: DataFrame으로 전부 읽은 뒤 DELETE + to_sql"""
+    import pandas as pd
+    for table_name, path in paths.items():
+        df = pd.read_csv(path, encoding='utf-8-sig')
+        conn.execute(f"DELETE FROM {table_name}")
+        df.to_sql(table_name, conn, if_exists='append', index=False)
+
+
+def load_with_csv(conn, paths):
+    """현재 방식: csv 모듈 스트리밍 + 스키마 타입 변환 + executemany"""
+    import database
+    cursor = conn.cursor()
+    for table_name, path in paths.items():
+        columns, rows = database.read_csv_rows(path, database.get_column_types(cursor, table_name))
+        database.insert_rows(cursor, table_name, columns, rows)
+
+
+def run_child(method, paths_json, db_path):
+    """[자식 프로세스] 한 가지 방식으로만 로드하고 소요 시간과 최대 메모리를 JSON으로 출력합니다."""
+    start = time.perf_counter()
+    import database
+    conn = sqlite3.connect(db_path)
+    database._create_master_tables(conn.cursor())
+    paths = json.loads(paths_json)
+    with conn:
+        (load_with_pandas if method == "pandas" else load_with_csv)(conn, paths)
+    rows = sum(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in paths)
+    conn.close()
+    result = {"load_sec": time.perf_counter() - start, "rows": rows}
+    if resource is not None:
+        result["maxrss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps(result))
+
+
+def measure(method, paths, work_dir):
+    """새 인터프리터에서 실행하여 import 시간과 메모리까지 포함해 측정합니다."""
+    db_path = os.path.join(work_dir, f"{method}.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", method,
+                          "--paths", json.dumps(paths), "--db", db_path],
+                         capture_output=True, text=True, env=env, check=True)
+    wall = time.perf_counter() - start
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["wall_sec"] = wall
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마스터 데이터 CSV 로더 벤치마크 (pandas vs csv 모듈)")
+    parser.add_argument("--characters", type=int, default=DEFAULT_ROWS["characters"])
+    parser.add_argument("--enemies", type=int, default=DEFAULT_ROWS["enemies"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", choices=["pandas", "csv"], help=argparse.SUPPRESS)
+    parser.add_argument("--paths", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.paths, args.db)
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = write_synthetic_csvs(work_dir, {"characters": args.characters, "enemies": args.enemies})
+        size_mb = sum(os.path.getsize(p) for p in paths.values()) / 1e6
+        print(f"[System] 합성 CSV {args.characters + args.enemies:,}행 ({size_mb:.1f}MB), {args.repeat}회 반복")
+
+        methods = ["csv"]
+        try:
+            import pandas  # noqa: F401
+            methods.insert(0, "pandas")
+        except ImportError:
+            print("[Warning] pandas가 설치되어 있지 않아 csv 방식만 측정합니다.")
+
+        # 실제 data/ 파일은 게임 시작 시간(import 포함) 비교용
+        datasets = [("data/", {"characters": os.path.join(DATA_DIR, "characters.csv"),
+                               "enemies": os.path.join(DATA_DIR, "enemies.csv")}),
+                    ("합성", paths)]
+
+        print("데이터  방식      전체(초)   로드(초)   최대 메모리(MB)   행 수")
+        for label, dataset in datasets:
+            for method in methods:
+                results = [measure(method, dataset, work_dir) for _ in range(args.repeat)]
+                best = min(results, key=lambda r: r["wall_sec"])
+                memory = (f"{max(r['maxrss_kb'] for r in results) / 1024:14.1f}" if "maxrss_kb" in best
+                          else f"{'-':>14s}")
+                print(f"{label:6s} {method:8s} {best['wall_sec']:8.2f}   {best['load_sec']:8.2f}   "
+                      f"{memory}   {best['rows']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import os
 SCREEN_WIDTH = 1280  # 게임 화면 가로 크기 (16:9 HD)
 SCREEN_HEIGHT = 720  # 게임 화면 세로 크기
 FPS = 60             # 초당 프레임 수 (높을수록 부드러움)
+DIRTY_RECT_RENDERING = False # [신규] True: 메뉴 화면(로비/덱/쿠폰/상점)에서 바뀐 영역만 다시 그림 (저사양 PC의 CPU 사용량 감소)
 TITLE = "DGFS: Dad's Game For Son (Ver 0.1)"
 
 # --- 색상 정의 (R, G, B) ---
@@ -78,6 +79,8 @@ GACHA_MULTI_DRAW_COUNT = 10 # 10연차 뽑기 횟수
 # 파일 경로 설정
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "dgfs.db")
+MASTER_DB_PATH = os.path.join(BASE_DIR, "master.db") # [신규] CSV에서 컴파일한 읽기 전용 마스터 데이터 DB
+MASTER_DB_MMAP_SIZE = 64 * 1024 * 1024 # [신규] 마스터 데이터 DB를 메모리 매핑할 최대 크기 (바이트)
 DATA_DIR = os.path.join(BASE_DIR, "data")
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 
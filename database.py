@@ -1,7 +1,204 @@
+import csv
+import json
 import sqlite3
-import pandas as pd
+import threading
+import hashlib
 import os
-from config import DB_PATH, DATA_DIR, DEFAULT_USER_ID, INITIAL_TICKETS
+from contextlib import contextmanager
+from urllib.request import pathname2url
+from config import DB_PATH, DATA_DIR, DEFAULT_USER_ID, INITIAL_TICKETS, MASTER_DB_PATH, MASTER_DB_MMAP_SIZE
+
+# [신규] 자주 쓰는 쿼리를 이름으로 등록해 둡니다.
+# 항상 같은 SQL 문자열로 실행되므로 sqlite3 연결의 prepared statement 캐시를 그대로 재사용합니다.
+STATEMENTS = {
+    "get_tickets": "SELECT tickets FROM users WHERE user_id=?",
+    "get_current_floor": "SELECT current_floor FROM users WHERE user_id=?",
+    "set_current_floor": "UPDATE users SET current_floor = ? WHERE user_id=?",
+    "set_tickets": "UPDATE users SET tickets = ? WHERE user_id=?",
+    "add_tickets": "UPDATE users SET tickets = tickets + ? WHERE user_id=?",
+    "count_selected": "SELECT COUNT(*) FROM inventory WHERE user_id=? AND is_selected=1",
+    "set_selected": "UPDATE inventory SET is_selected=? WHERE id=?",
+    "coupon_used": "SELECT 1 FROM used_coupons WHERE user_id=? AND coupon_id=?",
+    "use_coupon": "INSERT INTO used_coupons (user_id, coupon_id) VALUES (?, ?)",
+    "ensure_user": "INSERT OR IGNORE INTO users (user_id, tickets) VALUES (?, ?)",
+    "save_run_plan": "INSERT OR REPLACE INTO run_plans (user_id, seed, plan) VALUES (?, ?, ?)",
+    "load_run_plan": "SELECT seed, plan FROM run_plans WHERE user_id=?",
+    # [신규] 전투 시작 시 선택된 파티 로드 (영구 스탯이 NULL이면 기본 스탯 사용)
+    "load_party": """
+        SELECT 
+            c.name, c.mp as base_mp, c.sp_max, c.image, c.description, c.grade, 
+            c.sfx_type, c.skill_name, c.ult_name,
+            i.id as inv_id, i.level, i.exp,
+            i.current_hp, i.current_mp, i.current_sp,
+            COALESCE(i.total_max_hp, c.hp) as max_hp,
+            COALESCE(i.total_atk, c.atk) as atk,
+            COALESCE(i.total_agi, c.agi) as agi
+        FROM inventory i JOIN characters c ON i.char_id = c.id
+        WHERE i.user_id = ? AND i.is_selected = 1
+    """,
+    # [신규] 덱 화면 카드 목록 (등급순 → ID순)
+    "deck_cards": """
+        SELECT 
+            i.id as inv_id, i.level, i.exp, i.is_selected,
+            c.id as char_id, c.name, c.grade, c.description, c.image as image_path,
+            c.mp, c.sp_max, c.skill_name, c.sfx_type, c.ult_name,
+            COALESCE(i.total_max_hp, c.hp) as final_hp,
+            COALESCE(i.total_atk, c.atk) as final_atk,
+            COALESCE(i.total_agi, c.agi) as final_agi
+        FROM inventory i JOIN characters c ON i.char_id = c.id 
+        WHERE i.user_id=?
+        ORDER BY CASE UPPER(c.grade)
+            WHEN 'MYTHIC' THEN 0 WHEN 'LEGEND' THEN 1 WHEN 'SPECIAL' THEN 2
+            WHEN 'RARE' THEN 3 WHEN 'COMMON' THEN 4
+            ELSE 5 END, c.id
+    """,
+}
+
+
+class ConnectionManager:
+    """
+    [신규] 프로세스 전역에서 SQLite 연결을 재사용하는 싱글톤.
+    - 스레드마다 연결 하나를 열어 두고 계속 사용합니다. (sqlite3 연결은 스레드 간 공유 불가)
+    - PRAGMA 튜닝은 연결을 열 때 한 번만 적용합니다.
+    - 자동 트랜잭션을 끄고(isolation_level=None) transaction()으로 범위를 명시합니다.
+    - [신규] 읽기 전용 마스터 데이터 DB(master.db)를 'master'로 ATTACH 합니다. (characters, enemies)
+      마스터 DB가 교체되면 각 스레드의 연결은 트랜잭션 밖에서 다음에 접근할 때 다시 ATTACH 합니다.
+    """
+    _instance = None
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+    )
+    STATEMENT_CACHE_SIZE = 256
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ConnectionManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.db_path = DB_PATH
+        self.master_db_path = MASTER_DB_PATH
+        self._master_generation = 0 # 마스터 DB가 교체될 때마다 증가
+        self._local = threading.local()
+        self._initialized = True
+
+    @property
+    def connection(self):
+        """현재 스레드의 연결을 반환합니다. 처음 호출될 때만 연결을 엽니다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # uri=True: ATTACH에 immutable 등 URI 파라미터를 쓰기 위함 (일반 경로는 그대로 동작)
+            conn = sqlite3.connect(self.db_path, isolation_level=None, uri=True,
+                                   cached_statements=self.STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.pending = [] # 커밋 후 실행할 콜백
+            self._local.master_generation = None
+        if self._local.master_generation != self._master_generation and self._local.depth == 0:
+            self._attach_master(conn)
+        return conn
+
+    def _attach_master(self, conn):
+        if self._local.master_generation is not None:
+            try:
+                conn.execute("DETACH DATABASE master")
+            except sqlite3.OperationalError: # 이전에 마스터 DB 파일이 없어서 ATTACH하지 않은 경우
+                pass
+        attach_master_db(conn, self.master_db_path)
+        self._local.master_generation = self._master_generation
+
+    def release_master(self):
+        """
+        [신규] 마스터 DB 파일을 교체하기 전에 호출합니다. 시작할 때(DBWriter().start() 전)만 호출해야 합니다.
+        현재 스레드의 연결에서 바로 DETACH 하고(Windows에서는 열린 파일을 교체할 수 없음),
+        다른 스레드의 연결은 다음 접근 시 새 파일로 다시 ATTACH 하도록 표시만 합니다.
+        그 연결들은 트랜잭션 밖에서 다시 접근할 때까지 이전 파일을 열어 두므로, 다른 스레드가 DB를 쓰는 중에는 교체가 안전하지 않습니다.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.master_generation is not None:
+            try:
+                conn.execute("DETACH DATABASE master")
+            except sqlite3.OperationalError:
+                pass
+            self._local.master_generation = None
+        self._master_generation += 1
+
+    @contextmanager
+    def transaction(self):
+        """
+        명시적 트랜잭션 범위. 블록이 정상 종료되면 COMMIT, 예외가 나면 ROLLBACK 후 예외를 다시 던집니다.
+        중첩되면 SAVEPOINT로 처리하여 안쪽 블록만 되돌릴 수 있습니다.
+        """
+        conn = self.connection
+        local = self._local
+        depth = local.depth
+        pending_mark = len(local.pending)
+        savepoint = f"sp_{depth}"
+        conn.execute("BEGIN" if depth == 0 else f"SAVEPOINT {savepoint}")
+        local.depth = depth + 1
+        try:
+            yield conn.cursor()
+        except BaseException:
+            local.depth = depth
+            # 되돌린 범위에서 등록된 커밋 후 콜백은 버림
+            del local.pending[pending_mark:]
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        local.depth = depth
+        if depth > 0:
+            conn.execute(f"RELEASE {savepoint}")
+            return
+        conn.execute("COMMIT")
+        callbacks, local.pending = local.pending, []
+        for callback in callbacks:
+            callback()
+
+    def on_commit(self, callback):
+        """
+        [신규] 현재 트랜잭션이 커밋된 뒤 callback()을 실행하도록 예약합니다.
+        트랜잭션 밖(자동 커밋)에서 호출하면 바로 실행합니다.
+        """
+        self.connection # 연결 및 스레드 상태 초기화 보장
+        if self._local.depth == 0:
+            callback()
+        else:
+            self._local.pending.append(callback)
+
+    def execute(self, name, params=()):
+        """STATEMENTS에 등록된 쿼리를 실행하고 커서를 반환합니다."""
+        return self.connection.execute(STATEMENTS[name], params)
+
+    def executemany(self, name, seq_of_params):
+        """STATEMENTS에 등록된 쿼리를 여러 파라미터로 한 번에 실행합니다."""
+        return self.connection.executemany(STATEMENTS[name], seq_of_params)
+
+    def fetch_one(self, name, params=()):
+        return self.execute(name, params).fetchone()
+
+    def fetch_all(self, name, params=()):
+        return self.execute(name, params).fetchall()
+
+    def close(self):
+        """현재 스레드의 연결을 닫습니다. (게임 종료 시 호출)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+SCHEMA_VERSION = 6 # [신규] _run_migrations가 만드는 최신 스키마 버전 (PRAGMA user_version)
 
 def _run_migrations(cursor):
     """DB 스키마 버전을 확인하고 필요한 마이그레이션을 수행합니다."""
@@ -77,20 +274,94 @@ def _run_migrations(cursor):
             print(f"[Migration Error] V2 스키마 변경 실패: {e}")
             raise e
 
+    if db_version < 3:
+        # Version 3: 자주 쓰는 inventory 조회용 인덱스 추가
+        try:
+            print("[Migration] DB Version 2 -> 3. 'inventory' 인덱스 추가 시도...")
+            _create_indexes(cursor)
+            cursor.execute("PRAGMA user_version = 3")
+            print("[Migration] DB Version을 3으로 업데이트했습니다.")
+        except sqlite3.Error as e:
+            print(f"[Migration Error] V3 인덱스 추가 실패: {e}")
+            raise e
+
+    if db_version < 4:
+        # Version 4: 마스터 데이터 테이블을 master.db로 분리 (유저 DB에는 유저 데이터만 남김)
+        try:
+            print("[Migration] DB Version 3 -> 4. 마스터 데이터 테이블을 유저 DB에서 제거 시도...")
+            for table_name in ("characters", "enemies", "master_data_meta"):
+                cursor.execute(f"DROP TABLE IF EXISTS main.{table_name}")
+            cursor.execute("PRAGMA user_version = 4")
+            print("[Migration] DB Version을 4로 업데이트했습니다. (마스터 데이터는 시작 시 master.db로 컴파일)")
+        except sqlite3.Error as e:
+            print(f"[Migration Error] V4 마스터 데이터 분리 실패: {e}")
+            raise e
+
+    if db_version < 5:
+        # Version 5: used_coupons에 user_id 추가 (유저별 쿠폰 사용 기록)
+        try:
+            print("[Migration] DB Version 4 -> 5. 'used_coupons' 테이블에 user_id 추가 시도...")
+            cursor.execute("PRAGMA table_info(used_coupons)")
+            columns = [row[1] for row in cursor.fetchall()]
+            if 'user_id' not in columns:
+                cursor.execute("ALTER TABLE used_coupons RENAME TO used_coupons_old")
+                _create_tables(cursor)
+                # 기존 기록은 그동안 유일한 유저였던 기본 유저의 것으로 이전
+                cursor.execute("""
+                    INSERT INTO used_coupons (user_id, coupon_id, used_at)
+                    SELECT ?, coupon_id, used_at FROM used_coupons_old
+                """, (DEFAULT_USER_ID,))
+                cursor.execute("DROP TABLE used_coupons_old")
+                print("[Migration] 기존 쿠폰 사용 기록을 기본 유저로 이전 완료.")
+            cursor.execute("PRAGMA user_version = 5")
+            print("[Migration] DB Version을 5로 업데이트했습니다.")
+        except sqlite3.Error as e:
+            print(f"[Migration Error] V5 쿠폰 테이블 변경 실패: {e}")
+            raise e
+
+    if db_version < 6:
+        # Version 6: 파티 로드/덱 목록용 covering 인덱스로 교체
+        try:
+            print("[Migration] DB Version 5 -> 6. 'inventory' covering 인덱스로 교체 시도...")
+            _create_indexes(cursor)
+            cursor.execute("PRAGMA user_version = 6")
+            print("[Migration] DB Version을 6으로 업데이트했습니다.")
+        except sqlite3.Error as e:
+            print(f"[Migration Error] V6 인덱스 교체 실패: {e}")
+            raise e
+
+def _create_indexes(cursor):
+    """
+    [신규] 조회 성능용 인덱스를 생성합니다. 두 인덱스 모두 쿼리가 읽는 inventory 컬럼을 모두 담아(covering)
+    inventory 테이블을 다시 읽지 않습니다. (id는 rowid라 인덱스에 포함됨)
+    - idx_inventory_party: 파티 로드(load_party)와 로비의 선택 인원 수(count_selected)
+    - idx_inventory_deck: 덱 화면 카드 목록(deck_cards). ORDER BY는 characters의 등급순이라 인덱스로 정렬할 수 없습니다.
+    [수정] V3의 idx_inventory_user_selected(user_id, is_selected)는 load_party에서 행마다 테이블을 다시 읽어 교체합니다. (V6)
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_inventory_user_selected")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_inventory_party ON inventory
+            (user_id, is_selected, char_id, level, exp, current_hp, current_mp, current_sp,
+             total_max_hp, total_atk, total_agi)""")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_inventory_deck ON inventory
+            (user_id, char_id, is_selected, level, exp, total_max_hp, total_atk, total_agi)""")
+
 def _create_tables(cursor):
-    """[리팩토링] 테이블 생성 SQL을 별도 함수로 분리"""
+    """
+    [리팩토링] 테이블 생성 SQL을 별도 함수로 분리
+    [수정] 유저 데이터 테이블만 생성합니다. 마스터 데이터(characters, enemies)는 master.db에 있습니다.
+    """
     cursor.execute('''CREATE TABLE IF NOT EXISTS users (
             user_id TEXT PRIMARY KEY, gold INTEGER DEFAULT 0,
             gems INTEGER DEFAULT 0, tickets INTEGER DEFAULT 0, 
             current_floor INTEGER DEFAULT 1,
             tutorial_completed INTEGER DEFAULT 0)''')
+    # [수정] 쿠폰 사용 기록은 유저별 (같은 쿠폰을 프로필마다 한 번씩 사용 가능)
     cursor.execute('''CREATE TABLE IF NOT EXISTS used_coupons (
-            coupon_id TEXT PRIMARY KEY, used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    cursor.execute('''CREATE TABLE IF NOT EXISTS characters (
-            id INTEGER PRIMARY KEY, name TEXT, origin TEXT, grade TEXT, attribute TEXT, 
-            hp INTEGER, mp INTEGER, atk INTEGER, def INTEGER, agi INTEGER, sp_max INTEGER, 
-            description TEXT, image TEXT, sfx_type TEXT, skill_name TEXT, ult_name TEXT
-            )''')
+            user_id TEXT, coupon_id TEXT, used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, coupon_id))''')
+    # char_id는 master.characters를 가리키지만, DB 파일이 달라 FOREIGN KEY는 걸지 않습니다.
     cursor.execute('''CREATE TABLE IF NOT EXISTS inventory (
             id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, char_id INTEGER,
             is_selected INTEGER DEFAULT 0, 
@@ -98,75 +369,204 @@ def _create_tables(cursor):
             current_hp INTEGER, current_mp INTEGER, current_sp INTEGER,
             total_atk INTEGER, total_max_hp INTEGER, total_agi INTEGER,
             acquired_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(char_id) REFERENCES characters(id),
             UNIQUE(user_id, char_id))''')
+    # [신규] 등반 계획(RunPlan): 시드와 층별 적 구성을 압축해서 저장 (유저당 진행 중인 등반 1개)
+    cursor.execute('''CREATE TABLE IF NOT EXISTS run_plans (
+            user_id TEXT PRIMARY KEY, seed INTEGER, plan BLOB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+
+def _create_master_tables(cursor):
+    """[신규] 마스터 데이터 테이블 생성 SQL (master.db 컴파일 시 사용)"""
+    cursor.execute('''CREATE TABLE IF NOT EXISTS characters (
+            id INTEGER PRIMARY KEY, name TEXT, origin TEXT, grade TEXT, attribute TEXT, 
+            hp INTEGER, mp INTEGER, atk INTEGER, def INTEGER, agi INTEGER, sp_max INTEGER, 
+            description TEXT, image TEXT, sfx_type TEXT, skill_name TEXT, ult_name TEXT
+            )''')
     cursor.execute('''CREATE TABLE IF NOT EXISTS enemies (
             id INTEGER PRIMARY KEY, name TEXT, biome TEXT, tier INTEGER, 
             role TEXT, attribute TEXT, hp INTEGER, atk INTEGER,
             def INTEGER, agi INTEGER, exp_reward INTEGER, image TEXT)''')
+    # [신규] 마스터 데이터 CSV의 내용 해시 (변경이 없으면 시작 시 컴파일을 건너뜀)
+    cursor.execute('''CREATE TABLE IF NOT EXISTS master_data_meta (
+            table_name TEXT PRIMARY KEY, file_name TEXT, content_hash TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
 
 def init_db():
     """[수정] DB 초기화 시, 테이블 생성 후 마이그레이션을 실행하도록 순서 변경"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # 1. 테이블이 없다면 우선 생성
-        _create_tables(cursor)
-        
-        # 2. 생성된 테이블 스키마가 최신이 아니면 변경
-        _run_migrations(cursor)
+        with ConnectionManager().transaction() as cursor:
+            # 1. 테이블이 없다면 우선 생성
+            _create_tables(cursor)
+            
+            # 2. 생성된 테이블 스키마가 최신이 아니면 변경
+            _run_migrations(cursor)
 
-        cursor.execute("INSERT OR IGNORE INTO users (user_id, tickets) VALUES (?, ?)", (DEFAULT_USER_ID, INITIAL_TICKETS))
-        conn.commit()
+            ensure_user(cursor, DEFAULT_USER_ID)
         return True
     except sqlite3.Error as e:
         print(f"[Critical Error] DB 초기화 실패: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
+
+# [신규] 마스터 데이터(CSV → DB)가 갱신될 때마다 증가하는 버전. 메모리 캐시의 무효화 판단에 사용합니다.
+_master_data_version = 0
+
+def get_master_data_version():
+    """현재 마스터 데이터 버전을 반환합니다."""
+    return _master_data_version
+
+# [신규] CSV로 관리하는 마스터 데이터 (테이블명, 파일명)
+MASTER_DATA_FILES = (("characters", "characters.csv"), ("enemies", "enemies.csv"))
 
 def update_master_data_from_csv():
-    """[리팩토링] CSV 데이터를 DB에 로드하고, 성공/실패 여부를 반환"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        if not load_csv_to_db(conn, "characters", "characters.csv"):
-            return False
-        if not load_csv_to_db(conn, "enemies", "enemies.csv"):
+    """
+    [리팩토링] CSV 데이터를 DB에 로드하고, 성공/실패 여부를 반환
+    [수정] CSV는 csv 모듈로 한 줄씩 읽어 스키마 타입으로 변환합니다. (pandas 의존성 제거)
+    [수정] 마스터 데이터를 유저 DB가 아닌 별도의 읽기 전용 DB(master.db)로 컴파일합니다.
+    - 파일 해시가 master.db의 master_data_meta에 기록된 값과 모두 같으면 건너뜁니다.
+    - 바뀌었으면 임시 파일에 새로 만든 뒤 원자적으로 교체하므로, 유저 DB의 저널/WAL에는 마스터 데이터가 기록되지 않습니다.
+    [수정] 잘못된 줄이 하나라도 있으면 컴파일을 중단하고 기존 master.db를 그대로 씁니다. (해당 캐릭터/적이 사라지지 않도록)
+    [수정] 다른 프로세스(게임, 시뮬레이터, db_diagnostics)가 master.db를 열고 있어 교체에 실패해도(Windows) 기존 파일을 씁니다.
+    두 경우 모두 기존 master.db가 없으면 (최초 실행) False를 반환합니다. 다음 시작 때 다시 시도합니다.
+    """
+    file_hashes = {}
+    for table_name, file_name in MASTER_DATA_FILES:
+        file_path = os.path.join(DATA_DIR, file_name)
+        if not os.path.exists(file_path):
+            print(f"[Warning] {file_name} 없음")
             return False
-        conn.commit()
+        file_hashes[table_name] = _file_hash(file_path)
+
+    if _get_master_data_hashes() == file_hashes:
+        print("[System] 마스터 데이터 변경 없음 (컴파일 생략)")
         return True
+
+    tmp_path = MASTER_DB_PATH + ".tmp"
+    file_name = None
+    try:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            with conn:
+                cursor = conn.cursor()
+                _create_master_tables(cursor)
+                for table_name, file_name in MASTER_DATA_FILES:
+                    bad_lines = [] # 잘못된 줄을 모두 보고한 뒤 중단하기 위해 수집
+                    file_path = os.path.join(DATA_DIR, file_name)
+                    columns, rows = read_csv_rows(file_path, get_column_types(cursor, table_name), bad_lines=bad_lines)
+                    inserted = insert_rows(cursor, table_name, columns, rows)
+                    if bad_lines:
+                        raise ValueError(f"잘못된 줄 {len(bad_lines)}개 (줄 번호: {[line_no for line_no, _ in bad_lines]})")
+                    cursor.execute("""
+                        INSERT OR REPLACE INTO master_data_meta (table_name, file_name, content_hash, updated_at)
+                        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                    """, (table_name, file_name, file_hashes[table_name]))
+                    print(f"[System] {file_name} 컴파일 완료 ({inserted}행)")
+        finally:
+            conn.close()
+
+        ConnectionManager().release_master()
+        try:
+            os.replace(tmp_path, MASTER_DB_PATH)
+        except OSError as e: # Windows: 다른 프로세스가 master.db를 열고 있음
+            print(f"[Error] master.db 교체 실패: {e}")
+            return _keep_previous_master_db(tmp_path, "master.db를 사용 중인 다른 프로그램을 종료한 뒤 다시 실행하세요.")
+    except (ValueError, csv.Error) as e:
+        print(f"[Error] {file_name or 'master.db'} 컴파일 실패: {e}")
+        return _keep_previous_master_db(tmp_path, "CSV를 고친 뒤 다시 실행하세요.")
+    except OSError as e:
+        print(f"[Error] {file_name or 'master.db'} 컴파일 실패: {e}")
+        return False
     except sqlite3.Error as e:
-        print(f"[Critical Error] CSV 데이터 로딩 중 DB 오류: {e}")
+        print(f"[Critical Error] 마스터 데이터 컴파일 중 DB 오류: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
+
+    _on_master_data_changed()
+    return True
+
+def _keep_previous_master_db(tmp_path, hint):
+    """[신규] 컴파일/교체 실패 시 임시 파일을 지우고, 기존 master.db가 있으면 그대로 쓰도록 True를 반환합니다."""
+    _remove_quietly(tmp_path)
+    if os.path.exists(MASTER_DB_PATH):
+        print(f"[Warning] 기존 마스터 데이터(master.db)를 그대로 사용합니다. {hint}")
+        return True
+    return False
+
+def _remove_quietly(path):
+    """[신규] 파일이 있으면 지웁니다. (실패해도 무시)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def attach_master_db(conn, path=MASTER_DB_PATH):
+    """
+    [신규] 마스터 데이터 DB를 conn에 'master'로 ATTACH 합니다. (conn은 uri=True로 열려 있어야 함)
+    - immutable=1: 실행 중에는 파일이 바뀌지 않으므로 잠금과 변경 확인을 생략합니다. (교체는 새 파일로 원자적으로)
+    - mmap_size: 페이지를 메모리 매핑으로 읽어 페이지 캐시 복사 없이 조회합니다.
+    유저 DB에 같은 이름의 테이블이 없으므로 'characters', 'enemies'를 그대로 써도 master의 테이블을 가리킵니다.
+    파일이 아직 없으면 (최초 실행, 컴파일 전) False
+    """
+    if not os.path.exists(path):
+        return False
+    uri = f"file:{pathname2url(os.path.abspath(path))}?immutable=1"
+    conn.execute("ATTACH DATABASE ? AS master", (uri,))
+    conn.execute(f"PRAGMA master.mmap_size = {MASTER_DB_MMAP_SIZE}")
+    return True
+
+def _on_master_data_changed():
+    """[신규] 마스터 데이터 갱신(master.db 교체) 후 버전을 올리고, 메모리 저장소(MasterData)를 새 스냅샷으로 교체합니다."""
+    global _master_data_version
+    _master_data_version += 1
+    from game_systems.master_data import MasterData # 순환 참조 방지
+    MasterData.reload()
+
+def _file_hash(file_path):
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _get_master_data_hashes():
+    """master.db에 기록된 {테이블명: 파일 해시}. master.db가 없으면 빈 dict"""
+    try:
+        rows = ConnectionManager().connection.execute(
+            "SELECT table_name, content_hash FROM master.master_data_meta"
+        ).fetchall()
+    except sqlite3.OperationalError: # master.db가 아직 없음 (ATTACH 안 됨)
+        return {}
+    return {row[0]: row[1] for row in rows}
+
+def ensure_user(cursor, user_id, tickets=INITIAL_TICKETS):
+    """[신규] 유저(프로필) 행이 없으면 초기 티켓과 함께 만듭니다. 새로 만들었으면 True"""
+    cursor.execute(STATEMENTS["ensure_user"], (user_id, tickets))
+    return cursor.rowcount > 0
 
 def start_new_run(conn, user_id=DEFAULT_USER_ID):
     """[수정] '새로 시작' 시 호출. 영구 스탯은 유지하고 현재 상태(HP, MP 등)만 초기화"""
     cursor = conn.cursor()
-    cursor.execute("UPDATE users SET current_floor = 1 WHERE user_id=?", (user_id,))
+    cursor.execute(STATEMENTS["set_current_floor"], (1, user_id))
     # 영구 스탯(total_max_hp, total_atk, total_agi)은 제외하고 초기화
     cursor.execute("""
         UPDATE inventory SET 
             current_hp = NULL, current_mp = NULL, current_sp = NULL
         WHERE user_id=?
     """, (user_id,))
+    from game_systems.user_state import UserState # 순환 참조 방지
+    UserState.apply_on_commit(user_id, current_floor=1)
     print("[System] 새로운 등반을 시작합니다. (층 및 캐릭터 현재 상태 초기화)")
 
 def add_tickets(cursor, amount, user_id=DEFAULT_USER_ID):
     """[수정] DB의 티켓 수를 증가/감소시키는 함수. (커서 사용)"""
-    cursor.execute("UPDATE users SET tickets = tickets + ? WHERE user_id=?", (amount, user_id))
+    from game_systems.user_state import UserState # 순환 참조 방지
+    cursor.execute(STATEMENTS["add_tickets"], (amount, user_id))
+    UserState.add_on_commit(user_id, "tickets", amount)
 
 def get_tickets(user_id=DEFAULT_USER_ID):
     """[신규] 현재 사용자의 보유 티켓 수를 DB에서 조회하여 반환합니다."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT tickets FROM users WHERE user_id=?", (user_id,))
-    row = cursor.fetchone()
-    conn.close()
+    row = ConnectionManager().fetch_one("get_tickets", (user_id,))
     return row[0] if row else 0
 
 def update_character_stats(cursor, inv_id, level, exp, max_hp, atk, agi):
@@ -188,15 +588,15 @@ def add_character_to_inventory(cursor, char_id, user_id=DEFAULT_USER_ID):
     - 실패 시 (중복): (False, inv_id, char_name) 반환
     - 오류 시: (None, None, None) 반환
     """
+    from game_systems.master_data import MasterData # 순환 참조 방지
     try:
-        # 먼저 캐릭터의 기본 스탯과 이름을 가져옵니다.
-        cursor.execute("SELECT hp, atk, agi, name FROM characters WHERE id=?", (char_id,))
-        char_stats = cursor.fetchone()
-        if not char_stats:
+        # 먼저 캐릭터의 기본 스탯과 이름을 가져옵니다. (메모리의 마스터 데이터 사용)
+        char = MasterData.get_character(char_id)
+        if not char:
             print(f"[DB Error] 캐릭터 ID {char_id}를 찾을 수 없습니다.")
             return None, None, None
 
-        base_hp, base_atk, base_agi, char_name = char_stats
+        base_hp, base_atk, base_agi, char_name = char['hp'], char['atk'], char['agi'], char['name']
 
         # 인벤토리에 캐릭터 추가 시도
         cursor.execute("""
@@ -209,8 +609,6 @@ def add_character_to_inventory(cursor, char_id, user_id=DEFAULT_USER_ID):
 
     except sqlite3.IntegrityError: # UNIQUE 제약조건 위반 (중복)
         # 중복된 경우, 기존 inv_id와 캐릭터 이름을 찾아 반환합니다.
-        cursor.execute("SELECT name FROM characters WHERE id=?", (char_id,))
-        char_name = cursor.fetchone()[0]
         cursor.execute("SELECT id FROM inventory WHERE user_id=? AND char_id=?", (user_id, char_id))
         inv_id = cursor.fetchone()[0]
         return False, inv_id, char_name
@@ -218,83 +616,218 @@ def add_character_to_inventory(cursor, char_id, user_id=DEFAULT_USER_ID):
         print(f"[DB Error] 인벤토리 저장 실패: {e}")
         return None, None, None
 
+def add_characters_to_inventory(cursor, char_ids, user_id=DEFAULT_USER_ID):
+    """
+    [신규] 여러 캐릭터를 한 번에 인벤토리에 추가합니다. (뽑기 결과 일괄 저장용, 커서 사용)
+    - 이미 보유한 캐릭터를 쿼리 한 번으로 찾고, 새 캐릭터는 INSERT ... ON CONFLICT 한 번(executemany)으로 추가합니다.
+    - 뽑은 횟수와 관계없이 SELECT 2회 + INSERT 1회로 끝납니다.
+    반환값: {char_id: (inv_id, is_new)} (마스터 데이터에 없는 캐릭터는 빠짐)
+    """
+    from game_systems.master_data import MasterData # 순환 참조 방지
+    master = MasterData.get()
+    unique_ids = []
+    for char_id in dict.fromkeys(char_ids):
+        if master.get_character(char_id):
+            unique_ids.append(char_id)
+        else:
+            print(f"[DB Error] 캐릭터 ID {char_id}를 찾을 수 없습니다.")
+    if not unique_ids:
+        return {}
+
+    owned = _find_inventory_ids(cursor, user_id, unique_ids)
+    new_ids = [char_id for char_id in unique_ids if char_id not in owned]
+    result = {char_id: (inv_id, False) for char_id, inv_id in owned.items()}
+    if new_ids:
+        rows = []
+        for char_id in new_ids:
+            char = master.get_character(char_id)
+            rows.append((user_id, char_id, char['hp'], char['atk'], char['agi']))
+        cursor.executemany("""
+            INSERT INTO inventory (user_id, char_id, total_max_hp, total_atk, total_agi)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, char_id) DO NOTHING
+        """, rows)
+        result.update((char_id, (inv_id, True)) for char_id, inv_id in _find_inventory_ids(cursor, user_id, new_ids).items())
+    return result
+
+_FIND_INVENTORY_IDS_QUERY = """
+    SELECT char_id, id FROM inventory
+    WHERE user_id = ? AND char_id IN (SELECT value FROM json_each(?))
+"""
+
+def _find_inventory_ids(cursor, user_id, char_ids):
+    """유저가 보유한 char_ids의 inv_id를 쿼리 한 번으로 조회합니다. (개수 제한이 없도록 JSON 배열로 전달)"""
+    cursor.execute(_FIND_INVENTORY_IDS_QUERY, (user_id, json.dumps(list(char_ids))))
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
 def get_character_grade_by_id(cursor, char_id):
-    """ [신규] 캐릭터 ID로 등급을 조회합니다. (커서 사용) """
-    cursor.execute("SELECT grade FROM characters WHERE id=?", (char_id,))
-    result = cursor.fetchone()
-    return result[0] if result else None
+    """ [신규] 캐릭터 ID로 등급을 조회합니다. [수정] 메모리의 마스터 데이터에서 조회 (cursor는 호환용) """
+    from game_systems.master_data import MasterData # 순환 참조 방지
+    char = MasterData.get_character(char_id)
+    return char['grade'] if char else None
+
+# [수정] 캐릭터 기본 정보는 MasterData에서 가져오므로 inventory만 조회합니다. (characters JOIN 제거)
+_INVENTORY_DETAIL_QUERY = """
+    SELECT id as inv_id, char_id, level, exp,
+           current_hp, current_mp, current_sp,
+           total_atk, total_max_hp, total_agi
+    FROM inventory WHERE id = ?
+"""
+# [신규] 여러 inv_id를 한 번에 조회 (JSON 배열로 전달)
+_INVENTORY_DETAILS_QUERY = """
+    SELECT id as inv_id, char_id, level, exp,
+           current_hp, current_mp, current_sp,
+           total_atk, total_max_hp, total_agi
+    FROM inventory WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+def _merge_character_details(inv_row):
+    """inventory 행에 마스터 데이터의 캐릭터 기본 정보를 합쳐 상세 정보 dict를 만듭니다."""
+    from game_systems.master_data import MasterData # 순환 참조 방지
+    char = MasterData.get_character(inv_row['char_id'])
+    if not char:
+        print(f"[DB Error] 캐릭터 ID {inv_row['char_id']}를 찾을 수 없습니다.")
+        return None
+    details = {
+        "name": char['name'], "base_hp": char['hp'], "base_mp": char['mp'], "sp_max": char['sp_max'],
+        "base_atk": char['atk'], "base_agi": char['agi'],
+        "image": char['image'], "description": char['description'], "grade": char['grade'],
+        "sfx_type": char['sfx_type'], "skill_name": char['skill_name'], "ult_name": char['ult_name'],
+    }
+    details.update((key, inv_row[key]) for key in inv_row.keys() if key != "char_id")
+    return details
 
 def get_character_details_by_inv_id(inv_id):
     """[신규] inv_id로 캐릭터의 모든 상세 정보를 조회하여 FighterData 생성을 돕습니다."""
-    conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        # battle_data_handler._load_party_data와 거의 동일한 쿼리
-        query = """
-            SELECT 
-                c.name, c.hp as base_hp, c.mp as base_mp, c.sp_max, c.atk as base_atk, c.agi as base_agi,
-                c.image, c.description, c.grade, 
-                c.sfx_type, c.skill_name, c.ult_name,
-                i.id as inv_id, i.level, i.exp,
-                i.current_hp, i.current_mp, i.current_sp,
-                i.total_atk, i.total_max_hp, i.total_agi
-            FROM inventory i JOIN characters c ON i.char_id = c.id
-            WHERE i.id = ?
-        """
-        cursor.execute(query, (inv_id,))
-        row = cursor.fetchone()
-        return row
+        row = ConnectionManager().connection.execute(_INVENTORY_DETAIL_QUERY, (inv_id,)).fetchone()
+        return _merge_character_details(row) if row else None
     except sqlite3.Error as e:
         print(f"[DB Error] inv_id {inv_id}로 캐릭터 정보 조회 실패: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def get_character_details_by_inv_id_cursor(cursor, inv_id):
     """[신규] inv_id로 캐릭터의 모든 상세 정보를 조회하여 dict로 반환합니다. (커서 사용)"""
     try:
-        query = """
-            SELECT 
-                c.name, c.hp as base_hp, c.mp as base_mp, c.sp_max, c.atk as base_atk, c.agi as base_agi,
-                c.image, c.description, c.grade,
-                c.sfx_type, c.skill_name, c.ult_name,
-                i.id as inv_id, i.level, i.exp,
-                i.current_hp, i.current_mp, i.current_sp,
-                i.total_atk, i.total_max_hp, i.total_agi
-            FROM inventory i JOIN characters c ON i.char_id = c.id
-            WHERE i.id = ?
-        """
-        cursor.execute(query, (inv_id,))
+        cursor.execute(_INVENTORY_DETAIL_QUERY, (inv_id,))
         row = cursor.fetchone()
         if not row:
             return None
-        
-        # Manually create a dict to simulate sqlite3.Row
+        # Row 팩토리가 없는 커서도 지원하도록 컬럼명으로 dict를 만듭니다.
         column_names = [description[0] for description in cursor.description]
-        return dict(zip(column_names, row))
+        return _merge_character_details(dict(zip(column_names, row)))
 
     except sqlite3.Error as e:
         print(f"[DB Error] inv_id {inv_id}로 캐릭터 정보 조회 실패 (커서 사용): {e}")
         return None
 
-def load_csv_to_db(conn, table_name, file_name):
-    """[리팩토링] 단일 CSV 파일을 테이블에 로드하고 성공/실패 여부를 반환"""
-    file_path = os.path.join(DATA_DIR, file_name)
-    if not os.path.exists(file_path):
-        print(f"[Warning] {file_name} 없음")
-        return False
+def _column_coercer(declared_type):
+    """
+    [신규] 컬럼 선언 타입(_create_master_tables 스키마)에 맞는 변환 함수를 고릅니다. (SQLite 타입 친화도 규칙)
+    INT → int, CHAR/CLOB/TEXT → str, REAL/FLOA/DOUB → float, 그 외(TIMESTAMP 등)는 문자열 그대로
+    """
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return _to_int
+    if "REAL" in declared_type or "FLOA" in declared_type or "DOUB" in declared_type:
+        return float
+    return str
+
+def _to_int(value):
+    """'45', '45.0'은 45로 변환하고, 정수가 아닌 값은 ValueError를 발생시킵니다."""
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        conn.execute(f"DELETE FROM {table_name}")
-        df.to_sql(table_name, conn, if_exists='append', index=False)
-        print(f"[System] {file_name} 로드 완료 ({len(df)}건)")
-        return True
-    except Exception as e:
-        print(f"[Error] {file_name} 로드 실패: {e}")
-        return False
+        return int(value)
+    except ValueError:
+        number = float(value)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+def get_column_types(cursor, table_name):
+    """[신규] 테이블의 {컬럼명: 변환 함수}를 PRAGMA table_info에서 읽어옵니다."""
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    return {row[1]: _column_coercer(row[2]) for row in cursor.fetchall()}
+
+def read_csv_rows(file_path, column_types, key="id", bad_lines=None):
+    """
+    [리팩토링] pandas 없이 csv 모듈로 CSV를 한 줄씩 읽습니다.
+    - 헤더는 바로 검사하여, 테이블에 없는 컬럼이나 키 컬럼 누락 시 ValueError를 발생시킵니다.
+    - 반환값: (컬럼 리스트, 행 튜플 제너레이터). 행은 스키마 타입으로 변환되며 빈 칸은 NULL(None)입니다.
+    - 컬럼 수가 다르거나 타입 변환에 실패하거나 키가 중복된 줄은 잘못된 줄입니다.
+      [수정] bad_lines를 넘기지 않으면 첫 잘못된 줄에서 ValueError를 발생시킵니다. (트랜잭션이 롤백되어 기존 데이터 유지)
+      bad_lines를 넘기면 (줄 번호, 사유)를 기록하고 경고를 출력한 뒤 건너뜁니다. (잘못된 줄을 모두 보고한 뒤 중단할 때)
+    """
+    file_name = os.path.basename(file_path)
+    f = open(file_path, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(f)
+        columns = [c.strip() for c in next(reader, [])]
+        unknown = [c for c in columns if c not in column_types]
+        if not columns or unknown or len(set(columns)) != len(columns) or key not in columns:
+            raise ValueError(f"헤더가 테이블 스키마와 맞지 않습니다. (알 수 없는 컬럼: {unknown}, 헤더: {columns})")
+    except BaseException:
+        f.close()
+        raise
+
+    coercers = [column_types[c] for c in columns]
+    fast_coercers = [int if c is _to_int else c for c in coercers]
+    key_idx = columns.index(key)
+    strict = bad_lines is None
+
+    def _reject(line_no, reason):
+        if strict:
+            raise ValueError(f"{file_name} {line_no}번째 줄: {reason}")
+        bad_lines.append((line_no, reason))
+        print(f"[Warning] {file_name} {line_no}번째 줄 무시: {reason}")
+
+    def _rows():
+        seen = set()
+        with f:
+            for values in reader:
+                if not values:
+                    continue # 빈 줄
+                if len(values) != len(columns):
+                    _reject(reader.line_num, f"컬럼 수 {len(values)}개 (헤더 {len(columns)}개)")
+                    continue
+                try:
+                    # 대부분의 줄은 빈 칸 없이 내장 int/float/str로 바로 변환되므로 빠른 경로를 먼저 시도
+                    if "" in values:
+                        raise ValueError
+                    row = tuple([coerce(v) for coerce, v in zip(fast_coercers, values)])
+                except ValueError:
+                    try:
+                        row = tuple([None if v == "" else coerce(v) for coerce, v in zip(coercers, values)])
+                    except ValueError as e:
+                        _reject(reader.line_num, f"타입 변환 실패 ({e})")
+                        continue
+                row_key = row[key_idx]
+                if row_key is None or row_key in seen:
+                    _reject(reader.line_num, f"{key} 값이 비었거나 중복됨 ({row_key})")
+                    continue
+                seen.add(row_key)
+                yield row
+
+    return columns, _rows()
+
+def insert_rows(cursor, table_name, columns, rows, batch_size=1000):
+    """
+    [신규] rows를 batch_size개씩 executemany로 INSERT 합니다. (CSV 전체를 메모리에 올리지 않음)
+    master.db는 매번 빈 임시 파일에 새로 만든 뒤 통째로 교체하므로, 기존 행과 비교(UPDATE/DELETE)하지 않습니다.
+    반환값: 추가한 행 수
+    """
+    insert_sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(insert_sql, batch)
+            inserted += len(batch)
+            batch.clear()
+    if batch:
+        cursor.executemany(insert_sql, batch)
+        inserted += len(batch)
+    return inserted
 
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,269 @@
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import database
+from config import DB_PATH
+
+# 점검 대상: STATEMENTS에 등록된 쿼리 + database 모듈 내부의 인벤토리 조회
+AUDIT_QUERIES = dict(database.STATEMENTS)
+AUDIT_QUERIES.update({
+    "inventory_detail": database._INVENTORY_DETAIL_QUERY,
+    "inventory_details": database._INVENTORY_DETAILS_QUERY,
+    "find_inventory_ids": database._FIND_INVENTORY_IDS_QUERY,
+})
+
+# 벤치마크 대상 (이름, 파라미터 생성 함수)
+BENCH_QUERIES = (
+    ("count_selected", lambda user: (user,)),
+    ("load_party", lambda user: (user,)),
+    ("deck_cards", lambda user: (user,)),
+)
+GRADES = ["Common", "Rare", "Special", "Legend", "Mythic"]
+LOADTEST_TICKETS = 1000        # 부하 테스트 유저의 초기 티켓
+LOADTEST_COUPON = "DAD991231N" # 모든 유저가 한 번씩 사용하는 쿠폰 (유저별 사용 기록 확인용)
+
+
+def query_plan(conn, sql):
+    """EXPLAIN QUERY PLAN 결과의 detail 문자열 리스트를 반환합니다. (파라미터는 모두 NULL로 바인딩)"""
+    params = (None,) * sql.count("?")
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def is_full_scan(detail):
+    """인덱스 없이 테이블 전체를 읽는 단계인지 확인합니다. (json_each 같은 가상 테이블은 제외)"""
+    return detail.startswith("SCAN ") and "USING" not in detail and "VIRTUAL TABLE" not in detail
+
+
+def explain(db_path):
+    """
+    등록된 모든 쿼리의 실행 계획을 출력하고, 전체 테이블 스캔이 있는 쿼리 수를 반환합니다.
+    [수정] DB를 읽기 전용으로 열기 때문에 마이그레이션하지 않습니다.
+    스키마가 최신이 아니거나 master.db가 없으면 안내를 출력하고 None을 반환합니다.
+    """
+    if not os.path.exists(db_path):
+        print(f"[Error] DB 파일이 없습니다: {db_path}")
+        return None
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    flagged = 0
+    try:
+        db_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if db_version != database.SCHEMA_VERSION:
+            print(f"[Error] DB 스키마 버전 {db_version} (최신 {database.SCHEMA_VERSION}). "
+                  f"게임을 한 번 실행하거나 init_db()로 마이그레이션한 뒤 다시 점검하세요.")
+            return None
+        if not database.attach_master_db(conn):
+            print("[Error] master.db가 없습니다. 게임을 한 번 실행하거나 update_master_data_from_csv()로 컴파일한 뒤 다시 점검하세요.")
+            return None
+        for name, sql in AUDIT_QUERIES.items():
+            plan = query_plan(conn, sql)
+            scans = [detail for detail in plan if is_full_scan(detail)]
+            flagged += bool(scans)
+            print(f"{'[FULL SCAN]' if scans else '[OK]':12s} {name}")
+            for detail in plan:
+                print(f"{'':12s}   {'!' if detail in scans else '-'} {detail}")
+    finally:
+        conn.close()
+    print(f"[System] 쿼리 {len(AUDIT_QUERIES)}개 중 전체 테이블 스캔 {flagged}개")
+    return flagged
+
+
+def build_synthetic_db(db_path, users, chars_per_user, party_size):
+    """users × chars_per_user 행의 inventory를 가진 벤치마크용 DB를 만듭니다. (인덱스는 만들지 않음)"""
+    rng = random.Random(0)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        database._create_tables(conn.cursor())
+        database._create_master_tables(conn.cursor())
+        conn.executemany(
+            "INSERT INTO characters (id, name, grade, hp, mp, atk, agi, sp_max, image) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(100 + i, f"캐릭터{i}", rng.choice(GRADES), 200, 50, 40, 20, 100, f"char_{i}.png")
+             for i in range(chars_per_user)])
+        rows = []
+        for u in range(users):
+            selected = set(rng.sample(range(chars_per_user), party_size))
+            for c in range(chars_per_user):
+                rows.append((f"user_{u:05d}", 100 + c, int(c in selected), rng.randint(1, 30), 0, 200, 40, 20))
+        # 실제 게임처럼 유저가 섞여서 들어오도록 섞은 뒤 삽입 (rowid 순서 ≠ 유저 순서)
+        rng.shuffle(rows)
+        conn.executemany(
+            "INSERT INTO inventory (user_id, char_id, is_selected, level, exp, total_max_hp, total_atk, total_agi) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return conn
+
+
+def time_queries(conn, users, iterations):
+    """쿼리별 평균 실행 시간(μs)을 반환합니다. 유저는 매번 무작위로 고릅니다."""
+    rng = random.Random(1)
+    results = {}
+    for name, make_params in BENCH_QUERIES:
+        sql = database.STATEMENTS[name]
+        params = [make_params(f"user_{rng.randrange(users):05d}") for _ in range(iterations)]
+        start = time.perf_counter()
+        for p in params:
+            conn.execute(sql, p).fetchall()
+        results[name] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+
+def bench(users, chars_per_user, party_size, iterations):
+    """인덱스 추가 전/후의 주요 쿼리 시간을 비교합니다."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        conn = build_synthetic_db(os.path.join(work_dir, "bench.db"), users, chars_per_user, party_size)
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0]
+            print(f"[System] 합성 DB: inventory {total:,}행 (유저 {users:,}명 × 캐릭터 {chars_per_user}명), "
+                  f"쿼리당 {iterations:,}회")
+            before = time_queries(conn, users, iterations)
+            with conn:
+                database._create_indexes(conn.cursor())
+            after = time_queries(conn, users, iterations)
+
+            print("쿼리              인덱스 전(μs)   인덱스 후(μs)   배율")
+            for name, _ in BENCH_QUERIES:
+                print(f"{name:16s} {before[name]:14.1f}   {after[name]:14.1f}   {before[name] / after[name]:5.1f}x")
+                for detail in query_plan(conn, database.STATEMENTS[name]):
+                    print(f"{'':16s}   - {detail}")
+        finally:
+            conn.close()
+
+
+def loadtest(users, clients, floors):
+    """
+    [신규] users명의 유저가 clients개 스레드에서 동시에 뽑기, 덱 조회, 등반(전투 + 저장), 쿠폰 사용을 하는 부하 테스트.
+    실제 게임과 같은 경로(GachaManager, BattleDataHandler, CouponManager, DBWriter)를 사용하고,
+    임시 유저 DB에서 실행하므로 dgfs.db는 건드리지 않습니다. (master.db는 게임과 같이 사용)
+    """
+    from game_systems.db_writer import DBWriter # 게임 모듈은 부하 테스트에서만 사용
+    from game_systems.gacha import GachaManager
+    from game_systems.coupon import CouponManager
+    from game_systems.battle_data_handler import BattleDataHandler
+    from game_systems.headless_battle import resolve_battle
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        db = database.ConnectionManager()
+        db.db_path = os.path.join(work_dir, "loadtest.db") # 연결을 열기 전에 바꿔야 함
+        if not database.init_db() or not database.update_master_data_from_csv():
+            print("[Critical Error] 부하 테스트 DB 초기화 실패")
+            return
+        user_ids = [f"load_{i:05d}" for i in range(users)]
+        with db.transaction() as cursor:
+            cursor.executemany(database.STATEMENTS["ensure_user"], [(u, LOADTEST_TICKETS) for u in user_ids])
+
+        writer = DBWriter()
+        writer.start()
+        gacha, coupons = GachaManager(), CouponManager()
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+
+        def timed(op, fn, *args):
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            except Exception as e:
+                with lock:
+                    errors[f"{op}: {type(e).__name__}: {e}"] += 1
+                return None
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies[op].append(elapsed)
+
+        def deck(user_id):
+            cards = db.connection.execute(database.STATEMENTS["deck_cards"], (user_id,)).fetchall()
+            for card in cards[:2]:
+                writer.execute("set_selected", (1, card['inv_id']), key=("set_selected", card['inv_id']))
+            return cards
+
+        def climb(user_id):
+            handler = BattleDataHandler(None, rng=random.Random(user_id), user_id=user_id)
+            floor, mode = 1, 'NEW_GAME'
+            for _ in range(floors):
+                party_data, enemy_data, floor = handler.setup_battle_data(floor, mode)
+                if not party_data:
+                    raise RuntimeError("파티 로드 실패")
+                party = BattleDataHandler.create_party_fighters(party_data)
+                tier = handler.stage_manager.get_stage_info(floor)['tier']
+                enemies = BattleDataHandler.create_enemy_fighters(enemy_data, floor, tier)
+                result = resolve_battle(party + enemies, seed=random.Random(f"{user_id}:{floor}"))
+                if result["outcome"] != "win":
+                    handler.save_run_state(1, party)
+                    return
+                handler.save_run_state(floor + 1, party)
+                floor, mode = floor + 1, 'CONTINUE'
+
+        def session(user_id):
+            timed("gacha_10", gacha.draw_10, user_id)
+            timed("deck", deck, user_id)
+            timed("climb", climb, user_id)
+            timed("coupon", coupons.redeem_coupon, LOADTEST_COUPON, user_id)
+
+        print(f"[System] 부하 테스트: 유저 {users:,}명, 동시 클라이언트 {clients}개, 유저당 최대 {floors}층")
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w", encoding="utf-8") # 게임 로그 출력 생략
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                list(pool.map(session, user_ids))
+            writer.stop()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        elapsed = time.perf_counter() - start
+
+        print(f"[System] 완료: {elapsed:.1f}초, 유저 {users / elapsed:,.0f}명/초")
+        print("작업        횟수      p50(ms)   p95(ms)   p99(ms)   최대(ms)")
+        for op, values in latencies.items():
+            values.sort()
+            pct = lambda q: values[min(len(values) - 1, int(len(values) * q))] * 1000
+            print(f"{op:10s} {len(values):7,d}   {pct(0.5):8.2f}  {pct(0.95):8.2f}  {pct(0.99):8.2f}  {values[-1] * 1000:8.2f}")
+
+        # 유저별 데이터가 섞이지 않았는지 확인 (티켓 = 초기 - 10연차 + 쿠폰 보상, 쿠폰 기록 = 유저당 1건)
+        reward = coupons._parse_and_validate_code(LOADTEST_COUPON)[0]['reward']
+        conn = db.connection
+        wrong_tickets = conn.execute("SELECT COUNT(*) FROM users WHERE user_id LIKE 'load_%' AND tickets != ?",
+                                     (LOADTEST_TICKETS - 10 + reward,)).fetchone()[0]
+        coupon_rows = conn.execute("SELECT COUNT(*) FROM used_coupons").fetchone()[0]
+        print(f"[System] 티켓 불일치 유저 {wrong_tickets}명, 쿠폰 사용 기록 {coupon_rows:,}건 (기대값 {users:,}건)")
+        if errors:
+            print(f"[Warning] 오류 {sum(errors.values())}건 (잠금 대기 초과 'database is locked' 포함 여부 확인)")
+            for message, count in sorted(errors.items(), key=lambda item: -item[1])[:10]:
+                print(f"  {count:6,d}  {message}")
+        else:
+            print("[System] 오류 0건 (잠금 대기 초과 없음)")
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 쿼리 실행 계획 점검 및 인덱스 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_explain = sub.add_parser("explain", help="등록된 모든 쿼리의 EXPLAIN QUERY PLAN을 출력하고 전체 스캔을 표시합니다")
+    p_explain.add_argument("--db", default=DB_PATH)
+    p_bench = sub.add_parser("bench", help="합성 DB에서 인덱스 추가 전/후 쿼리 시간을 비교합니다")
+    p_bench.add_argument("--users", type=int, default=1000)
+    p_bench.add_argument("--chars-per-user", type=int, default=100)
+    p_bench.add_argument("--party-size", type=int, default=5)
+    p_bench.add_argument("--iterations", type=int, default=2000)
+    p_load = sub.add_parser("loadtest", help="여러 유저가 동시에 뽑기/전투/저장/쿠폰을 하는 부하 테스트 (임시 DB)")
+    p_load.add_argument("--users", type=int, default=10000)
+    p_load.add_argument("--clients", type=int, default=8, help="동시에 요청하는 클라이언트 스레드 수")
+    p_load.add_argument("--floors", type=int, default=3, help="유저당 등반할 최대 층 수")
+    args = parser.parse_args()
+
+    if args.command == "explain":
+        flagged = explain(args.db)
+        sys.exit(2 if flagged is None else 1 if flagged else 0)
+    if args.command == "loadtest":
+        loadtest(args.users, args.clients, args.floors)
+        return
+    bench(args.users, args.chars_per_user, args.party_size, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
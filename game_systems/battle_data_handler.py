@@ -1,70 +1,83 @@
 import sqlite3
-from config import DB_PATH, DEFAULT_USER_ID
+from config import DEFAULT_USER_ID
 import database
+from database import ConnectionManager
+from game_systems.user_state import UserState
+from game_systems.db_writer import DBWriter
+from game_systems.inventory import InventoryUnitOfWork
 from game_systems.stage_manager import StageManager
+from game_systems.fighter_data import FighterData
+from game_systems.master_data import MasterData
 import random
 
 class BattleDataHandler:
-    def __init__(self, stage_manager):
+    MOB_COUNT = 2 # 일반 층에 등장하는 몬스터 수
+
+    def __init__(self, stage_manager, rng=None, run_plan=None, user_id=DEFAULT_USER_ID):
         self.stage_manager = stage_manager
+        self.user_id = user_id # [신규] 진행 상황을 읽고 저장할 유저(프로필)
+        self.rng = rng if rng is not None else random # [신규] 적 추첨용 난수 생성기 (시뮬레이션 재현용)
+        self.run_plan = None # [신규] 등반 전체 계획 (setup_battle_data에서 생성/복원)
+        if run_plan:
+            self._set_run_plan(run_plan)
 
-    def _connect(self):
-        """Creates and returns a new database connection."""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _set_run_plan(self, run_plan):
+        self.run_plan = run_plan
+        self.stage_manager = run_plan.stage_manager
 
     def setup_battle_data(self, floor, mode):
         """
         Loads all necessary data for a battle.
         - Handles starting a new run.
+        - [신규] Creates (NEW_GAME) or restores the RunPlan for the whole run.
         - Loads party and enemy data.
         Returns a tuple of (party_data, enemy_data, new_floor).
         """
+        from game_systems.run_plan import RunPlan # 순환 참조 방지
+        writer = DBWriter()
+        writer.flush() # 쓰기 스레드에 남은 진행 상황 저장이 커밋된 뒤에 읽음
         try:
-            conn = self._connect() # [Fix] DB 연결
-            cursor = conn.cursor()
-
             if mode == 'NEW_GAME':
-                database.start_new_run(conn) # [FIX] database 모듈의 함수를 호출
-            
-            party_data, new_floor = self._load_party_data(cursor, floor, mode)
-            enemy_list = self._spawn_enemies(cursor, new_floor)
+                # [수정] 쓰기는 DB 쓰기 스레드에서만 (여러 유저가 동시에 시작해도 쓰기 잠금 경쟁 없음)
+                run_plan = RunPlan.generate()
+                writer.submit(self._write_new_run, self.user_id, run_plan, urgent=True).result()
+                self._set_run_plan(run_plan)
+
+            db = ConnectionManager()
+            with db.transaction() as cursor:
+                if self.run_plan is None:
+                    run_plan = RunPlan.load(cursor, self.user_id)
+                    if run_plan is None: # 계획 저장 기능 이전의 세이브 데이터
+                        run_plan = RunPlan.generate()
+                        writer.submit(run_plan.save, self.user_id)
+                    self._set_run_plan(run_plan)
+                
+                party_data, new_floor = self._load_party_data(cursor, floor, mode)
+                enemy_list = self.run_plan.get_enemy_data(new_floor)
 
-            conn.commit()
             return party_data, enemy_list, new_floor
         except sqlite3.Error as e:
             print(f"[Critical Error] BattleDataHandler setup failed: {e}")
             return [], [], floor
-        finally:
-            if conn: # [Fix] DB 연결 닫기
-                conn.close() 
+
+    @staticmethod
+    def _write_new_run(cursor, user_id, run_plan):
+        database.start_new_run(cursor.connection, user_id) # [FIX] database 모듈의 함수를 호출
+        run_plan.save(cursor, user_id)
 
     def _load_party_data(self, cursor, current_floor, mode):
         """[Fixed] DB에서 플레이어 파티의 영구 성장 데이터를 포함하여 로드합니다."""
         party_data = []
         try:
-            cursor.execute("SELECT current_floor FROM users WHERE user_id=?", (DEFAULT_USER_ID,))
+            cursor.execute(database.STATEMENTS["get_current_floor"], (self.user_id,))
             floor_data = cursor.fetchone()
             floor = floor_data['current_floor'] if floor_data else 1
         except sqlite3.Error as e:
             print(f"[DB Error] 현재 층 정보 조회 실패: {e}")
             floor = current_floor
 
-        # [Fix] COALESCE를 사용해 영구 스탯이 NULL이면 기본 스탯을 사용하도록 쿼리 수정
-        query = """
-            SELECT 
-                c.name, c.mp as base_mp, c.sp_max, c.image, c.description, c.grade, 
-                c.sfx_type, c.skill_name, c.ult_name,
-                i.id as inv_id, i.level, i.exp,
-                i.current_hp, i.current_mp, i.current_sp,
-                COALESCE(i.total_max_hp, c.hp) as max_hp,
-                COALESCE(i.total_atk, c.atk) as atk,
-                COALESCE(i.total_agi, c.agi) as agi
-            FROM inventory i JOIN characters c ON i.char_id = c.id
-            WHERE i.user_id = ? AND i.is_selected = 1
-        """
-        cursor.execute(query, (DEFAULT_USER_ID,))
+        # [Fix] COALESCE를 사용해 영구 스탯이 NULL이면 기본 스탯을 사용하도록 쿼리 수정 (STATEMENTS["load_party"])
+        cursor.execute(database.STATEMENTS["load_party"], (self.user_id,))
         rows = cursor.fetchall()
         if not rows: raise sqlite3.Error("선택된 파티 정보를 찾을 수 없습니다.")
 
@@ -89,29 +102,38 @@ class BattleDataHandler:
             })
         return party_data, floor
 
-    def _spawn_enemies(self, cursor, floor):
+    def _spawn_enemies(self, floor):
         """[수정] 적 스탯을 DB값이 아닌 층수 기반 고정 스케일링으로 생성합니다."""
+        return self.scale_enemy_data(self._pick_enemy_rows(floor), floor)
+
+    def _pick_enemy_rows(self, floor):
+        """
+        [리팩토링] 층에 등장할 적의 마스터 데이터 행을 고릅니다. (스케일링 전)
+        [수정] DB 쿼리(ORDER BY RANDOM()) 대신 MasterData의 EncounterIndex에서 self.rng로 뽑습니다.
+        """
         stage_info = self.stage_manager.get_stage_info(floor)
         biome, tier = stage_info['biome'], stage_info['tier']
+        master = MasterData.get()
         enemies_to_spawn = []
 
         if stage_info['fixed_boss_id']:
-            cursor.execute("SELECT * FROM enemies WHERE id=?", (stage_info['fixed_boss_id'],))
-            enemies_to_spawn = cursor.fetchall()
+            boss = master.get_enemy(stage_info['fixed_boss_id'])
+            enemies_to_spawn = [boss] if boss else []
         elif stage_info['is_boss_floor']:
-            cursor.execute("SELECT * FROM enemies WHERE biome=? AND tier=? AND role='BOSS' ORDER BY RANDOM() LIMIT 1", (biome, tier))
-            enemies_to_spawn = cursor.fetchall()
-            if not enemies_to_spawn:
-                 cursor.execute("SELECT * FROM enemies WHERE biome=? AND role='BOSS' ORDER BY tier ASC LIMIT 1", (biome,))
-                 enemies_to_spawn = cursor.fetchall()
-        
+            # 해당 티어 보스가 없으면 같은 바이옴의 가장 낮은 티어 보스 (색인 생성 시 미리 결정됨)
+            boss = master.encounters.pick_boss(biome, tier, self.rng)
+            enemies_to_spawn = [boss] if boss else []
+
         if not enemies_to_spawn:
-            cursor.execute("SELECT * FROM enemies WHERE biome=? AND tier=? AND role='MOB' ORDER BY RANDOM() LIMIT 2", (biome, tier))
-            enemies_to_spawn = cursor.fetchall()
+            enemies_to_spawn = master.encounters.pick_mobs(biome, tier, self.MOB_COUNT, self.rng)
+        return enemies_to_spawn
 
+    @staticmethod
+    def scale_enemy_data(enemy_rows, floor):
+        """[리팩토링] 마스터 데이터 행을 복사하여 층수 기반 스탯을 적용한 적 데이터 리스트를 만듭니다."""
         enemy_data = []
-        for row in enemies_to_spawn:
-            data = dict(row)
+        for row in enemy_rows:
+            data = dict(row) # 스냅샷의 행은 공유되므로 복사해서 수정
             # [신규] 층수 기반 고정 스탯 스케일링 적용
             data['hp'] = floor * 100
             data['atk'] = floor * 10
@@ -120,28 +142,58 @@ class BattleDataHandler:
         
         return enemy_data
 
+    @staticmethod
+    def create_party_fighters(party_data):
+        """
+        [리팩토링] _load_party_data가 반환한 파티 데이터로 전투용 FighterData 리스트를 생성합니다.
+        사망한 캐릭터(hp 0)도 생성하여 전투 세션에 포함시킵니다.
+        """
+        start_y = 350 if len(party_data) == 1 else 300
+        fighters = []
+        for idx, data in enumerate(party_data):
+            f_data = FighterData(200, start_y + (idx * 150), data["name"], False,
+                        data["hp"], data["max_hp"], data["mp"], data["max_mp"], data["sp_max"],
+                        data["atk"], data["agi"], data["image"], data["description"], data["inv_id"],
+                        level=data["level"], exp=data["exp"], grade=data["grade"],
+                        sfx_type=data["sfx_type"], skill_name=data["skill_name"], ult_name=data["ult_name"]
+                        )
+            f_data.sp = data["sp"]
+            fighters.append(f_data)
+        return fighters
+
+    @staticmethod
+    def create_enemy_fighters(enemy_data_list, floor, tier):
+        """
+        [리팩토링] _spawn_enemies가 반환한 적 데이터로 전투용 FighterData 리스트를 생성합니다.
+        BattleScene과 헤드리스 시뮬레이터가 같은 규칙으로 적을 만들도록 한 곳에 모았습니다.
+        """
+        scale = 1 + (floor - 1) * 0.05
+        enemies = []
+        for i, e_data in enumerate(enemy_data_list):
+            hp, atk = int(e_data['hp'] * scale), int(e_data['atk'] * scale)
+            y_pos = 350 if len(enemy_data_list) == 1 else 300 + i * 150
+            enemies.append(FighterData(900, y_pos, e_data['name'], True, hp, hp, 50*tier, 50*tier, 100, atk, e_data['agi'], e_data['image'], e_data['role']))
+        return enemies
+
     def save_run_state(self, floor_to_save, player_fighters):
-        """[수정] 등반 중 '현재 상태'(HP, MP, SP)만 저장하고, 영구 스탯은 건드리지 않습니다."""
-        conn = None
-        try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE users SET current_floor = ? WHERE user_id=?", (floor_to_save, DEFAULT_USER_ID))
-            for fighter in player_fighters:
-                if fighter.is_enemy: continue # 아군 캐릭터만 저장
-                
-                cursor.execute("""
-                    UPDATE inventory 
-                    SET current_hp=?, current_mp=?, current_sp=?
-                    WHERE id=?
-                """, (fighter.hp, fighter.mp, fighter.sp, fighter.inv_id))
-            conn.commit()
-            print(f"[System] 진행 상황 저장 완료 (다음 층: {floor_to_save}층)")
-        except sqlite3.Error as e:
-            print(f"[DB Error] 진행 상황 저장 실패: {e}")
-        finally:
-            if conn:
-                conn.close()
+        """
+        [수정] 등반 중 '현재 상태'(HP, MP, SP)만 저장하고, 영구 스탯은 건드리지 않습니다.
+        [수정] DB 쓰기 스레드에 맡기고 기다리지 않습니다. 유저 단위 key를 주어 밀린 저장은 마지막 값만 기록합니다.
+        [수정] 파티 전원의 상태를 명령 하나로 묶어 UPDATE 한 번(executemany)으로 저장합니다.
+        """
+        # 아군 캐릭터만 저장
+        run_states = [(f.inv_id, f.hp, f.mp, f.sp) for f in player_fighters if not f.is_enemy]
+        DBWriter().submit(self._write_run_state, self.user_id, floor_to_save, run_states, key=("run_state", self.user_id))
+        print(f"[System] 진행 상황 저장 요청 (다음 층: {floor_to_save}층)")
+
+    @staticmethod
+    def _write_run_state(cursor, user_id, floor, run_states):
+        cursor.execute(database.STATEMENTS["set_current_floor"], (floor, user_id))
+        inventory = InventoryUnitOfWork(cursor)
+        for inv_id, hp, mp, sp in run_states:
+            inventory.set(inv_id, current_hp=hp, current_mp=mp, current_sp=sp)
+        inventory.flush()
+        UserState.apply_on_commit(user_id, current_floor=floor)
 
     def grant_ticket_reward(self, is_boss_floor):
         """Adds tickets to the user's account."""
@@ -0,0 +1,313 @@
+import argparse
+import random
+import numpy as np
+import config
+from config import DEFAULT_USER_ID
+from database import ConnectionManager
+from game_systems.stage_manager import StageManager
+from game_systems.battle_data_handler import BattleDataHandler
+from game_systems.fighter_data import FighterData
+
+# 행동 코드 (배열 연산용)
+ACTION_ATTACK = 0
+ACTION_SKILL = 1
+ACTION_ULTIMATE = 2
+
+# 전투 결과 코드
+OUTCOME_PENDING = 0
+OUTCOME_WIN = 1
+OUTCOME_LOSS = -1
+
+
+class BatchBattleSimulator:
+    """
+    [Model / Simulation]
+    N개의 전투를 struct-of-arrays(행: 전투, 열: 캐릭터)로 표현하여 한 라운드씩 동시에 진행합니다.
+    BattleSystem + auto_policy(headless_battle)와 같은 규칙을 NumPy 벡터 연산으로 재구성했습니다.
+    - 턴 순서: AGI 내림차순 (동률이면 아군 → 적군, 리스트 순서 유지)
+    - 아군: SP가 가득 차면 필살기, MP가 충분하면 스킬, 아니면 공격 / 대상은 살아있는 적 중 무작위
+    - 적군: MP가 충분하고 AI_SKILL_CHANCE에 당첨되면 스킬, 아니면 공격 / 대상은 살아있는 아군 중 무작위
+    - 피격 시 SP 충전(max_sp * 0.1 + 1~5 난수), 대상 사망 시 재타겟팅
+    """
+    def __init__(self, hp, max_hp, mp, max_mp, sp, max_sp, atk, agi, is_enemy, alive=None, seed=None):
+        self.hp = np.array(hp, dtype=np.int64)
+        self.n_battles, self.n_fighters = self.hp.shape
+        shape = self.hp.shape
+        self.max_hp = np.broadcast_to(np.asarray(max_hp, dtype=np.int64), shape).copy()
+        self.mp = np.broadcast_to(np.asarray(mp, dtype=np.int64), shape).copy()
+        self.max_mp = np.broadcast_to(np.asarray(max_mp, dtype=np.int64), shape).copy()
+        self.sp = np.broadcast_to(np.asarray(sp, dtype=np.int64), shape).copy()
+        self.max_sp = np.broadcast_to(np.asarray(max_sp, dtype=np.int64), shape).copy()
+        self.atk = np.broadcast_to(np.asarray(atk, dtype=np.int64), shape).copy()
+        self.agi = np.broadcast_to(np.asarray(agi, dtype=np.int64), shape).copy()
+        self.is_enemy = np.asarray(is_enemy, dtype=bool)
+        if alive is None:
+            self.alive = self.hp > 0
+        else:
+            self.alive = np.broadcast_to(np.asarray(alive, dtype=bool), shape).copy()
+
+        self.rng = np.random.default_rng(seed)
+        self.outcome = np.full(self.n_battles, OUTCOME_PENDING, dtype=np.int8)
+        self.rounds = np.zeros(self.n_battles, dtype=np.int32)
+
+        # AGI는 전투 중 변하지 않으므로 턴 순서를 한 번만 계산 (stable 정렬로 리스트 순서 유지)
+        self.turn_order = np.argsort(-self.agi, axis=1, kind="stable")
+        self._rows = np.arange(self.n_battles)
+
+    @classmethod
+    def from_fighters(cls, battles, seed=None):
+        """
+        [Factory Method]
+        FighterData 리스트의 리스트(전투 하나당 하나)로 시뮬레이터를 만듭니다.
+        모든 전투는 같은 배치(아군/적군 순서와 인원수)여야 합니다.
+        """
+        layout = [f.is_enemy for f in battles[0]]
+        for fighters in battles:
+            if [f.is_enemy for f in fighters] != layout:
+                raise ValueError("모든 전투의 아군/적군 배치가 같아야 합니다.")
+
+        def column(attr):
+            return [[getattr(f, attr) for f in fighters] for fighters in battles]
+
+        return cls(
+            hp=column("hp"), max_hp=column("max_hp"), mp=column("mp"), max_mp=column("max_mp"),
+            sp=column("sp"), max_sp=column("max_sp"), atk=column("atk"), agi=column("agi"),
+            is_enemy=layout, alive=column("is_alive"), seed=seed
+        )
+
+    @classmethod
+    def from_template(cls, fighters, n_battles, seed=None):
+        """[Factory Method] 하나의 전투 구성을 n_battles개 복제하여 시뮬레이터를 만듭니다."""
+        def row(attr):
+            return np.tile(np.array([getattr(f, attr) for f in fighters]), (n_battles, 1))
+
+        return cls(
+            hp=row("hp"), max_hp=row("max_hp"), mp=row("mp"), max_mp=row("max_mp"),
+            sp=row("sp"), max_sp=row("max_sp"), atk=row("atk"), agi=row("agi"),
+            is_enemy=[f.is_enemy for f in fighters], alive=row("is_alive"), seed=seed
+        )
+
+    # --- 내부 헬퍼 ---
+    def _pick_random(self, candidates):
+        """
+        각 행에서 True인 열 중 하나를 균등하게 고릅니다.
+        반환값: (열 인덱스 배열, 후보 존재 여부 배열)
+        """
+        counts = candidates.sum(axis=1)
+        pick = (self.rng.random(len(candidates)) * counts).astype(np.int64)
+        cum = np.cumsum(candidates, axis=1)
+        idx = np.argmax(cum > pick[:, None], axis=1)
+        return idx, counts > 0
+
+    def _side_alive(self, enemy_side):
+        """(N,) 배열: 해당 진영에 살아있는 캐릭터가 있는지 여부"""
+        side = self.is_enemy if enemy_side else ~self.is_enemy
+        return (self.alive & side).any(axis=1)
+
+    def _plan_actions(self, active):
+        """라운드 시작 시 모든 캐릭터의 행동과 최초 타겟을 결정합니다."""
+        n, f = self.hp.shape
+        queued = self.alive & active[:, None]
+
+        action = np.full((n, f), ACTION_ATTACK, dtype=np.int8)
+        player_cols = ~self.is_enemy
+        enemy_cols = self.is_enemy
+
+        # 아군 (auto_policy)
+        ult = (self.sp >= self.max_sp) & player_cols
+        skill = (self.mp >= config.SKILL_MP_COST) & player_cols & ~ult
+        action[ult] = ACTION_ULTIMATE
+        action[skill] = ACTION_SKILL
+
+        # 적군 AI
+        ai_roll = self.rng.random((n, f)) < config.AI_SKILL_CHANCE
+        enemy_skill = enemy_cols & (self.mp >= config.SKILL_MP_COST) & ai_roll
+        action[enemy_skill] = ACTION_SKILL
+
+        # 최초 타겟: 각 캐릭터마다 상대 진영의 살아있는 캐릭터 중 무작위
+        target = np.zeros((n, f), dtype=np.int64)
+        alive_enemies = self.alive & self.is_enemy
+        alive_players = self.alive & ~self.is_enemy
+        for col in range(f):
+            candidates = alive_players if self.is_enemy[col] else alive_enemies
+            target[:, col], _ = self._pick_random(candidates)
+        return queued, action, target
+
+    def _execute_slot(self, actor, queued, action, target, active):
+        """턴 큐의 한 칸(전투마다 행동자 1명)을 모든 전투에 대해 동시에 실행합니다."""
+        rows = self._rows
+        valid = active & queued[rows, actor] & self.alive[rows, actor]
+        if not valid.any():
+            return
+
+        rows = rows[valid]
+        actor = actor[valid]
+        tgt = target[rows, actor]
+        act = action[rows, actor]
+        actor_is_enemy = self.is_enemy[actor]
+
+        # 대상이 죽었으면 상대 진영에서 재타겟팅
+        dead_target = ~self.alive[rows, tgt]
+        if dead_target.any():
+            opp_enemy = ~actor_is_enemy[dead_target]
+            candidates = self.alive[rows[dead_target]] & (self.is_enemy[None, :] == opp_enemy[:, None])
+            new_tgt, has_target = self._pick_random(candidates)
+            tgt[dead_target] = new_tgt
+            keep = np.ones(len(rows), dtype=bool)
+            keep[np.nonzero(dead_target)[0][~has_target]] = False
+            rows, actor, tgt, act = rows[keep], actor[keep], tgt[keep], act[keep]
+            if len(rows) == 0:
+                return
+
+        atk = self.atk[rows, actor]
+        dmg = atk.copy()
+
+        # 스킬: MP가 남아 있으면 사용, 아니면 일반 공격으로 대체
+        use_skill = (act == ACTION_SKILL) & (self.mp[rows, actor] >= config.SKILL_MP_COST)
+        # 필살기: SP가 가득 차 있으면 사용, 아니면 일반 공격으로 대체
+        use_ult = (act == ACTION_ULTIMATE) & (self.sp[rows, actor] >= self.max_sp[rows, actor])
+        use_attack = ~(use_skill | use_ult)
+
+        dmg[use_skill] = (atk[use_skill] * config.SKILL_MULTIPLIER).astype(np.int64)
+        dmg[use_ult] = (atk[use_ult] * config.ULTIMATE_MULTIPLIER).astype(np.int64)
+
+        self.mp[rows[use_skill], actor[use_skill]] -= config.SKILL_MP_COST
+        self.sp[rows[use_ult], actor[use_ult]] = 0
+        ar, aa = rows[use_attack], actor[use_attack]
+        self.mp[ar, aa] = np.minimum(self.mp[ar, aa] + config.NORMAL_ATTACK_MP_REGEN, self.max_mp[ar, aa])
+
+        # 피격 처리 (FighterData.take_damage)
+        hit = dmg > 0
+        rows, tgt, dmg = rows[hit], tgt[hit], dmg[hit]
+        new_hp = self.hp[rows, tgt] - dmg
+        died = new_hp <= 0
+        new_hp[died] = 0
+        self.hp[rows, tgt] = new_hp
+        self.alive[rows[died], tgt[died]] = False
+
+        charge = (self.max_sp[rows, tgt] * 0.1).astype(np.int64) + self.rng.integers(1, 6, size=len(rows))
+        self.sp[rows, tgt] = np.minimum(self.sp[rows, tgt] + charge, self.max_sp[rows, tgt])
+
+    def step_round(self):
+        """진행 중인 모든 전투를 한 라운드씩 진행합니다. 진행 중인 전투가 남아있으면 True"""
+        active = self.outcome == OUTCOME_PENDING
+        if not active.any():
+            return False
+
+        # 라운드 시작: 살아있는 캐릭터 SP +5
+        charge_mask = self.alive & active[:, None]
+        self.sp[charge_mask] = np.minimum(self.sp[charge_mask] + 5, self.max_sp[charge_mask])
+
+        queued, action, target = self._plan_actions(active)
+        for slot in range(self.n_fighters):
+            self._execute_slot(self.turn_order[:, slot], queued, action, target, active)
+
+        # 라운드 종료: 승패 판정 (아군 전멸이 우선)
+        self.rounds[active] += 1
+        players_alive = self._side_alive(enemy_side=False)
+        enemies_alive = self._side_alive(enemy_side=True)
+        self.outcome[active & ~players_alive] = OUTCOME_LOSS
+        self.outcome[active & players_alive & ~enemies_alive] = OUTCOME_WIN
+        return bool((self.outcome == OUTCOME_PENDING).any())
+
+    def run(self, max_rounds=200):
+        """모든 전투가 끝나거나 max_rounds에 도달할 때까지 진행하고 결과 배열을 반환합니다."""
+        for _ in range(max_rounds):
+            if not self.step_round():
+                break
+        return self.outcome
+
+    def win_rate(self):
+        return float((self.outcome == OUTCOME_WIN).mean()) if self.n_battles else 0.0
+
+
+# --- 층별 승률 곡선 (CLI) ---
+def _load_party(cursor, char_ids, user_id=DEFAULT_USER_ID):
+    """캐릭터 ID 목록으로 기본 스탯의 아군 FighterData 리스트를 만듭니다. (None이면 user_id의 현재 선택된 파티)"""
+    if char_ids is None:
+        cursor.execute("""
+            SELECT c.name, c.mp, c.sp_max, c.grade,
+                   COALESCE(i.total_max_hp, c.hp) as hp,
+                   COALESCE(i.total_atk, c.atk) as atk,
+                   COALESCE(i.total_agi, c.agi) as agi,
+                   i.id as inv_id, i.level
+            FROM inventory i JOIN characters c ON i.char_id = c.id
+            WHERE i.user_id = ? AND i.is_selected = 1
+        """, (user_id,))
+    else:
+        placeholders = ",".join("?" * len(char_ids))
+        cursor.execute(f"SELECT name, mp, sp_max, grade, hp, atk, agi, id as inv_id, 1 as level FROM characters WHERE id IN ({placeholders})", char_ids)
+    rows = cursor.fetchall()
+    return [FighterData(0, 0, r['name'], False, r['hp'], r['hp'], r['mp'], r['mp'], r['sp_max'],
+                        r['atk'], r['agi'], inv_id=r['inv_id'], level=r['level'], grade=r['grade'])
+            for r in rows]
+
+
+def floor_win_rates(party, floors, n_battles, lineups=16, seed=None):
+    """
+    층마다 무작위 적 구성(lineups개)을 뽑아 n_battles개의 전투를 동시에 돌리고 승률을 반환합니다.
+    반환값: {floor: win_rate}
+    """
+    rng = np.random.default_rng(seed)
+    lineup_rng = random.Random(seed) # 적 구성(바이옴 순서, 적 추첨)도 seed를 따름
+    stage_managers = [StageManager(rng=lineup_rng) for _ in range(lineups)]
+    results = {}
+
+    for floor in floors:
+        battles = []
+        for i in range(n_battles):
+            stage_manager = stage_managers[i % lineups]
+            if i < lineups:
+                handler = BattleDataHandler(stage_manager, rng=lineup_rng)
+                enemy_data = handler._spawn_enemies(floor)
+                tier = stage_manager.get_stage_info(floor)['tier']
+                battles.append((enemy_data, tier))
+            else:
+                battles.append(battles[i % lineups])
+
+        # 적 수가 다른 구성은 같은 배열에 담을 수 없으므로 인원수별로 묶어서 실행
+        groups = {}
+        for enemy_data, tier in battles:
+            groups.setdefault(len(enemy_data), []).append((enemy_data, tier))
+
+        wins = 0
+        for group in groups.values():
+            fighter_lists = []
+            for enemy_data, tier in group:
+                allies = [FighterData(0, 0, p.name, False, p.hp, p.max_hp, p.mp, p.max_mp, p.max_sp,
+                                      p.atk, p.agi, inv_id=p.inv_id) for p in party]
+                fighter_lists.append(allies + BattleDataHandler.create_enemy_fighters(enemy_data, floor, tier))
+            sim = BatchBattleSimulator.from_fighters(fighter_lists, seed=rng.integers(1 << 32))
+            sim.run()
+            wins += int((sim.outcome == OUTCOME_WIN).sum())
+        results[floor] = wins / n_battles
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="층별 전투 승률 곡선 계산 (NumPy 배치 시뮬레이션)")
+    parser.add_argument("--party", action="append", help="캐릭터 ID 목록 (예: 101,102). 여러 번 지정 가능. 생략 시 현재 선택된 파티")
+    parser.add_argument("--battles", type=int, default=2000, help="층당 전투 수")
+    parser.add_argument("--lineups", type=int, default=16, help="층당 무작위 적 구성 수")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--user-id", default=DEFAULT_USER_ID, help="--party 생략 시 선택된 파티를 읽을 유저(프로필)")
+    args = parser.parse_args()
+
+    party_specs = [[int(x) for x in spec.split(",")] for spec in args.party] if args.party else [None]
+
+    cursor = ConnectionManager().connection.cursor()
+    parties = [_load_party(cursor, spec, args.user_id) for spec in party_specs]
+
+    for spec, party in zip(party_specs, parties):
+        label = ",".join(p.name for p in party)
+        if not party:
+            print(f"[Warning] 파티 정보를 찾을 수 없습니다: {spec}")
+            continue
+        curve = floor_win_rates(party, range(1, 101), args.battles, lineups=args.lineups, seed=args.seed)
+        print(f"\n=== 파티: {label} ===")
+        for floor, rate in curve.items():
+            print(f"{floor:3d}F  {rate * 100:6.2f}%  {'#' * int(rate * 40)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,12 @@ import config
 from game_systems.level_manager import LevelManager
 
 class BattleSystem:
-    def __init__(self, fighter_data_list, battle_view):
+    def __init__(self, fighter_data_list, battle_view, rng=None, verbose=True):
         self.fighter_data_list = fighter_data_list
         self.battle_view = battle_view
+        # [신규] 헤드리스 시뮬레이션을 위해 난수 생성기와 로그 출력 여부를 주입받을 수 있도록 함
+        self.rng = rng if rng is not None else random
+        self.verbose = verbose
 
         # --- 상태 변수 ---
         self.state = "PREPARING"
@@ -32,7 +35,8 @@ class BattleSystem:
 
     def _change_state(self, new_state):
         if self.state != new_state:
-            print(f"[State Change] {self.state} -> {new_state}")
+            if self.verbose:
+                print(f"[State Change] {self.state} -> {new_state}")
             self.state = new_state
 
     # [Task 3] Method to start the entire player command round.
@@ -131,8 +135,8 @@ class BattleSystem:
         player_fighters = self.get_player_fighters(alive_only=True)
         if player_fighters:
             for enemy in self.get_enemy_fighters(alive_only=True):
-                target = random.choice(player_fighters)
-                action = "skill" if enemy.mp >= config.SKILL_MP_COST and random.random() < config.AI_SKILL_CHANCE else "attack"
+                target = self.rng.choice(player_fighters)
+                action = "skill" if enemy.mp >= config.SKILL_MP_COST and self.rng.random() < config.AI_SKILL_CHANCE else "attack"
                 enemy_actions.append((enemy, action, target))
 
         all_actions = self.player_actions + enemy_actions
@@ -158,7 +162,7 @@ class BattleSystem:
         if not target.is_alive:
             new_targets = self.get_enemy_fighters(alive_only=True) if not actor.is_enemy else self.get_player_fighters(alive_only=True)
             if new_targets:
-                target = random.choice(new_targets)
+                target = self.rng.choice(new_targets)
             else:
                 self.next_turn() # 공격할 대상이 없으면 턴 종료
                 return
@@ -192,7 +196,7 @@ class BattleSystem:
                 action_name = "공격(SP부족)"
         
         if dmg > 0:
-            target.take_damage(dmg)
+            target.take_damage(dmg, rng=self.rng)
             self.battle_view.request_floating_text(target.inv_id, f"-{dmg}", (255, 0, 0))
             self.battle_view.request_damage_animation(target.inv_id)
 
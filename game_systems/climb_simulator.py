@@ -0,0 +1,199 @@
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import DB_PATH, DEFAULT_USER_ID
+import database
+from database import ConnectionManager
+from game_systems.master_data import MasterData
+from game_systems.stage_manager import StageManager
+from game_systems.battle_data_handler import BattleDataHandler
+from game_systems.headless_battle import resolve_battle
+from game_systems.reward_system import RewardSystem
+
+TOP_FLOOR = 100
+
+# 워커 프로세스마다 하나씩 유지하는 DB 연결
+_worker_conn = None
+
+
+def _init_worker():
+    """
+    [워커 초기화] 로그 출력을 버리고, 읽기 전용 DB 연결을 한 번만 열어 마스터 데이터를 읽어 둡니다.
+    부모 프로세스의 공유 연결을 fork로 물려받아 쓰지 않도록 전용 연결을 사용합니다.
+    """
+    global _worker_conn
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    _worker_conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    _worker_conn.row_factory = sqlite3.Row
+    database.attach_master_db(_worker_conn)
+    MasterData.reload(_worker_conn)
+
+
+def choose_reward(offered, fighters, policy, rng):
+    """
+    제시된 보상 중 하나를 고릅니다.
+    - priority: 생존자 체력이 50% 미만이면 회복, 아니면 공격력 > 최대 체력 > 회복 > 쿠폰 순
+    - random: 무작위 선택
+    """
+    if policy == "random":
+        return rng.choice(offered)
+
+    alive = [f for f in fighters if f.is_alive]
+    hp_ratio = sum(f.hp for f in alive) / max(1, sum(f.max_hp for f in alive))
+    order = ["REWARD_ATK_UP", "REWARD_HP_UP", "REWARD_HEAL", "REWARD_TICKET"]
+    if hp_ratio < 0.5:
+        order.insert(0, "REWARD_HEAL")
+    return next(code for code in order if code in offered)
+
+
+def new_stats():
+    """등반 결과 집계용 자료구조. 층 인덱스는 1부터 사용합니다."""
+    return {
+        "runs": 0,
+        "reached": [0] * (TOP_FLOOR + 1),   # 해당 층 전투에 진입한 횟수
+        "cleared": [0] * (TOP_FLOOR + 1),   # 해당 층을 클리어한 횟수
+        "survivors": [0] * (TOP_FLOOR + 1), # 클리어 시점 생존 인원 합계
+        "level_hist": {},                   # {층: Counter(생존자 레벨)} (클리어 시점)
+        "end_floor": Counter(),             # 등반이 끝난 층 (100층 클리어 시 101)
+        "tickets": 0,
+    }
+
+
+def merge_stats(total, part):
+    """워커가 반환한 집계 결과를 누적합니다."""
+    total["runs"] += part["runs"]
+    for key in ("reached", "cleared", "survivors"):
+        total[key] = [a + b for a, b in zip(total[key], part[key])]
+    for floor, hist in part["level_hist"].items():
+        total["level_hist"].setdefault(floor, Counter()).update(hist)
+    total["end_floor"].update(part["end_floor"])
+    total["tickets"] += part["tickets"]
+    return total
+
+
+def simulate_run(party_data, rng, reward_policy, stats):
+    """
+    [신규] 1층부터 한 번의 등반을 BattleScene과 같은 흐름으로 진행합니다.
+    - 바이옴 셔플, 층별 적 생성/스케일링, 승리 경험치와 레벨업, 보상 선택
+    - 사망한 아군은 등반이 끝날 때까지 부활하지 않습니다. (세션 퍼머데스)
+    """
+    stage_manager = StageManager(rng=rng)
+    handler = BattleDataHandler(stage_manager, rng=rng)
+    party = BattleDataHandler.create_party_fighters(party_data)
+
+    floor = 1
+    while floor <= TOP_FLOOR:
+        stats["reached"][floor] += 1
+        stage_info = stage_manager.get_stage_info(floor)
+        enemy_data = handler._spawn_enemies(floor)
+        enemies = BattleDataHandler.create_enemy_fighters(enemy_data, floor, stage_info['tier'])
+
+        result = resolve_battle(party + enemies, seed=rng)
+        if result["outcome"] != "win":
+            break
+
+        result["system"].process_victory(floor)
+        stats["cleared"][floor] += 1
+        alive = [f for f in party if f.is_alive]
+        stats["survivors"][floor] += len(alive)
+        stats["level_hist"].setdefault(floor, Counter()).update(f.level for f in alive)
+
+        offered = RewardSystem.roll_rewards(stage_info['is_boss_floor'], rng)
+        reward_code = choose_reward(offered, party, reward_policy, rng)
+        if reward_code == "REWARD_TICKET":
+            stats["tickets"] += handler.grant_ticket_reward(stage_info['is_boss_floor'])
+        else:
+            RewardSystem.apply_stat_reward(party, reward_code)
+        floor += 1
+
+    stats["end_floor"][floor] += 1
+    stats["runs"] += 1
+
+
+def run_batch(party_data, seed, start, count, reward_policy):
+    """[워커 작업] start번부터 count개의 등반을 시뮬레이션하고 집계 결과를 반환합니다."""
+    if _worker_conn is None:
+        _init_worker()
+    stats = new_stats()
+    for index in range(start, start + count):
+        simulate_run(party_data, random.Random(f"{seed}:{index}"), reward_policy, stats)
+    return stats
+
+
+def simulate_climbs(party_data, runs, seed=0, workers=None, reward_policy="priority", chunk_size=None):
+    """
+    [신규] 독립적인 등반 runs회를 ProcessPoolExecutor로 나누어 실행하고 결과를 합칩니다.
+    같은 seed면 워커 수와 관계없이 같은 결과가 나옵니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(500, runs // (workers * 8) or 1))
+    chunks = [(start, min(chunk_size, runs - start)) for start in range(0, runs, chunk_size)]
+
+    total = new_stats()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(run_batch, party_data, seed, start, count, reward_policy)
+                   for start, count in chunks]
+        for future in as_completed(futures):
+            merge_stats(total, future.result())
+    return total
+
+
+def _level_median(hist):
+    if not hist:
+        return 0
+    half = sum(hist.values()) / 2
+    acc = 0
+    for level in sorted(hist):
+        acc += hist[level]
+        if acc >= half:
+            return level
+    return 0
+
+
+def print_report(stats):
+    runs = stats["runs"]
+    print(f"\n=== 등반 시뮬레이션 결과 ({runs}회) ===")
+    print(" 층   도달률   클리어율(도달 대비)  평균 생존  생존자 레벨(중앙/최대)")
+    for floor in range(1, TOP_FLOOR + 1):
+        reached = stats["reached"][floor]
+        if reached == 0:
+            break
+        cleared = stats["cleared"][floor]
+        hist = stats["level_hist"].get(floor, Counter())
+        avg_alive = stats["survivors"][floor] / cleared if cleared else 0
+        max_level = max(hist) if hist else 0
+        print(f"{floor:3d}F  {reached / runs * 100:6.2f}%   {cleared / reached * 100:6.2f}%"
+              f"            {avg_alive:4.2f}      Lv.{_level_median(hist)}/{max_level}")
+    print(f"\n100층 완주: {stats['end_floor'][TOP_FLOOR + 1]}회 | 평균 획득 쿠폰: {stats['tickets'] / max(1, runs):.2f}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="100층 등반 몬테카를로 시뮬레이션 (유저의 현재 선택된 파티 기준)")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reward-policy", choices=["priority", "random"], default="priority")
+    parser.add_argument("--user-id", default=DEFAULT_USER_ID, help="선택된 파티를 읽을 유저(프로필)")
+    args = parser.parse_args()
+
+    try:
+        handler = BattleDataHandler(StageManager(), user_id=args.user_id)
+        party_data, _ = handler._load_party_data(ConnectionManager().connection.cursor(), 1, 'NEW_GAME')
+    except sqlite3.Error as e:
+        print(f"[Critical Error] 파티 정보를 불러오지 못했습니다: {e}")
+        return
+
+    start = time.perf_counter()
+    stats = simulate_climbs(party_data, args.runs, seed=args.seed, workers=args.workers,
+                            reward_policy=args.reward_policy)
+    print_report(stats)
+    print(f"[System] {args.runs}회 등반 완료 ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
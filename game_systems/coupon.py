@@ -1,6 +1,9 @@
 import pygame
 import sqlite3
-from config import (DB_PATH, DEFAULT_USER_ID, COUPON_MIN_LENGTH, COUPON_SENDER_LENGTH, 
+import database
+from database import STATEMENTS
+from game_systems.db_writer import DBWriter
+from config import (DEFAULT_USER_ID, COUPON_MIN_LENGTH, COUPON_SENDER_LENGTH, 
                     COUPON_DATE_LENGTH, COUPON_REWARDS, COUPON_VALID_SENDERS)
 
 class CouponManager:
@@ -29,24 +32,26 @@ class CouponManager:
         return parsed_info, "코드 형식 확인 완료"
 
     def _process_db_transaction(self, date_id, reward_tickets, user_id):
-        """[리팩토링] DB 관련 작업을 트랜잭션으로 처리합니다."""
+        """[리팩토링] DB 관련 작업을 트랜잭션으로 처리합니다. [수정] DB 쓰기 스레드에서 커밋될 때까지 기다립니다."""
         try:
-            # [리팩토링] with 구문을 사용하여 DB 연결을 안전하게 관리합니다.
-            with sqlite3.connect(DB_PATH) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1 FROM used_coupons WHERE coupon_id=?", (date_id,))
-                if cursor.fetchone():
-                    return False, "이미 사용된 날짜의 쿠폰입니다."
-
-                # [리팩토링] user_id를 매개변수로 받도록 수정
-                cursor.execute("UPDATE users SET tickets = tickets + ? WHERE user_id=?", (reward_tickets, user_id))
-                cursor.execute("INSERT INTO used_coupons (coupon_id) VALUES (?)", (date_id,))
-                conn.commit()
-            return True, "보상 지급 완료!"
+            return DBWriter().submit(self._redeem_in_db, date_id, reward_tickets, user_id, urgent=True).result()
         except sqlite3.Error as e:
             print(f"[DB Error] 쿠폰 처리 중 오류 발생: {e}")
             return False, "데이터베이스 오류가 발생했습니다."
 
+    @staticmethod
+    def _redeem_in_db(cursor, date_id, reward_tickets, user_id):
+        # [리팩토링] 중복 확인과 지급을 하나의 트랜잭션(작업)으로 처리합니다.
+        # [수정] 사용 기록은 유저별로 확인합니다. (프로필마다 같은 쿠폰을 한 번씩 사용 가능)
+        cursor.execute(STATEMENTS["coupon_used"], (user_id, date_id))
+        if cursor.fetchone():
+            return False, "이미 사용된 날짜의 쿠폰입니다."
+
+        # [리팩토링] user_id를 매개변수로 받도록 수정
+        database.add_tickets(cursor, reward_tickets, user_id) # 커밋 후 UserState에도 반영
+        cursor.execute(STATEMENTS["use_coupon"], (user_id, date_id))
+        return True, "보상 지급 완료!"
+
     def redeem_coupon(self, code, user_id=DEFAULT_USER_ID):
         """[리팩토링] 쿠폰 코드 검증 및 보상 지급 과정을 총괄합니다."""
         # 1. 코드 형식 검증
@@ -0,0 +1,174 @@
+import atexit
+import threading
+from concurrent.futures import Future
+from database import ConnectionManager, STATEMENTS
+
+
+class DBWriter:
+    """
+    [신규] DB 쓰기 전용 스레드와 명령 큐 (write-behind).
+    - submit(fn, *args)로 넣은 명령은 작업 스레드에서 fn(cursor, *args)로 실행되고, 모아서 한 트랜잭션으로 커밋합니다.
+      렌더링 스레드는 커밋(fsync)을 기다리지 않습니다.
+    - 같은 key로 아직 실행되지 않은 명령이 있으면 새 명령으로 교체합니다. (같은 인벤토리 행의 반복 저장은 마지막 값만 기록)
+    - 반환되는 Future는 배치가 커밋된 뒤에 결과가 채워집니다. 확인이 필요한 작업(티켓 차감 등)은 urgent=True로 넣고 result()로 기다립니다.
+    - [수정] 기다리는 호출자(urgent 명령, flush())가 있으면 BATCH_WINDOW를 기다리지 않고 바로 커밋합니다.
+    - 명령 하나가 실패해도 SAVEPOINT로 그 명령만 되돌리고, 배치의 나머지는 커밋합니다.
+    - 배치는 커밋 단위이므로 프로세스가 강제 종료되면 아직 커밋되지 않은 마지막 배치만 잃습니다. (WAL)
+    - start() 전이거나 stop() 후에는 호출한 스레드에서 바로 실행합니다. (시뮬레이터, 테스트 스크립트)
+    on_commit 콜백(UserState 갱신 등)은 작업 스레드에서 실행됩니다. (UserState와 DirtyRects는 잠금으로 보호됨)
+    """
+    _instance = None
+    BATCH_SIZE = 128      # 한 트랜잭션에 담는 최대 명령 수
+    BATCH_WINDOW = 0.02   # 첫 명령이 들어온 뒤 추가 명령을 모으는 시간(초), 기다리는 호출자가 없을 때만
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(DBWriter, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._cond = threading.Condition()
+        self._pending = {}    # key → (fn, args, [Future], 순번) (삽입 순서 = 실행 순서)
+        self._submitted = 0   # 마지막으로 넣은 명령의 순번
+        self._committed = 0   # 커밋이 끝난 명령의 최대 순번
+        self._urgent = 0      # 마지막으로 넣은 urgent 명령의 순번
+        self._waiters = 0     # flush()로 기다리는 스레드 수
+        self._stopping = False
+        self._thread = None
+        atexit.register(self.stop)
+        self._initialized = True
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """쓰기 스레드를 시작합니다. (게임 시작 시 한 번)"""
+        with self._cond:
+            if self.running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """남은 명령을 모두 커밋하고 쓰기 스레드를 종료합니다. (pygame.QUIT 시 호출)"""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout=None):
+        """
+        지금까지 넣은 명령이 모두 커밋될 때까지 기다립니다. (직접 DB를 읽기 전에 호출)
+        [수정] 호출 이후에 다른 스레드가 넣는 명령은 기다리지 않습니다. (큐가 계속 차 있어도 끝남)
+        """
+        if not self.running or threading.current_thread() is self._thread:
+            return True
+        with self._cond:
+            target = self._submitted
+            self._waiters += 1 # 쓰기 스레드가 배치 대기를 건너뛰도록
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: self._committed >= target or not self.running, timeout)
+            finally:
+                self._waiters -= 1
+
+    def submit(self, fn, *args, key=None, urgent=False):
+        """
+        fn(cursor, *args)를 쓰기 큐에 넣고 Future를 반환합니다.
+        [수정] 바로 result()로 기다릴 명령은 urgent=True로 넣습니다. (BATCH_WINDOW 없이 커밋)
+        """
+        future = Future()
+        with self._cond:
+            queued = self.running and not self._stopping and threading.current_thread() is not self._thread
+            if queued:
+                key = key if key is not None else object()
+                _, _, futures, _ = self._pending.pop(key, (None, None, [], None))
+                futures.append(future)
+                self._submitted += 1
+                self._pending[key] = (fn, args, futures, self._submitted)
+                if urgent:
+                    self._urgent = self._submitted
+                self._cond.notify_all()
+        if not queued:
+            self._run_inline(fn, args, future)
+        return future
+
+    def execute(self, name, params=(), key=None, urgent=False):
+        """STATEMENTS에 등록된 쿼리를 쓰기 큐에 넣습니다. Future의 결과는 변경된 행 수입니다."""
+        return self.submit(_execute_statement, name, params, key=key, urgent=urgent)
+
+    # --- 작업 스레드 ---
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    ConnectionManager().close() # stop() 요청 + 큐가 비었음: 이 스레드의 연결 정리
+                    return
+                # 같은 프레임에 들어오는 명령을 한 번에 커밋 (기다리는 호출자가 생기면 바로 깨어남)
+                self._cond.wait_for(self._batch_ready, self.BATCH_WINDOW)
+                keys = list(self._pending)[:self.BATCH_SIZE]
+                batch = [self._pending.pop(key) for key in keys]
+            try:
+                self._write_batch([command[:3] for command in batch])
+            finally:
+                with self._cond:
+                    # 순번은 삽입 순서대로 증가하므로 배치의 마지막 명령까지 모두 끝난 것
+                    self._committed = batch[-1][3]
+                    self._cond.notify_all()
+
+    def _batch_ready(self):
+        """배치 대기를 끝낼 조건: 종료 요청, 배치가 가득 참, urgent 명령이나 flush()로 기다리는 호출자가 있음"""
+        return (self._stopping or self._waiters > 0 or self._urgent > self._committed
+                or len(self._pending) >= self.BATCH_SIZE)
+
+    @staticmethod
+    def _write_batch(batch):
+        db = ConnectionManager()
+        outcomes = []
+        try:
+            with db.transaction():
+                for fn, args, futures in batch:
+                    try:
+                        with db.transaction() as cursor: # SAVEPOINT
+                            outcomes.append((futures, fn(cursor, *args), None))
+                    except Exception as e:
+                        print(f"[DB Error] 쓰기 명령 실패 ({getattr(fn, '__name__', fn)}): {e}")
+                        outcomes.append((futures, None, e))
+        except Exception as e:
+            print(f"[DB Error] 배치 커밋 실패 ({len(batch)}건): {e}")
+            for _, _, futures in batch:
+                for future in futures:
+                    future.set_exception(e)
+            return
+        for futures, result, error in outcomes:
+            for future in futures:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    @staticmethod
+    def _run_inline(fn, args, future):
+        try:
+            with ConnectionManager().transaction() as cursor:
+                result = fn(cursor, *args)
+        except Exception as e:
+            print(f"[DB Error] 쓰기 명령 실패 ({getattr(fn, '__name__', fn)}): {e}")
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+
+def _execute_statement(cursor, name, params):
+    cursor.execute(STATEMENTS[name], params)
+    return cursor.rowcount
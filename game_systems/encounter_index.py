@@ -0,0 +1,42 @@
+import random
+
+
+class EncounterIndex:
+    """
+    [신규] 층별 적 추첨용 색인. MasterDataSnapshot을 만들 때 한 번 생성됩니다.
+    - 적을 (바이옴, 티어) 단위로 MOB/BOSS 버킷에 나눠 두어, 추첨은 테이블 크기와 무관하게 O(1)입니다.
+    - 보스 대체 규칙(해당 티어 보스가 없으면 같은 바이옴의 가장 낮은 티어 보스)을 미리 풀어 둡니다.
+    """
+    def __init__(self, enemies):
+        mobs, bosses = {}, {}
+        lowest_boss = {} # 바이옴 → 가장 낮은 티어의 보스 (같은 티어면 먼저 나온 행)
+        for e in enemies:
+            key = (e['biome'], e['tier'])
+            if e['role'] == 'BOSS':
+                bosses.setdefault(key, []).append(e)
+                current = lowest_boss.get(e['biome'])
+                if current is None or e['tier'] < current['tier']:
+                    lowest_boss[e['biome']] = e
+            elif e['role'] == 'MOB':
+                mobs.setdefault(key, []).append(e)
+
+        self._mobs = {key: tuple(group) for key, group in mobs.items()}
+        self._bosses = {key: tuple(group) for key, group in bosses.items()}
+        self._fallback_boss = {biome: (boss,) for biome, boss in lowest_boss.items()}
+
+    def boss_candidates(self, biome, tier):
+        """해당 티어 보스 목록. 없으면 대체 보스 1명, 그것도 없으면 빈 튜플"""
+        return self._bosses.get((biome, tier)) or self._fallback_boss.get(biome, ())
+
+    def mob_candidates(self, biome, tier):
+        return self._mobs.get((biome, tier), ())
+
+    def pick_boss(self, biome, tier, rng=random):
+        """보스 한 명을 뽑습니다. 후보가 없으면 None"""
+        candidates = self.boss_candidates(biome, tier)
+        return candidates[rng.randrange(len(candidates))] if candidates else None
+
+    def pick_mobs(self, biome, tier, count, rng=random):
+        """서로 다른 일반 몬스터를 최대 count마리 뽑습니다. (버킷 크기와 무관하게 O(count))"""
+        candidates = self.mob_candidates(biome, tier)
+        return rng.sample(candidates, min(count, len(candidates)))
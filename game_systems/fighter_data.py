@@ -79,14 +79,14 @@ class FighterData:
             sfx_type=data.get('sfx_type') or 'NORMAL' # 값이 없거나 비어있으면 'NORMAL'
         )
 
-    def take_damage(self, damage):
+    def take_damage(self, damage, rng=random):
         self.hp -= damage
         if self.hp <= 0:
             self.hp = 0
             self.is_alive = False
         
         # 피격 시 SP 충전 로직
-        charge = int(self.max_sp * 0.1) + random.randint(1, 5)
+        charge = int(self.max_sp * 0.1) + rng.randint(1, 5)
         self.sp = min(self.sp + charge, self.max_sp)
 
     def use_skill(self, target: 'FighterData'):
@@ -1,8 +1,66 @@
 import sqlite3
 import random
 import database
-from config import DB_PATH, DEFAULT_USER_ID, GACHA_MULTI_DRAW_COUNT, GACHA_DUPLICATE_EXP
+from config import DEFAULT_USER_ID, GACHA_MULTI_DRAW_COUNT, GACHA_DUPLICATE_EXP
 from game_systems.level_manager import LevelManager
+from game_systems.master_data import MasterData
+from game_systems.db_writer import DBWriter
+from game_systems.inventory import InventoryUnitOfWork
+
+try:
+    import numpy as np
+except ImportError: # numpy가 없으면 draw_n은 순수 파이썬 루프로 동작합니다.
+    np = None
+
+
+class AliasTable:
+    """
+    [신규] Walker(Vose) alias 방식의 이산 분포 샘플러.
+    생성은 O(n), 한 번의 추첨은 확률 구간 검색 없이 O(1)입니다.
+    """
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("alias 테이블을 만들 가중치가 없습니다.")
+
+        scaled = [w * n / total for w in weights]
+        self.size = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # 남은 칸은 부동소수점 오차만 남은 상태이므로 확률 1로 고정 (초기값 유지)
+
+        if np is not None:
+            self._np_prob = np.array(self.prob)
+            self._np_alias = np.array(self.alias, dtype=np.int64)
+
+    def sample(self, rng=random):
+        """인덱스 하나를 추첨합니다."""
+        i = int(rng.random() * self.size)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample_n(self, n, rng=None):
+        """
+        인덱스 n개를 한 번에 추첨합니다.
+        numpy가 있고 rng가 None/정수 시드/numpy Generator이면 벡터 연산으로, 그 외(random.Random 등)는 루프로 처리합니다.
+        """
+        if np is not None and (rng is None or isinstance(rng, (int, np.random.Generator))):
+            rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+            idx = rng.integers(0, self.size, size=n)
+            keep = rng.random(n) < self._np_prob[idx]
+            return np.where(keep, idx, self._np_alias[idx])
+        rng = rng if rng is not None else random
+        return [self.sample(rng) for _ in range(n)]
+
 
 class GachaManager:
     GACHA_RATES = {
@@ -11,39 +69,66 @@ class GachaManager:
 
     def __init__(self):
         self.pool = {}
+        self._alias_table = None # [신규] 캐릭터 단위 alias 테이블 (등급 확률 / 등급 내 인원수)
+        self._table_chars = []   # alias 테이블 인덱스 → 캐릭터 데이터
+        self._pool_version = None
         self._load_pool()
 
     def _load_pool(self):
+        """[수정] DB 대신 MasterData 스냅샷의 등급 색인으로 풀을 구성합니다."""
+        snapshot = MasterData.get()
         for grade in self.GACHA_RATES.keys():
-            self.pool[grade] = []
-        try:
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM characters")
-                rows = cursor.fetchall()
-                
-                for row in rows:
-                    char_data = dict(row)
-                    grade_key = char_data['grade'].upper().strip()
-                    if grade_key in self.pool:
-                        self.pool[grade_key].append(char_data)
-                    else:
-                        self.pool["COMMON"].append(char_data)
-            print(f"[System] 가챠 풀 로드 완료: {len(rows)}명")
-        except sqlite3.Error as e:
-            print(f"[Critical Error] 가챠 풀 로드 실패: {e}")
-
-    def _draw_single(self):
-        grades, weights = list(self.GACHA_RATES.keys()), list(self.GACHA_RATES.values())
-        selected_grade = random.choices(grades, weights=weights, k=1)[0]
-        
-        pool = self.pool.get(selected_grade)
-        if not pool:
-            print(f"[Warning] '{selected_grade}' 등급 캐릭터가 없어 Common 등급에서 뽑습니다.")
-            pool = self.pool["COMMON"]
-        
-        return random.choice(pool)
+            self.pool[grade] = list(snapshot.get_characters_by_grade(grade))
+        # GACHA_RATES에 없는 등급은 COMMON 풀에 포함
+        for grade, chars in snapshot.characters_by_grade.items():
+            if grade not in self.GACHA_RATES:
+                self.pool["COMMON"].extend(chars)
+        print(f"[System] 가챠 풀 로드 완료: {len(snapshot.characters)}명")
+        self._build_alias_table()
+        self._pool_version = snapshot.version
+
+    def _build_alias_table(self):
+        """
+        [신규] 등급 확률과 등급별 풀을 하나의 캐릭터 단위 alias 테이블로 합칩니다.
+        캐릭터 가중치 = 등급 확률 / 등급 인원수. 캐릭터가 없는 등급의 확률은 COMMON 풀로 넘깁니다.
+        """
+        fallback_rate = 0.0
+        for grade, rate in self.GACHA_RATES.items():
+            if grade != "COMMON" and not self.pool.get(grade):
+                print(f"[Warning] '{grade}' 등급 캐릭터가 없어 Common 등급에서 뽑습니다.")
+                fallback_rate += rate
+
+        chars, weights = [], []
+        for grade, rate in self.GACHA_RATES.items():
+            pool = self.pool.get(grade)
+            if not pool:
+                continue
+            if grade == "COMMON":
+                rate += fallback_rate
+            chars.extend(pool)
+            weights.extend([rate / len(pool)] * len(pool))
+
+        self._table_chars = chars
+        self._alias_table = AliasTable(weights) if chars else None
+
+    def _ensure_pool(self):
+        """마스터 데이터가 갱신된 경우에만 풀과 alias 테이블을 다시 만듭니다."""
+        if self._pool_version != MasterData.get().version:
+            self._load_pool()
+        if self._alias_table is None:
+            raise IndexError("가챠 풀이 비어 있어 뽑기를 진행할 수 없습니다.")
+
+    def _draw_single(self, rng=random):
+        self._ensure_pool()
+        return self._table_chars[self._alias_table.sample(rng)]
+
+    def draw_n(self, n, rng=None):
+        """
+        [신규] DB 저장 없이 n회 뽑기 결과(캐릭터 데이터 리스트)만 반환합니다.
+        확률 검증이나 이벤트 시뮬레이션용이며, numpy가 있으면 한 번의 벡터 연산으로 추첨합니다.
+        """
+        self._ensure_pool()
+        return [self._table_chars[i] for i in self._alias_table.sample_n(n, rng)]
 
     def draw_1(self, user_id=DEFAULT_USER_ID):
         char_info = self._draw_single()
@@ -54,44 +139,60 @@ class GachaManager:
         return self._save_to_inventory(user_id, drawn_chars)
 
     def _save_to_inventory(self, user_id, drawn_chars):
-        processed_results = []
-        conn = None
+        """
+        [수정] 티켓 차감과 인벤토리 저장을 DB 쓰기 스레드에 맡기고, 커밋이 확인될 때까지 기다립니다.
+        (결과 화면은 커밋된 결과만 보여줘야 하므로 Future를 기다림)
+        """
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-
-            # 트랜잭션 시작 시점에 티켓 차감
-            database.add_tickets(cursor, -len(drawn_chars), user_id)
-
-            for char in drawn_chars:
-                char_id = char['id']
-                grade = char['grade'].upper()
-                
-                is_new, inv_id, char_name = database.add_character_to_inventory(cursor, char_id, user_id)
-                
-                result_info = {'char': char, 'is_duplicate': not is_new, 'exp_gain': 0}
-
-                if is_new:
-                    print(f"[Gacha] 신규 캐릭터 획득: {char_name}")
-                else:  # 중복 캐릭터
-                    exp_to_add = GACHA_DUPLICATE_EXP.get(grade, 0)
-                    result_info['exp_gain'] = exp_to_add
-                    
-                    if exp_to_add > 0 and inv_id is not None:
-                        print(f"[Gacha] 중복 캐릭터 획득: {char_name}. 경험치 +{exp_to_add}")
-                        LevelManager.gain_exp_for_character(cursor, inv_id, exp_to_add)
-                    else:
-                        print(f"[Gacha] 중복 캐릭터 획득: {char_name}. (경험치 정보 없음 또는 inv_id 없음)")
-                
-                processed_results.append(result_info)
-
-            conn.commit()
+            return DBWriter().submit(self._write_draw_results, user_id, drawn_chars, urgent=True).result()
         except sqlite3.Error as e:
             print(f"[DB Error] 인벤토리 저장 실패: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
+            return []
+
+    @staticmethod
+    def _write_draw_results(cursor, user_id, drawn_chars):
+        """
+        [수정] 뽑기 결과를 집합 단위로 저장합니다.
+        - 보유 여부 확인과 신규 캐릭터 추가를 한 번에 처리하고 (add_characters_to_inventory)
+        - 중복 경험치는 캐릭터별로 합산해 한 번씩만 적용한 뒤, 바뀐 행을 한 번에 기록합니다.
+        100연차, 1000연차도 문장 몇 개로 끝납니다.
+        """
+        processed_results = []
+        # 트랜잭션 시작 시점에 티켓 차감
+        database.add_tickets(cursor, -len(drawn_chars), user_id)
+
+        inventory_ids = database.add_characters_to_inventory(cursor, [char['id'] for char in drawn_chars], user_id)
+        exp_by_inv_id = {} # inv_id → 합산된 중복 경험치 (삽입 순서 = 처음 중복된 순서)
+        seen = set()
+
+        for char in drawn_chars:
+            char_id = char['id']
+            grade = char['grade'].upper()
+            inv_id, is_new = inventory_ids.get(char_id, (None, None))
+            if is_new and char_id in seen: # 이번 뽑기에서 처음 얻고 다시 나온 캐릭터는 중복
+                is_new = False
+            seen.add(char_id)
+
+            result_info = {'char': char, 'is_duplicate': not is_new, 'exp_gain': 0}
+
+            if is_new:
+                print(f"[Gacha] 신규 캐릭터 획득: {char['name']}")
+            else:  # 중복 캐릭터
+                exp_to_add = GACHA_DUPLICATE_EXP.get(grade, 0)
+                result_info['exp_gain'] = exp_to_add
+
+                if exp_to_add > 0 and inv_id is not None:
+                    print(f"[Gacha] 중복 캐릭터 획득: {char['name']}. 경험치 +{exp_to_add}")
+                    exp_by_inv_id[inv_id] = exp_by_inv_id.get(inv_id, 0) + exp_to_add
+                else:
+                    print(f"[Gacha] 중복 캐릭터 획득: {char['name']}. (경험치 정보 없음 또는 inv_id 없음)")
+
+            processed_results.append(result_info)
 
-        return processed_results
\ No newline at end of file
+        # 레벨업은 누적 경험치 기준이므로 합산해서 한 번에 적용해도 결과가 같습니다.
+        inventory = InventoryUnitOfWork(cursor)
+        inventory.load(exp_by_inv_id)
+        for inv_id, exp_to_add in exp_by_inv_id.items():
+            LevelManager.gain_exp_for_character(cursor, inv_id, exp_to_add, inventory)
+        inventory.flush()
+        return processed_results
@@ -0,0 +1,176 @@
+import argparse
+import numpy as np
+import config
+from config import COUPON_REWARDS, GACHA_DUPLICATE_EXP
+from game_systems.gacha import GachaManager
+from game_systems.level_manager import LevelManager
+from game_systems.stage_manager import StageManager
+from game_systems.battle_data_handler import BattleDataHandler
+from game_systems.reward_system import RewardSystem
+
+PERCENTILES = (50, 90, 99)
+
+
+def build_grade_table(pool_sizes, rates):
+    """
+    등급별 (인원수, 1회 뽑기당 확률) 표를 만듭니다.
+    GachaManager와 같이 캐릭터가 없는 등급의 확률은 COMMON으로 넘깁니다.
+    """
+    total = sum(rates.values())
+    fallback = sum(rate for grade, rate in rates.items() if grade != "COMMON" and not pool_sizes.get(grade))
+    table = {}
+    for grade, rate in rates.items():
+        size = pool_sizes.get(grade, 0)
+        if size == 0:
+            continue
+        if grade == "COMMON":
+            rate += fallback
+        table[grade] = (size, rate / total)
+    return table
+
+
+def _cumulative_exp_table():
+    """2레벨 ~ 최대 레벨에 도달하기 위한 누적 경험치 배열 (LevelManager.CUMULATIVE_EXP 기준)"""
+    return np.array(LevelManager.CUMULATIVE_EXP[2:])
+
+
+def levels_from_exp(exp, cumulative_exp):
+    """1레벨/0경험치에서 exp를 한 번에 얻었을 때의 레벨 (최대 레벨 제한 포함)"""
+    return 1 + np.searchsorted(cumulative_exp, exp, side="right")
+
+
+def simulate_collection(grade_table, n_players, rng):
+    """
+    [신규] n_players명이 도감을 완성할 때까지 뽑는 과정을 한 번에 시뮬레이션합니다.
+    뽑기를 비율 1인 포아송 과정으로 보면 등급별 획득은 서로 독립인 포아송 과정이 되므로,
+    - 등급 g를 모두 모으는 데 필요한 등급 g 뽑기 수 K_g = 쿠폰 수집가 문제 (기하분포의 합)
+    - K_g번째 등급 g 뽑기 시각 τ_g ~ Gamma(K_g, 1/p_g), 도감 완성 시각 τ = max τ_g
+    - 다른 등급의 τ_g 이후 추가 획득 ~ Poisson(p_g (τ - τ_g))
+    로 뽑기를 하나씩 돌리지 않고도 정확한 분포를 얻습니다.
+    반환값: (총 뽑기 수 배열, {등급: (플레이어 수, 인원수) 캐릭터별 획득 횟수 배열})
+    """
+    k, tau, counts = {}, {}, {}
+    for grade, (size, p) in grade_table.items():
+        # 수집 순서 슬롯별 획득 횟수. j명을 모은 뒤 새 캐릭터가 나올 때까지의 중복은 앞선 j개 슬롯에 균등 분배
+        slot_counts = np.ones((n_players, size), dtype=np.int64)
+        for j in range(1, size):
+            dup = rng.geometric((size - j) / size, size=n_players) - 1
+            slot_counts[:, :j] += rng.multinomial(dup, np.full(j, 1.0 / j))
+        counts[grade] = slot_counts
+        k[grade] = slot_counts.sum(axis=1)
+        tau[grade] = rng.gamma(k[grade], 1.0 / p)
+
+    finish = np.max(np.stack(list(tau.values())), axis=0)
+    total_pulls = np.zeros(n_players, dtype=np.int64)
+    for grade, (size, p) in grade_table.items():
+        extra = rng.poisson(p * (finish - tau[grade]))
+        counts[grade] += rng.multinomial(extra, np.full(size, 1.0 / size))
+        total_pulls += k[grade] + extra
+    return total_pulls, counts
+
+
+def expected_tickets_per_run(top_floor=100):
+    """
+    등반 1회(1층 ~ top_floor층)에서 쿠폰 보상이 제시될 때마다 고른다고 가정한 기대 획득 쿠폰 수.
+    (보상 후보는 4개 중 3개이므로 쿠폰이 제시될 확률은 3/4)
+    """
+    offer_chance = RewardSystem.OFFER_COUNT / len(RewardSystem.REWARD_LABELS)
+    stage_manager = StageManager()
+    handler = BattleDataHandler(stage_manager)
+    total = 0
+    for floor in range(1, top_floor + 1):
+        is_boss = stage_manager.get_stage_info(floor)['is_boss_floor']
+        total += handler.grant_ticket_reward(is_boss)
+    return total * offer_chance
+
+
+def run_economy(grade_table, n_players, seed=None, batch_size=100_000):
+    """
+    배치 단위로 시뮬레이션하여 결과를 집계합니다.
+    반환값: {'pulls': 총 뽑기 수 배열, 'grades': {등급: {'dup_mean', 'exp_mean', 'level_hist'}}}
+    """
+    rng = np.random.default_rng(seed)
+    cumulative_exp = _cumulative_exp_table()
+    pulls = []
+    dup_sum = {grade: 0 for grade in grade_table}
+    level_hist = {grade: np.zeros(config.MAX_LEVEL + 1, dtype=np.int64) for grade in grade_table}
+
+    for start in range(0, n_players, batch_size):
+        size = min(batch_size, n_players - start)
+        batch_pulls, counts = simulate_collection(grade_table, size, rng)
+        pulls.append(batch_pulls)
+        for grade, per_char in counts.items():
+            dups = per_char - 1
+            dup_sum[grade] += int(dups.sum())
+            levels = levels_from_exp(dups * GACHA_DUPLICATE_EXP.get(grade, 0), cumulative_exp)
+            level_hist[grade] += np.bincount(levels.ravel(), minlength=config.MAX_LEVEL + 1)
+
+    grades = {}
+    for grade, (size, _) in grade_table.items():
+        n_chars = n_players * size
+        grades[grade] = {
+            "dup_mean": dup_sum[grade] / n_chars,
+            "exp_mean": dup_sum[grade] * GACHA_DUPLICATE_EXP.get(grade, 0) / n_chars,
+            "level_hist": level_hist[grade],
+        }
+    return {"pulls": np.concatenate(pulls), "grades": grades}
+
+
+def _hist_percentile(hist, q):
+    cum = np.cumsum(hist)
+    return int(np.searchsorted(cum, cum[-1] * q / 100))
+
+
+def print_report(result, grade_table, coupon_grade, runs_per_day, tickets_per_run):
+    pulls = result["pulls"]
+    print(f"\n=== 가챠 경제 시뮬레이션 (플레이어 {len(pulls):,}명, 신규 계정 기준) ===")
+    print("등급 확률: " + ", ".join(f"{g} {p * 100:.3f}% ({n}명)" for g, (n, p) in grade_table.items()))
+
+    pcts = np.percentile(pulls, PERCENTILES)
+    print(f"\n도감 완성까지 필요한 쿠폰: 평균 {pulls.mean():,.0f} | "
+          + " | ".join(f"p{q} {v:,.0f}" for q, v in zip(PERCENTILES, pcts)))
+
+    daily_income = COUPON_REWARDS[coupon_grade] + runs_per_day * tickets_per_run
+    print(f"쿠폰 수입: 등반 1회당 기대 {tickets_per_run:.1f}개, "
+          f"일일 {daily_income:.1f}개 (쿠폰 코드 '{coupon_grade}' {COUPON_REWARDS[coupon_grade]}개 + 등반 {runs_per_day}회)")
+    print("도감 완성까지 걸리는 일수: " + " | ".join(f"p{q} {v / daily_income:,.1f}일" for q, v in zip(PERCENTILES, pcts)))
+
+    print("\n등급    1인당 중복   1인당 중복 EXP   레벨 (p50 / p90 / 최대)")
+    for grade, stats in result["grades"].items():
+        hist = stats["level_hist"]
+        max_level = int(np.nonzero(hist)[0].max())
+        print(f"{grade:8s} {stats['dup_mean']:9.2f}   {stats['exp_mean']:13,.0f}   "
+              f"Lv.{_hist_percentile(hist, 50)} / Lv.{_hist_percentile(hist, 90)} / Lv.{max_level}")
+
+
+def _parse_rates(text):
+    """'MYTHIC=0.1,LEGEND=1' 형식의 확률 변경값을 GACHA_RATES에 덮어씁니다."""
+    rates = dict(GachaManager.GACHA_RATES)
+    for item in filter(None, (text or "").split(",")):
+        grade, value = item.split("=")
+        grade = grade.upper().strip()
+        if grade not in rates:
+            raise argparse.ArgumentTypeError(f"알 수 없는 등급입니다: {grade}")
+        rates[grade] = float(value)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가챠 경제 시뮬레이션 (도감 완성 비용과 중복 경험치)")
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--rates", type=_parse_rates, default=dict(GachaManager.GACHA_RATES),
+                        help="등급 확률 변경 (예: MYTHIC=0.1,LEGEND=1). 나머지는 GACHA_RATES 사용")
+    parser.add_argument("--coupon-grade", choices=list(COUPON_REWARDS.keys()), default="N", help="하루에 사용하는 쿠폰 코드 등급")
+    parser.add_argument("--runs-per-day", type=float, default=1.0, help="하루 등반 횟수")
+    parser.add_argument("--top-floor", type=int, default=100, help="등반 1회에 도달하는 층")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    pool_sizes = {grade: len(chars) for grade, chars in GachaManager().pool.items()}
+    grade_table = build_grade_table(pool_sizes, args.rates)
+    result = run_economy(grade_table, args.players, seed=args.seed)
+    print_report(result, grade_table, args.coupon_grade, args.runs_per_day, expected_tickets_per_run(args.top_floor))
+
+
+if __name__ == "__main__":
+    main()
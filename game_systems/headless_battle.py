@@ -0,0 +1,124 @@
+import random
+import config
+from game_systems.battle_system import BattleSystem
+
+
+class NullBattleView:
+    """
+    [View Protocol]
+    BattleSystem이 호출하는 View 인터페이스의 '아무것도 하지 않는' 구현체.
+    화면, 사운드, pygame 없이 전투 로직만 돌릴 때 사용합니다.
+    """
+    def request_floating_text(self, inv_id, text, color):
+        pass
+
+    def request_attack_animation(self, inv_id):
+        pass
+
+    def request_attack_sfx(self, attacker, action_type):
+        pass
+
+    def request_damage_animation(self, inv_id):
+        pass
+
+
+class RecordingBattleView(NullBattleView):
+    """
+    [View Protocol]
+    BattleSystem의 View 요청을 (종류, 인자...) 튜플로 기록만 하는 구현체.
+    회귀 테스트에서 전투 중 발생한 연출 요청 순서를 비교할 때 사용합니다.
+    """
+    def __init__(self):
+        self.events = []
+
+    def request_floating_text(self, inv_id, text, color):
+        self.events.append(("floating_text", inv_id, text))
+
+    def request_attack_animation(self, inv_id):
+        self.events.append(("attack_animation", inv_id))
+
+    def request_attack_sfx(self, attacker, action_type):
+        self.events.append(("attack_sfx", attacker.inv_id, action_type))
+
+    def request_damage_animation(self, inv_id):
+        self.events.append(("damage_animation", inv_id))
+
+
+def auto_policy(actor, battle_system):
+    """
+    [기본 정책] 아군 한 명의 행동을 자동으로 결정합니다.
+    - SP가 가득 차면 필살기, MP가 충분하면 스킬, 아니면 일반 공격
+    - 대상은 살아있는 적 중 무작위
+    반환값: (action, target). 살아있는 적이 없으면 target은 None
+    """
+    enemies = battle_system.get_enemy_fighters(alive_only=True)
+    if not enemies:
+        return "attack", None
+    if actor.sp >= actor.max_sp:
+        action = "ultimate"
+    elif actor.mp >= config.SKILL_MP_COST:
+        action = "skill"
+    else:
+        action = "attack"
+    return action, battle_system.rng.choice(enemies)
+
+
+def attack_only_policy(actor, battle_system):
+    """[정책] 항상 일반 공격만 사용합니다. (밸런스 기준선 측정용)"""
+    enemies = battle_system.get_enemy_fighters(alive_only=True)
+    return "attack", battle_system.rng.choice(enemies) if enemies else None
+
+
+def _issue_player_commands(battle_system, policy):
+    """WAIT_FOR_ACTOR 상태에서 명령 가능한 아군 전원에게 정책에 따라 명령을 내립니다."""
+    for actor in list(battle_system.commandable_fighters):
+        action, target = policy(actor, battle_system)
+        if target is None: # 공격할 대상이 없음 (전투 종료 판정으로 넘김)
+            return
+        battle_system.select_actor_for_command(actor)
+        # MP/SP 부족 등으로 행동이 거절되면 일반 공격으로 대체
+        if not battle_system.start_targeting_phase(action):
+            battle_system.start_targeting_phase("attack")
+        battle_system.select_target_and_confirm(target)
+
+
+def resolve_battle(fighters, policy=None, seed=None, view=None, max_rounds=200):
+    """
+    [신규] 화면 없이 전투 하나를 끝까지 진행하고 결과를 반환합니다.
+    - fighters: FighterData 리스트 (아군 + 적군). 전투 결과가 객체에 그대로 반영됩니다.
+    - policy: 아군 행동 결정 함수 policy(actor, battle_system) -> (action, target). 기본값은 auto_policy
+    - seed: 정수 시드 또는 random.Random 객체. 같은 시드면 같은 결과가 나옵니다.
+    - view: View 프로토콜 구현체. 기본값은 NullBattleView
+    TURN_DELAY나 프레임 대기 없이 start_battle_phase/execute_turn을 연속 호출합니다.
+    반환값: {'outcome': 'win'|'loss'|None, 'rounds': int, 'turns': int, 'system': BattleSystem}
+    """
+    policy = policy or auto_policy
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    view = view if view is not None else NullBattleView()
+
+    battle_system = BattleSystem(fighters, view, rng=rng, verbose=False)
+    battle_system.check_battle_end() # [수정] 한쪽이 처음부터 비어 있으면 명령 없이 바로 종료 (적 구성이 없는 층 등)
+    rounds = 0
+    turns = 0
+
+    while battle_system.state != "BATTLE_ENDED" and rounds < max_rounds:
+        state = battle_system.state
+        if state == "WAIT_FOR_ACTOR":
+            _issue_player_commands(battle_system, policy)
+        elif state == "BATTLE_EXECUTION":
+            if battle_system.execute_turn():
+                turns += 1
+        elif state == "ROUND_OVER":
+            rounds += 1
+            if not battle_system.check_battle_end():
+                battle_system.start_player_command_round()
+        else:
+            # COMMAND_INPUT/TARGET_SELECTION에 머무르는 것은 정책 오류이므로 중단
+            break
+
+    return {
+        "outcome": battle_system.outcome,
+        "rounds": rounds,
+        "turns": turns,
+        "system": battle_system,
+    }
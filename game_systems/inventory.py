@@ -0,0 +1,107 @@
+import json
+from database import _INVENTORY_DETAIL_QUERY, _INVENTORY_DETAILS_QUERY
+
+
+class InventoryRecord:
+    """
+    [Model]
+    inventory 한 행의 메모리 사본. set()으로 바꾼 컬럼만 dirty로 기록합니다.
+    """
+    def __init__(self, inv_id, values=None):
+        self.inv_id = inv_id
+        self.values = dict(values or {})
+        self.dirty = set()
+
+    def __getitem__(self, column):
+        return self.values[column]
+
+    def get(self, column, default=None):
+        return self.values.get(column, default)
+
+    def set(self, **values):
+        """컬럼 값을 바꾸고, 실제로 달라진 컬럼만 dirty로 표시합니다."""
+        for column, value in values.items():
+            if column not in InventoryUnitOfWork.WRITABLE_COLUMNS:
+                raise KeyError(f"inventory에 쓸 수 없는 컬럼입니다: {column}")
+            if column in self.values and self.values[column] == value and column not in self.dirty:
+                continue
+            self.values[column] = value
+            self.dirty.add(column)
+
+
+class InventoryUnitOfWork:
+    """
+    [신규] 한 트랜잭션 안의 인벤토리 변경을 모아 두었다가 한 번에 기록하는 Unit of Work.
+    - inv_id를 키로 하는 identity map: 같은 행은 한 번만 읽고, 이후 변경은 메모리 사본에 누적됩니다.
+      (10연차에서 같은 캐릭터가 여러 번 중복되어도 경험치가 이어서 쌓임)
+    - flush()는 바뀐 컬럼 조합마다 executemany 한 번으로 바뀐 컬럼만 UPDATE 합니다.
+    cursor의 트랜잭션 범위 안에서 사용하고, 끝나기 전에 flush()를 호출해야 합니다.
+    """
+    WRITABLE_COLUMNS = (
+        "level", "exp", "total_max_hp", "total_atk", "total_agi",
+        "current_hp", "current_mp", "current_sp", "is_selected",
+    )
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self._records = {} # inv_id → InventoryRecord
+
+    def get(self, inv_id):
+        """inv_id 행을 반환합니다. 처음 접근할 때만 DB에서 읽고, 없으면 None"""
+        record = self._records.get(inv_id)
+        if record is None:
+            self.cursor.execute(_INVENTORY_DETAIL_QUERY, (inv_id,))
+            row = self.cursor.fetchone()
+            if not row:
+                return None
+            record = self._add_loaded(row)
+        return record
+
+    def load(self, inv_ids):
+        """[신규] 아직 읽지 않은 여러 행을 쿼리 한 번으로 미리 읽어 둡니다. (일괄 처리 전에 호출)"""
+        missing = [inv_id for inv_id in dict.fromkeys(inv_ids) if inv_id not in self._records]
+        if not missing:
+            return
+        self.cursor.execute(_INVENTORY_DETAILS_QUERY, (json.dumps(missing),))
+        for row in self.cursor.fetchall():
+            self._add_loaded(row)
+
+    def _add_loaded(self, row):
+        # Row 팩토리가 없는 커서도 지원하도록 컬럼명으로 dict를 만듭니다.
+        column_names = [description[0] for description in self.cursor.description]
+        values = dict(zip(column_names, row))
+        record = InventoryRecord(values["inv_id"], values)
+        self._records[record.inv_id] = record
+        return record
+
+    def set(self, inv_id, **values):
+        """
+        inv_id 행의 컬럼 값을 바꿉니다. 아직 읽지 않은 행은 DB를 읽지 않고 바꾼 값만 기록합니다.
+        (진행 상황 저장처럼 쓸 값을 이미 알고 있는 경우)
+        """
+        record = self._records.get(inv_id)
+        if record is None:
+            record = self._records[inv_id] = InventoryRecord(inv_id)
+        record.set(**values)
+        return record
+
+    @property
+    def has_changes(self):
+        return any(record.dirty for record in self._records.values())
+
+    def flush(self):
+        """바뀐 컬럼만 DB에 기록합니다. 반환값은 실행한 UPDATE 문(executemany) 수"""
+        groups = {} # 바뀐 컬럼 조합 → 파라미터 리스트
+        for record in self._records.values():
+            if not record.dirty:
+                continue
+            columns = tuple(column for column in self.WRITABLE_COLUMNS if column in record.dirty)
+            groups.setdefault(columns, []).append(
+                tuple(record.values[column] for column in columns) + (record.inv_id,)
+            )
+            record.dirty.clear()
+
+        for columns, params in groups.items():
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            self.cursor.executemany(f"UPDATE inventory SET {assignments} WHERE id = ?", params)
+        return len(groups)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import math
+from bisect import bisect_right
 
 # 순환 참조 방지를 위한 Type Hinting
 from typing import TYPE_CHECKING
@@ -7,6 +8,8 @@ if TYPE_CHECKING:
     from game_systems.fighter_data import FighterData
 
 from game_systems.fighter_data import FighterData
+from game_systems.inventory import InventoryUnitOfWork
+from game_systems.master_data import MasterData
 import config
 import database
 
@@ -23,11 +26,23 @@ class LevelManager:
         return level * config.EXP_PER_LEVEL_COEFF
 
     @staticmethod
-    def _apply_stat_growth(fighter_data: FighterData):
+    def _build_cumulative_exp_table() -> list:
+        """
+        [신규] 1레벨/0경험치에서 각 레벨에 도달하기 위한 누적 경험치 표를 만듭니다.
+        인덱스가 레벨이며, table[0]은 bisect 편의를 위한 0입니다.
+        """
+        table = [0, 0]
+        for level in range(1, config.MAX_LEVEL):
+            table.append(table[-1] + LevelManager.calculate_next_max_exp(level))
+        return table
+
+    @staticmethod
+    def _apply_stat_growth(fighter_data: FighterData, levels: int = 1):
         """
         레벨업 시 등급에 따라 스탯을 분배하여 영구적으로 상승시킵니다.
         - HP: 60%, ATK: 30%, AGI: 10%
         - 모든 스탯은 정수로 내림 처리됩니다.
+        - [수정] 여러 레벨이 한 번에 오르면 levels배만큼 한 번에 적용합니다.
         """
         # [Fix] .upper()를 사용하여 등급명의 대소문자 달라도 값을 찾도록 수정
         total_growth = config.STAT_GROWTH_RATE.get(fighter_data.grade.upper(), 0)
@@ -35,9 +50,9 @@ class LevelManager:
             print(f"[Warning] {fighter_data.grade} 등급의 성장률이 정의되지 않았습니다.")
             return
 
-        hp_gain = math.floor(total_growth * 0.6)
-        atk_gain = math.floor(total_growth * 0.3)
-        agi_gain = total_growth - hp_gain - atk_gain
+        hp_gain = math.floor(total_growth * 0.6) * levels
+        atk_gain = math.floor(total_growth * 0.3) * levels
+        agi_gain = total_growth * levels - hp_gain - atk_gain
 
         fighter_data.max_hp += hp_gain
         fighter_data.atk += atk_gain
@@ -51,6 +66,7 @@ class LevelManager:
     def _calculate_level_ups(fighter_data: FighterData, amount: int) -> list:
         """
         [FIXED] 경험치 획득 및 레벨업 로직 수행. 레벨업 정보를 '리스트'로 반환.
+        [수정] 레벨을 하나씩 올리지 않고 누적 경험치 표에서 bisect로 최종 레벨을 바로 구합니다.
         """
         if fighter_data.level >= config.MAX_LEVEL:
             if amount > 0:
@@ -59,25 +75,25 @@ class LevelManager:
 
         fighter_data.exp += amount
         print(f"[EXP] {fighter_data.name}이(가) 경험치 {amount}를 획득했습니다. (현재: {fighter_data.exp}/{fighter_data.max_exp})")
-        
-        level_up_events = []
-        while fighter_data.exp >= fighter_data.max_exp and fighter_data.level < config.MAX_LEVEL:
-            old_level = fighter_data.level
-            excess_exp = fighter_data.exp - fighter_data.max_exp
-            fighter_data.level += 1
-            fighter_data.exp = excess_exp
-            
-            LevelManager._apply_stat_growth(fighter_data)
-            fighter_data.max_exp = LevelManager.calculate_next_max_exp(fighter_data.level)
-            
-            event_info = {"old": old_level, "new": fighter_data.level}
-            level_up_events.append(event_info)
-            print(f"[LevelUp] {fighter_data.name}이(가) 레벨 {fighter_data.level}이 되었습니다!")
-
-            if fighter_data.level >= config.MAX_LEVEL:
-                fighter_data.exp = 0
-                print(f"[LevelUp] {fighter_data.name}이(가) 최대 레벨에 도달했습니다!")
-                break
+
+        if fighter_data.exp < fighter_data.max_exp:
+            return []
+
+        old_level = fighter_data.level
+        total_exp = LevelManager.CUMULATIVE_EXP[old_level] + fighter_data.exp
+        new_level = min(bisect_right(LevelManager.CUMULATIVE_EXP, total_exp) - 1, config.MAX_LEVEL)
+
+        fighter_data.level = new_level
+        fighter_data.exp = total_exp - LevelManager.CUMULATIVE_EXP[new_level]
+        LevelManager._apply_stat_growth(fighter_data, new_level - old_level)
+        fighter_data.max_exp = LevelManager.calculate_next_max_exp(new_level)
+
+        level_up_events = [{"old": level, "new": level + 1} for level in range(old_level, new_level)]
+        print(f"[LevelUp] {fighter_data.name}이(가) 레벨 {fighter_data.level}이 되었습니다!")
+
+        if fighter_data.level >= config.MAX_LEVEL:
+            fighter_data.exp = 0
+            print(f"[LevelUp] {fighter_data.name}이(가) 최대 레벨에 도달했습니다!")
         
         return level_up_events
 
@@ -89,47 +105,54 @@ class LevelManager:
         return LevelManager._calculate_level_ups(fighter_data, amount)
 
     @staticmethod
-    def gain_exp_for_character(cursor: database.sqlite3.Cursor, inv_id: int, amount: int):
+    def gain_exp_for_character(cursor: database.sqlite3.Cursor, inv_id: int, amount: int, inventory: InventoryUnitOfWork = None):
         """
         [FIXED] ID로 캐릭터를 조회하여 '영구' 경험치를 부여하고, 레벨업 시 스탯을 DB에 저장합니다.
         기존 gain_exp 함수를 인라인하여 로직을 명확하게 합니다.
+        [수정] inventory(Unit of Work)를 넘기면 변경을 메모리 사본에만 기록하고, 저장은 호출한 쪽의 flush()에 맡깁니다.
+        (뽑기 결과 여러 건의 경험치를 UPDATE 한 번으로 저장)
         """
         if amount <= 0: return
 
-        char_db_data = database.get_character_details_by_inv_id_cursor(cursor, inv_id)
-        if not char_db_data:
+        own_inventory = inventory is None
+        if own_inventory:
+            inventory = InventoryUnitOfWork(cursor)
+
+        record = inventory.get(inv_id)
+        char = MasterData.get_character(record['char_id']) if record else None
+        if not char:
             print(f"[Error] LevelManager: inv_id {inv_id}에 해당하는 캐릭터를 찾을 수 없습니다.")
             return
 
-        # DB 데이터에서 FighterData 객체를 생성합니다. 이 객체는 일시적인 데이터 컨테이너로 사용됩니다.
-        max_hp = char_db_data['total_max_hp'] if char_db_data['total_max_hp'] is not None else char_db_data['base_hp']
-        atk = char_db_data['total_atk'] if char_db_data['total_atk'] is not None else char_db_data['base_atk']
-        agi = char_db_data['total_agi'] if char_db_data['total_agi'] is not None else char_db_data['base_agi']
+        # 인벤토리 행과 마스터 데이터로 FighterData 객체를 생성합니다. 이 객체는 일시적인 데이터 컨테이너로 사용됩니다.
+        max_hp = record['total_max_hp'] if record['total_max_hp'] is not None else char['hp']
+        atk = record['total_atk'] if record['total_atk'] is not None else char['atk']
+        agi = record['total_agi'] if record['total_agi'] is not None else char['agi']
         
         fighter = FighterData(
-            x=0, y=0, name=char_db_data['name'], is_enemy=False,
-            hp=max_hp, max_hp=max_hp, mp=char_db_data['base_mp'], max_mp=char_db_data['base_mp'],
-            sp_max=char_db_data['sp_max'], atk=atk, agi=agi,
-            image_path=char_db_data['image'], description=char_db_data['description'],
-            inv_id=char_db_data['inv_id'], level=char_db_data['level'],
-            exp=char_db_data['exp'], grade=char_db_data['grade']
+            x=0, y=0, name=char['name'], is_enemy=False,
+            hp=max_hp, max_hp=max_hp, mp=char['mp'], max_mp=char['mp'],
+            sp_max=char['sp_max'], atk=atk, agi=agi,
+            image_path=char['image'], description=char['description'],
+            inv_id=inv_id, level=record['level'],
+            exp=record['exp'], grade=char['grade']
         )
         
         # --- Start of inlined gain_exp logic ---
         level_up_events = LevelManager._calculate_level_ups(fighter, amount)
         
         if level_up_events:
-            # 레벨업이 발생한 경우, 변경된 모든 스탯(레벨, 경험치, 최대체력, 공격력, 민첩성)을 DB에 저장합니다.
-            database.update_character_stats(
-                cursor,
-                inv_id=fighter.inv_id, level=fighter.level, exp=fighter.exp,
-                max_hp=fighter.max_hp, atk=fighter.atk, agi=fighter.agi
-            )
-        elif amount > 0:
-            # 레벨업은 하지 않았지만 경험치를 얻은 경우, 경험치만 DB에 저장합니다.
-            database.update_character_exp(cursor, inv_id=fighter.inv_id, exp=fighter.exp)
+            # 레벨업이 발생한 경우, 변경된 모든 스탯(레벨, 경험치, 최대체력, 공격력, 민첩성)을 기록합니다.
+            record.set(level=fighter.level, exp=fighter.exp,
+                       total_max_hp=fighter.max_hp, total_atk=fighter.atk, total_agi=fighter.agi)
+        else:
+            # 레벨업은 하지 않았지만 경험치를 얻은 경우, 경험치만 기록합니다.
+            record.set(exp=fighter.exp)
         # --- End of inlined gain_exp logic ---
 
+        if own_inventory:
+            inventory.flush()
+
 
     @staticmethod
     def gain_temp_exp(fighter, exp_to_gain, temp_stats_dict):
@@ -170,3 +193,7 @@ class LevelManager:
 
         # 업데이트된 임시 스탯을 딕셔너리에 저장합니다.
         temp_stats_dict[character_id] = (new_level, current_exp)
+
+
+# [신규] 레벨별 누적 경험치 표 (config 값 기준으로 모듈 로드 시 한 번만 계산)
+LevelManager.CUMULATIVE_EXP = LevelManager._build_cumulative_exp_table()
@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+import database
+from database import ConnectionManager
+from game_systems.encounter_index import EncounterIndex
+
+
+class MasterDataSnapshot:
+    """
+    [Model]
+    한 시점의 characters/enemies 마스터 데이터와 색인. 만들어진 뒤에는 바뀌지 않습니다.
+    - 행은 dict로 보관하며 여러 시스템이 공유하므로, 값을 바꿔야 하면 dict(row)로 복사해서 사용합니다.
+    """
+    def __init__(self, version, character_rows, enemy_rows):
+        self.version = version
+        self.characters = tuple(character_rows)
+        self.enemies = tuple(enemy_rows)
+
+        self.characters_by_id = {c['id']: c for c in self.characters}
+        by_grade = {}
+        for c in self.characters:
+            by_grade.setdefault((c['grade'] or "").upper().strip(), []).append(c)
+        self.characters_by_grade = {grade: tuple(chars) for grade, chars in by_grade.items()}
+
+        self.enemies_by_id = {e['id']: e for e in self.enemies}
+        by_key = {}
+        for e in self.enemies:
+            by_key.setdefault((e['biome'], e['tier'], e['role']), []).append(e)
+        self.enemies_by_key = {key: tuple(enemies) for key, enemies in by_key.items()}
+        self.encounters = EncounterIndex(self.enemies)
+
+    def get_character(self, char_id):
+        return self.characters_by_id.get(char_id)
+
+    def get_characters_by_grade(self, grade):
+        return self.characters_by_grade.get(grade.upper().strip(), ())
+
+    def get_enemy(self, enemy_id):
+        return self.enemies_by_id.get(enemy_id)
+
+    def get_enemies(self, biome, tier, role):
+        """(바이옴, 티어, 역할)에 해당하는 적 목록 (DB 순서 유지)"""
+        return self.enemies_by_key.get((biome, tier, role), ())
+
+
+class MasterData:
+    """
+    [신규] 런타임에 읽기 전용인 마스터 데이터(characters, enemies)를 한 번만 DB에서 읽어 메모리에 두는 저장소.
+    - 가챠, 인벤토리, 전투, 레벨 시스템이 DB 대신 이 스냅샷을 조회합니다.
+    - update_master_data_from_csv가 데이터를 바꾸면 커밋 후 reload()로 새 스냅샷을 만들어 한 번에 교체합니다.
+      (교체는 참조 대입 한 번이므로, 이미 스냅샷을 받아 간 쪽은 이전 데이터를 끝까지 일관되게 봅니다.)
+    """
+    _snapshot = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        """현재 스냅샷을 반환합니다. 아직 없거나 마스터 데이터 버전이 바뀌었으면 다시 읽습니다."""
+        snapshot = cls._snapshot
+        if snapshot is None or snapshot.version != database.get_master_data_version():
+            snapshot = cls.reload()
+        return snapshot
+
+    @classmethod
+    def reload(cls, conn=None):
+        """
+        DB에서 마스터 데이터를 읽어 새 스냅샷으로 교체합니다.
+        conn을 주면 그 연결로 읽습니다. (시뮬레이터 워커처럼 공유 연결을 쓰지 않는 경우)
+        [수정] 읽기에 실패하면 (master 미ATTACH 등) 스냅샷을 교체하지 않고 이전 스냅샷을 반환합니다.
+        이전 스냅샷이 없으면 빈 스냅샷을 반환하되 저장하지 않으므로, 다음 get()에서 다시 읽기를 시도합니다.
+        """
+        with cls._lock:
+            version = database.get_master_data_version()
+            conn = conn or ConnectionManager().connection
+            try:
+                characters = [dict(row) for row in conn.execute("SELECT * FROM characters ORDER BY id")]
+                enemies = [dict(row) for row in conn.execute("SELECT * FROM enemies ORDER BY id")]
+            except sqlite3.Error as e:
+                print(f"[Critical Error] 마스터 데이터 로드 실패: {e}")
+                return cls._snapshot or MasterDataSnapshot(version, [], [])
+            snapshot = MasterDataSnapshot(version, characters, enemies)
+            cls._snapshot = snapshot
+        print(f"[System] 마스터 데이터 로드 완료 (캐릭터 {len(snapshot.characters)}명, 적 {len(snapshot.enemies)}종)")
+        return snapshot
+
+    @classmethod
+    def get_character(cls, char_id):
+        return cls.get().get_character(char_id)
+
+    @classmethod
+    def get_enemy(cls, enemy_id):
+        return cls.get().get_enemy(enemy_id)
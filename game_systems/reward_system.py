@@ -0,0 +1,67 @@
+import random
+from config import GREEN, GOLD
+
+
+class RewardSystem:
+    """
+    [Model]
+    층 클리어 보상의 후보 추첨과 스탯 보상 적용 규칙을 전담하는 정적 클래스.
+    RewardPopup(View), BattleScene(Controller), 등반 시뮬레이터가 같은 규칙을 공유합니다.
+    """
+    REWARD_LABELS = {
+        "REWARD_HEAL": "[회복] 체력 30% 회복",
+        "REWARD_HP_UP": "[성장] 최대 체력 +20",
+        "REWARD_ATK_UP": "[강화] 공격력 +5",
+        "REWARD_TICKET": "[행운] 뽑기 쿠폰 1개"
+    }
+    BOSS_TICKET_LABEL = "[대박] 뽑기 쿠폰 5개"
+    OFFER_COUNT = 3
+
+    HEAL_RATIO = 0.3
+    HP_UP_AMOUNT = 20
+    ATK_UP_AMOUNT = 5
+
+    @staticmethod
+    def get_reward_labels(is_boss_floor):
+        """층 종류에 맞는 {보상 코드: 표시 문구} 사전을 반환합니다."""
+        labels = dict(RewardSystem.REWARD_LABELS)
+        if is_boss_floor:
+            labels["REWARD_TICKET"] = RewardSystem.BOSS_TICKET_LABEL
+        return labels
+
+    @staticmethod
+    def roll_rewards(is_boss_floor, rng=random):
+        """전체 보상 중 OFFER_COUNT개를 무작위로 뽑아 코드 리스트로 반환합니다."""
+        codes = list(RewardSystem.get_reward_labels(is_boss_floor).keys())
+        return rng.sample(codes, RewardSystem.OFFER_COUNT)
+
+    @staticmethod
+    def apply_stat_reward(player_fighters, reward_code):
+        """
+        스탯 보상(회복/최대 체력/공격력)을 살아있는 아군에게 적용합니다.
+        REWARD_TICKET은 DB 처리가 필요하므로 여기서 다루지 않습니다.
+        반환값: 연출용 [(fighter, 표시 문구, 색상), ...]
+        """
+        effects = []
+        for fighter in player_fighters:
+            # 살아있는 캐릭터에게만 보상 적용
+            if not fighter.is_alive:
+                continue
+
+            if reward_code == "REWARD_HEAL":
+                heal_amount = int(fighter.max_hp * RewardSystem.HEAL_RATIO)
+                # 최대 체력을 초과하지 않도록 실제 회복량 계산
+                healed_amount = min(heal_amount, fighter.max_hp - fighter.hp)
+                fighter.hp += healed_amount
+                if healed_amount > 0:
+                    effects.append((fighter, f"+{healed_amount}", GREEN))
+
+            elif reward_code == "REWARD_HP_UP":
+                fighter.max_hp += RewardSystem.HP_UP_AMOUNT
+                fighter.hp += RewardSystem.HP_UP_AMOUNT # 최대 체력이 늘어난만큼 현재 체력도 채워줌
+                effects.append((fighter, f"MAX HP +{RewardSystem.HP_UP_AMOUNT}", GOLD))
+
+            elif reward_code == "REWARD_ATK_UP":
+                fighter.atk += RewardSystem.ATK_UP_AMOUNT
+                effects.append((fighter, f"ATK +{RewardSystem.ATK_UP_AMOUNT}", GOLD))
+        return effects
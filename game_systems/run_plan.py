@@ -0,0 +1,103 @@
+import json
+import random
+import zlib
+from config import DEFAULT_USER_ID
+from database import STATEMENTS
+from game_systems.master_data import MasterData
+from game_systems.stage_manager import StageManager
+from game_systems.battle_data_handler import BattleDataHandler
+
+
+class RunPlan:
+    """
+    [Model]
+    하나의 시드로 1~100층 전체의 스테이지 정보, 적 구성, BGM, 배경을 미리 정해 둔 등반 계획.
+    - '새로 하기' 시 생성하여 DB(run_plans)에 저장하고, '이어 하기' 시 다시 계산하지 않고 복원합니다.
+    - 층을 넘어갈 때는 이 계획만 조회하므로 DB 쿼리가 없습니다.
+    - 같은 시드면 바이옴 순서와 적 구성이 항상 같습니다. (층마다 "시드:층" 난수를 따로 사용)
+    """
+    TOP_FLOOR = 100
+    FORMAT_VERSION = 1
+
+    def __init__(self, seed, phase_orders=None, lineups=None):
+        self.seed = seed
+        self.stage_manager = StageManager(rng=random.Random(f"{seed}:biomes"), phase_orders=phase_orders)
+        lineups = lineups or {}
+        self.floors = [None] # 인덱스 = 층
+        for floor in range(1, self.TOP_FLOOR + 1):
+            info = self.stage_manager.get_stage_info(floor)
+            info["bgm"] = self.stage_manager.get_current_bgm_name(floor)
+            info["background"] = info["biome"]
+            enemy_ids = lineups.get(floor)
+            if enemy_ids is None:
+                enemy_ids = self._pick_enemy_ids(floor)
+            info["enemy_ids"] = tuple(enemy_ids)
+            self.floors.append(info)
+
+    @classmethod
+    def generate(cls, seed=None):
+        """새 시드(지정하지 않으면 무작위)로 등반 계획을 만듭니다."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(62)
+        plan = cls(seed)
+        print(f"[System] 등반 계획 생성 완료 (seed={seed})")
+        return plan
+
+    def _pick_enemy_ids(self, floor):
+        handler = BattleDataHandler(self.stage_manager, rng=random.Random(f"{self.seed}:{floor}"))
+        return [row['id'] for row in handler._pick_enemy_rows(floor)]
+
+    # --- 조회 (StageManager와 같은 이름으로 제공) ---
+    def get_stage_info(self, floor):
+        if not (1 <= floor <= self.TOP_FLOOR):
+            raise ValueError(f"유효하지 않은 층입니다: {floor}. 층수는 1에서 {self.TOP_FLOOR} 사이여야 합니다.")
+        return self.floors[floor]
+
+    def get_current_bgm_name(self, floor):
+        return self.get_stage_info(floor)["bgm"]
+
+    def get_enemy_data(self, floor):
+        """층수 기반 스케일링을 적용한 적 데이터 리스트를 반환합니다."""
+        info = self.get_stage_info(floor)
+        master = MasterData.get()
+        rows = [master.get_enemy(enemy_id) for enemy_id in info["enemy_ids"]]
+        if not all(rows):
+            # 계획 생성 이후 마스터 데이터에서 적이 삭제된 경우, 같은 층 시드로 다시 뽑음
+            print(f"[Warning] {floor}층 적 구성에 없는 적이 있어 다시 뽑습니다: {info['enemy_ids']}")
+            info["enemy_ids"] = tuple(self._pick_enemy_ids(floor))
+            rows = [master.get_enemy(enemy_id) for enemy_id in info["enemy_ids"]]
+        return BattleDataHandler.scale_enemy_data(rows, floor)
+
+    # --- 저장/복원 ---
+    def encode(self):
+        """바이옴 순서와 층별 적 ID만 JSON으로 묶어 zlib으로 압축합니다. (나머지는 규칙으로 다시 계산)"""
+        payload = {
+            "v": self.FORMAT_VERSION,
+            "phase_orders": self.stage_manager.phase_orders,
+            "lineups": [list(info["enemy_ids"]) for info in self.floors[1:]],
+        }
+        return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def decode(cls, seed, blob):
+        payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+        if payload.get("v") != cls.FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 등반 계획 형식입니다: {payload.get('v')}")
+        lineups = {floor: ids for floor, ids in enumerate(payload["lineups"], start=1)}
+        return cls(seed, phase_orders=payload["phase_orders"], lineups=lineups)
+
+    def save(self, cursor, user_id=DEFAULT_USER_ID):
+        cursor.execute(STATEMENTS["save_run_plan"], (user_id, self.seed, self.encode()))
+
+    @classmethod
+    def load(cls, cursor, user_id=DEFAULT_USER_ID):
+        """저장된 등반 계획을 복원합니다. 없거나 읽을 수 없으면 None"""
+        cursor.execute(STATEMENTS["load_run_plan"], (user_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        try:
+            return cls.decode(row[0], row[1])
+        except (ValueError, KeyError, zlib.error) as e:
+            print(f"[Warning] 저장된 등반 계획을 읽을 수 없습니다: {e}")
+            return None
@@ -22,20 +22,25 @@ class StageManager:
         100: 9100 # 어둠의 엄마
     }
 
-    def __init__(self):
+    def __init__(self, rng=None, phase_orders=None):
+        self.rng = rng if rng is not None else random # [신규] 시뮬레이션 재현을 위한 난수 생성기 주입
         self.biomes = ["Mario", "Pokemon", "DemonSlayer"]
         self.phase_orders = {}
         self.session_party_data = None
         """등반 세션 동안 파티의 현재 상태(FighterData 리스트)를 저장합니다.
            다음 층으로 이동 시 이 데이터를 사용해 파티 상태를 유지합니다."""
-        self._shuffle_biomes()
+        if phase_orders:
+            # [신규] 저장된 등반 계획(RunPlan)에서 복원하는 경우 셔플하지 않음
+            self.phase_orders = {int(phase): list(order) for phase, order in phase_orders.items()}
+        else:
+            self._shuffle_biomes()
 
     def _shuffle_biomes(self):
         """각 페이즈별 바이옴 순서를 미리 섞어서 저장"""
         # Phase 1, 2, 3 각각에 대해 순서를 랜덤하게 섞음
         for phase in [1, 2, 3]:
             order = self.biomes.copy()
-            random.shuffle(order)
+            self.rng.shuffle(order)
             self.phase_orders[phase] = order
         
         # Phase 4는 Final 고정
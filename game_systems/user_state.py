@@ -0,0 +1,106 @@
+import threading
+from config import DEFAULT_USER_ID
+from database import ConnectionManager
+
+
+class UserState:
+    """
+    [Model]
+    유저 정보(티켓, 골드, 젬, 현재 층, 선택된 파티 인원)의 메모리 캐시.
+    - 유저별로 한 번만 DB에서 읽고, 이후 프레임 루프와 Scene은 이 객체만 읽습니다. (DB I/O 없음)
+    - DB에 쓰는 쪽은 커밋이 끝난 뒤 apply()/add()로 값을 갱신합니다. (write-through)
+    - 값이 바뀌면 subscribe()로 등록된 콜백에 알립니다.
+    [수정] on_commit 콜백은 DB 쓰기 스레드(DBWriter)에서, Scene은 메인 스레드에서 apply()/add()를 호출하므로
+    값 갱신과 구독자 알림은 유저별 잠금 안에서 수행합니다. (콜백도 잠금을 쥔 채 순서대로 호출됨)
+    """
+    FIELDS = ("tickets", "gold", "gems", "current_floor", "selected_count")
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, user_id=DEFAULT_USER_ID):
+        """유저의 UserState를 반환합니다. 처음 접근할 때만 DB에서 읽어옵니다. (여러 스레드에서 호출 가능)"""
+        state = cls._instances.get(user_id)
+        if state is None:
+            with cls._instances_lock:
+                state = cls._instances.get(user_id)
+                if state is None:
+                    state = cls(user_id)
+                    cls._instances[user_id] = state
+        return state
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.tickets = 0
+        self.gold = 0
+        self.gems = 0
+        self.current_floor = 1
+        self.selected_count = 0
+        self._subscribers = []
+        self._lock = threading.RLock() # 콜백 안에서 다시 apply()해도 되도록 재진입 가능
+        self.reload()
+
+    def reload(self):
+        """DB에서 모든 값을 다시 읽어옵니다. (초기 로드 또는 외부에서 DB를 직접 수정한 경우)"""
+        db = ConnectionManager()
+        row = db.connection.execute(
+            "SELECT tickets, gold, gems, current_floor FROM users WHERE user_id=?", (self.user_id,)
+        ).fetchone()
+        selected = db.fetch_one("count_selected", (self.user_id,))[0]
+        if row:
+            self.apply(tickets=row['tickets'] or 0, gold=row['gold'] or 0, gems=row['gems'] or 0,
+                       current_floor=row['current_floor'] or 1, selected_count=selected)
+        else:
+            self.apply(selected_count=selected)
+
+    def subscribe(self, callback):
+        """값 변경 시 callback(user_state, {필드: 새 값})을 호출하도록 등록합니다."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def apply(self, **values):
+        """필드 값을 설정하고, 실제로 바뀐 값이 있으면 구독자에게 알립니다."""
+        with self._lock:
+            changed = {}
+            for field, value in values.items():
+                if field not in self.FIELDS:
+                    raise AttributeError(f"UserState에 '{field}' 필드가 없습니다.")
+                if getattr(self, field) != value:
+                    setattr(self, field, value)
+                    changed[field] = value
+            if changed:
+                for callback in list(self._subscribers):
+                    callback(self, changed)
+            return changed
+
+    def add(self, field, amount):
+        """숫자 필드에 amount를 더합니다. (읽기-수정-쓰기를 잠금 안에서 수행)"""
+        with self._lock:
+            return self.apply(**{field: getattr(self, field) + amount})
+
+    @classmethod
+    def apply_on_commit(cls, user_id, **values):
+        """
+        현재 트랜잭션이 커밋된 뒤에 apply()를 실행합니다. (롤백되면 무시)
+        아직 로드되지 않은 유저는 다음 get()에서 커밋된 값을 읽으므로 건너뜁니다.
+        """
+        def _apply():
+            state = cls._instances.get(user_id)
+            if state:
+                state.apply(**values)
+        ConnectionManager().on_commit(_apply)
+
+    @classmethod
+    def add_on_commit(cls, user_id, field, amount):
+        """현재 트랜잭션이 커밋된 뒤에 add()를 실행합니다. (롤백되면 무시)"""
+        def _add():
+            state = cls._instances.get(user_id)
+            if state:
+                state.add(field, amount)
+        ConnectionManager().on_commit(_add)
@@ -1,12 +1,17 @@
-import pygame, sys, sqlite3, os
+import pygame, sys, os
 from config import * # (수정) DEFAULT_USER_ID, INITIAL_TICKETS, SYSTEM_MESSAGE_DURATION 추가됨
 
-from database import init_db, start_new_run, update_master_data_from_csv
+from database import init_db, start_new_run, update_master_data_from_csv, ConnectionManager
 from ui.components import Button, InputBox
 from game_systems.coupon import CouponManager
 from game_systems.gacha import GachaManager
+from game_systems.user_state import UserState
+from game_systems.db_writer import DBWriter
 from ui.background_manager import BackgroundManager
 from ui.audio_manager import AudioManager
+from ui.text_cache import get_sys_font, render_text
+from ui.dirty_rects import DirtyRects
+from ui.layer_cache import get_overlay
 
 # [리팩토링] Scene 기반 아키텍처 도입
 from scenes.lobby_scene import LobbyScene
@@ -15,16 +20,6 @@ from scenes.deck_scene import DeckScene
 from scenes.coupon_scene import CouponScene
 from scenes.battle_scene import BattleScene # [수정] BattleScene의 위치 변경
 
-def get_user_tickets():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT tickets FROM users WHERE user_id=?", (DEFAULT_USER_ID,))
-    row = cur.fetchone()
-    conn.close()
-    return row[0] if row else 0
-
-
-
 def main():
     pygame.init()
     AudioManager() # 오디오 관리자 초기 생성
@@ -40,23 +35,33 @@ def main():
         pygame.quit()
         sys.exit()
 
+    # [신규] DB 쓰기 스레드 시작 (진행 상황 저장 등은 렌더링 스레드에서 커밋하지 않음)
+    DBWriter().start()
+
+    # [신규] 현재 프로필. 모든 Scene은 shared_data['user_id']로 유저 데이터를 읽고 씁니다.
+    user_id = DEFAULT_USER_ID
+
     # [테스트용 임시 코드] 게임 시작 시 티켓 100개 자동 지급
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("UPDATE users SET tickets = 500 WHERE user_id=?", (DEFAULT_USER_ID,))
-    conn.commit()
-    conn.close()
+    ConnectionManager().execute("set_tickets", (500, user_id))
     print("[Debug] 테스트용 티켓 100개가 지급되었습니다.")
 
     # [리팩토링] Scene에서 공유할 자원들을 딕셔너리로 관리
     shared_data = {
         'background_manager': BackgroundManager(),
-        'info_font': pygame.font.SysFont("malgungothic", 20),
-        'title_font': pygame.font.SysFont("malgungothic", 50, bold=True),
+        'info_font': get_sys_font(20), # [수정] FontRegistry에서 공유 (씬/뷰가 같은 폰트 객체를 씀)
+        'title_font': get_sys_font(50, is_bold=True),
         'system_message': "",
         'system_message_timer': 0,
         'tickets': 0,
+        'user_id': user_id,
     }
 
+    # [신규] 유저 정보는 한 번만 로드하고, 값이 바뀔 때만 shared_data에 반영 (프레임 루프에서 DB 조회 없음)
+    user_state = UserState.get(user_id)
+    shared_data['tickets'] = user_state.tickets
+    user_state.subscribe(lambda state, changed: shared_data.update(tickets=state.tickets))
+    user_state.subscribe(lambda state, changed: DirtyRects().invalidate_all()) # [신규] 티켓/층 표시가 바뀜 (더티 렉트 모드)
+
     # [리팩토링] 각 시스템 관리자들을 미리 생성
     gacha_manager = GachaManager()
 
@@ -72,14 +77,20 @@ def main():
     # [리팩토링] 아래 변수들은 각 Scene으로 모두 이동 예정
     game_state = "LOBBY" # 임시 변수. Scene 전환 로직 완성 후 제거 예정
 
+    # [신규] 더티 렉트 렌더링 상태: 직전 프레임을 더티 렉트로 그린 씬, 직전 프레임의 시스템 메시지
+    dirty_rects = DirtyRects()
+    dirty_scene = None
+    last_system_message = None
+
     while True:
         mouse_pos = pygame.mouse.get_pos()
-        shared_data['tickets'] = get_user_tickets()
 
         # [이벤트 루루프 수정] 이벤트를 하나씩 가져와 현재 씬에 개별적으로 전달합니다.
         # 이 구조는 이벤트 처리의 혼란을 막고 모든 씬의 동작을 일관되게 만듭니다.
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                DBWriter().stop() # 남은 쓰기 명령을 모두 커밋한 뒤 종료
+                ConnectionManager().close()
                 pygame.quit()
                 sys.exit()
             
@@ -119,26 +130,45 @@ def main():
             if hasattr(current_scene, 'enter') and callable(getattr(current_scene, 'enter')):
                 current_scene.enter()
 
-        screen.fill(BLACK) # 기본 배경색
-        
-        # [리팩토링] 화면 그리기를 현재 Scene에 위임
-        current_scene.draw(screen)
-
-        # [수정] 시스템 메시지 UI
-        if shared_data['system_message']:
-            # 타이머 로직은 임시로 단순화. 추후 update에서 처리
-            info_font = shared_data['info_font']
-            overlay = pygame.Surface((800, 60))
-            overlay.set_alpha(180); overlay.fill(BLACK)
-            screen.blit(overlay, (SCREEN_WIDTH//2 - 400, 20))
-            msg_surf = info_font.render(shared_data['system_message'], True, WHITE)
-            screen.blit(msg_surf, msg_surf.get_rect(center=(SCREEN_WIDTH//2, 50)))
-            # 메시지를 한 번만 표시하고 지움 (임시)
-            if pygame.time.get_ticks() % 120 == 0:
-                 shared_data['system_message'] = ""
-
-        pygame.display.flip()
+        # [신규] 더티 렉트 렌더링: 지원하는 메뉴 씬에서는 바뀐 영역만 다시 그려 내보냄
+        use_dirty_rects = DIRTY_RECT_RENDERING and current_scene.supports_dirty_rects
+        if shared_data['system_message'] != last_system_message:
+            last_system_message = shared_data['system_message']
+            dirty_rects.invalidate_all() # 메시지는 씬마다 그리는 위치가 달라 전체를 다시 그림
+        rects = dirty_rects.take()
+        if use_dirty_rects and dirty_scene is not current_scene:
+            rects = None # 씬 전환, 또는 전체 그리기 모드에서 막 넘어옴
+        dirty_scene = current_scene if use_dirty_rects else None
+
+        if not use_dirty_rects or rects is None:
+            draw_frame(screen, current_scene, shared_data)
+            pygame.display.flip()
+        elif rects:
+            screen.set_clip(rects[0].unionall(rects[1:])) # 클립 밖의 그리기는 픽셀 작업 없이 건너뜀
+            draw_frame(screen, current_scene, shared_data)
+            screen.set_clip(None)
+            pygame.display.update(rects)
+
+        # 메시지를 한 번만 표시하고 지움 (임시)
+        if shared_data['system_message'] and pygame.time.get_ticks() % 120 == 0:
+            shared_data['system_message'] = ""
         clock.tick(FPS)
 
+
+def draw_frame(screen, current_scene, shared_data):
+    """[리팩토링] 한 프레임을 그립니다. (현재 Scene + 시스템 메시지)"""
+    screen.fill(BLACK) # 기본 배경색
+    
+    # [리팩토링] 화면 그리기를 현재 Scene에 위임
+    current_scene.draw(screen)
+
+    # [수정] 시스템 메시지 UI
+    if shared_data['system_message']:
+        # 타이머 로직은 임시로 단순화. 추후 update에서 처리
+        info_font = shared_data['info_font']
+        screen.blit(get_overlay((800, 60), 180), (SCREEN_WIDTH//2 - 400, 20)) # [수정] 캐시된 오버레이
+        msg_surf = render_text(info_font, shared_data['system_message'], WHITE)
+        screen.blit(msg_surf, msg_surf.get_rect(center=(SCREEN_WIDTH//2, 50)))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,6 +5,10 @@ class BaseScene:
     모든 Scene 클래스의 부모 클래스 (공통 업무 매뉴얼).
     모든 직원은 아래의 기본 업무 능력을 갖추어야 합니다.
     """
+    # [신규] True인 씬은 DIRTY_RECT_RENDERING 모드에서 바뀐 영역만 다시 그립니다.
+    # 보이는 상태가 바뀌면 DirtyRects로 알려야 하고, 호버 확인 같은 상태 변경은 draw()가 아닌 update()에서 해야 합니다.
+    supports_dirty_rects = False
+
     def __init__(self):
         self.next_scene_name = None
 
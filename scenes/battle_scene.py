@@ -2,13 +2,13 @@ import pygame
 import random
 import os
 from config import *
-from game_systems.stage_manager import StageManager
 from ui.audio_manager import AudioManager
 from scenes.base_scene import BaseScene
 from game_systems.battle_data_handler import BattleDataHandler
 from game_systems.battle_system import BattleSystem
+from game_systems.reward_system import RewardSystem
 from ui.battle_view import BattleView # Import the new View
-from game_systems.fighter_data import FighterData
+from ui.floor_prefetcher import FloorPrefetcher
 
 
 class BattleScene(BaseScene):
@@ -24,16 +24,16 @@ class BattleScene(BaseScene):
         self.shared_data = shared_data
         self.mode = mode
         
-        # --- [Task 2] Get or create a persistent StageManager ---
-        self.stage_manager = shared_data.get('stage_manager')
-        if not self.stage_manager:
-            self.stage_manager = StageManager()
-            shared_data['stage_manager'] = self.stage_manager
+        # --- [수정] 등반 계획(RunPlan)은 세션 동안 유지하고, '새로 하기'면 setup_battle에서 새로 만듭니다 ---
+        self.run_plan = shared_data.get('run_plan') if mode != 'NEW_GAME' else None
+        self.stage_manager = self.run_plan.stage_manager if self.run_plan else None
 
         # --- Model and View ---
-        self.data_handler = BattleDataHandler(self.stage_manager)
+        self.user_id = shared_data.get('user_id', DEFAULT_USER_ID)
+        self.data_handler = BattleDataHandler(self.stage_manager, run_plan=self.run_plan, user_id=self.user_id)
         self.battle_system = None # Will be initialized in setup_battle
         self.view = BattleView(screen, shared_data)
+        self.prefetcher = FloorPrefetcher() # [신규] 보상 선택 중 다음 층 자원 미리 불러오기
 
         # --- Scene State ---
         self.battle_state = "PREPARING" 
@@ -49,20 +49,17 @@ class BattleScene(BaseScene):
     def enter(self):
         """씬에 진입할 때 호출됩니다. 전투를 설정하고 뷰를 업데이트합니다."""
         self.setup_battle()
-        self.view.update_background(self.floor, self.data_handler.stage_manager)
+        if self.run_plan:
+            self.view.update_background(self.floor, self.run_plan)
 
     def setup_battle(self):
         """[MODIFIED] 세션 데이터를 확인하여 전투를 준비하거나, 새로 데이터를 로드합니다."""
         try:
-            # BGM 재생
-            bgm_name = self.stage_manager.get_current_bgm_name(self.floor)
-            AudioManager().play_bgm(bgm_name)
-
             # 기존 전투 준비 로직
             self.fighter_data_list.clear() # [Fix] vfx_manager로 변경
             self.view.vfx_manager.clear()
 
-            session_fighters = self.stage_manager.session_party_data
+            session_fighters = self.stage_manager.session_party_data if self.stage_manager else None
 
             if session_fighters:
                 # 세션 데이터가 있으면, 파티 정보는 그대로 사용하고 적만 새로 로드
@@ -70,8 +67,10 @@ class BattleScene(BaseScene):
                 self.fighter_data_list.extend(session_fighters)
                 self.stage_manager.session_party_data = None  # 데이터 사용 후 초기화
 
-                # 파티 로드를 건너뛰고 적 정보만 가져오는 기능이 없으므로, 기존 함수를 호출하되 파티 데이터는 무시
-                _, enemy_list, self.floor = self.data_handler.setup_battle_data(self.floor, 'CONTINUE_FIGHT')
+                # [수정] 적 구성은 등반 계획에 이미 있으므로 DB 조회 없이 가져옴 (보상 선택 중 미리 준비된 결과 우선)
+                enemy_list = self.prefetcher.take(self.floor)
+                if enemy_list is None:
+                    enemy_list = self.run_plan.get_enemy_data(self.floor)
                 
             else:
                 # 세션 데이터가 없으면(첫 층), DB에서 모든 데이터를 로드
@@ -81,6 +80,13 @@ class BattleScene(BaseScene):
                 self.party_data = party_data
                 self.floor = new_floor
                 self._place_party_fighters() # self.fighter_data_list에 아군 FighterData 추가
+                # 새로 만들었거나 DB에서 복원한 등반 계획을 세션에 보관
+                self.run_plan = self.data_handler.run_plan
+                self.stage_manager = self.run_plan.stage_manager
+                self.shared_data['run_plan'] = self.run_plan
+
+            # BGM 재생
+            AudioManager().play_bgm(self.run_plan.get_current_bgm_name(self.floor))
             
             # 공통 로직: 적 생성 및 시스템 초기화
             self._spawn_enemies_from_data(enemy_list)
@@ -119,8 +125,10 @@ class BattleScene(BaseScene):
                     self.log_message = "승리!"
                     self.battle_system.process_victory(self.floor) # [신규] 경험치 분배 로직 호출
                     self.save_party_status()
-                    is_boss = self.data_handler.stage_manager.get_stage_info(self.floor)['is_boss_floor']
+                    is_boss = self.run_plan.get_stage_info(self.floor)['is_boss_floor']
                     self.view.reward_popup.generate_rewards(is_boss) # Tell view to generate rewards
+                    if self.floor < self.run_plan.TOP_FLOOR:
+                        self.prefetcher.start(self.run_plan, self.floor + 1) # 보상을 고르는 동안 다음 층 준비
                 else: # 'loss'
                     self.battle_state = "DEFEAT"
                     self.log_message = "패배..."
@@ -134,7 +142,7 @@ class BattleScene(BaseScene):
             self.reward_display_timer -= 1
             if self.reward_display_timer <= 0:
                 self.setup_battle()
-                self.view.update_background(self.floor, self.data_handler.stage_manager)
+                self.view.update_background(self.floor, self.run_plan)
 
     def handle_events(self, events, mouse_pos):
         """View로부터 받은 Action에 따라 Model(System)을 제어합니다."""
@@ -220,71 +228,38 @@ class BattleScene(BaseScene):
         [MODIFIED] party_data를 기반으로 Fighter 객체를 생성하고 배치합니다.
         [Task 2] 이제 사망한 캐릭터도 생성하여 전투 세션에 포함시킵니다.
         """
-        start_y = 350 if len(self.party_data) == 1 else 300
-        for idx, data in enumerate(self.party_data):
-            # [Task 2 Fix] 'hp <= 0' 체크를 제거하여 사망한 캐릭터도 FighterData로 만듦
-            f_data = FighterData(200, start_y + (idx * 150), data["name"], False,
-                        data["hp"], data["max_hp"], data["mp"], data["max_mp"], data["sp_max"],
-                        data["atk"], data["agi"], data["image"], data["description"], data["inv_id"],
-                        level=data["level"], exp=data["exp"], grade=data["grade"],
-                        sfx_type=data["sfx_type"], skill_name=data["skill_name"], ult_name=data["ult_name"]
-                        )
-            f_data.sp = data["sp"]
-            self.fighter_data_list.append(f_data)
+        # [Task 2 Fix] 'hp <= 0' 체크를 제거하여 사망한 캐릭터도 FighterData로 만듦
+        self.fighter_data_list.extend(BattleDataHandler.create_party_fighters(self.party_data))
 
     def _spawn_enemies_from_data(self, enemy_data_list):
         """data_handler로부터 받은 데이터로 적을 생성합니다."""
-        stage_info = self.data_handler.stage_manager.get_stage_info(self.floor)
+        stage_info = self.run_plan.get_stage_info(self.floor)
         
         if stage_info['is_boss_floor'] and enemy_data_list:
             self.log_message = f"!!! {enemy_data_list[0]['name']} (BOSS) 출현 !!!"
         else:
             self.log_message = f"{self.floor}층 [{stage_info['biome']}]"
             
-        scale = 1 + (self.floor - 1) * 0.05
-        for i, e_data in enumerate(enemy_data_list):
-            hp, atk = int(e_data['hp'] * scale), int(e_data['atk'] * scale)
-            y_pos = 350 if len(enemy_data_list) == 1 else 300 + i * 150
-            self.fighter_data_list.append(FighterData(900, y_pos, e_data['name'], True, hp, hp, 50*stage_info['tier'], 50*stage_info['tier'], 100, atk, e_data['agi'], e_data['image'], e_data['role']))
+        self.fighter_data_list.extend(
+            BattleDataHandler.create_enemy_fighters(enemy_data_list, self.floor, stage_info['tier'])
+        )
 
     def process_reward(self, reward_code):
         """[FIXED] 선택된 보상을 '실제' 파티 데이터(FighterData 객체)에 적용합니다."""
         vfx_manager = self.view.vfx_manager # [Fix] vfx_manager로 변경
         
         if reward_code == "REWARD_TICKET":
-            is_boss_floor = self.data_handler.stage_manager.get_stage_info(self.floor)['is_boss_floor']
+            is_boss_floor = self.run_plan.get_stage_info(self.floor)['is_boss_floor']
             ticket_amount = self.data_handler.grant_ticket_reward(is_boss_floor)
             vfx_manager.add_text(SCREEN_WIDTH/2 - 100, SCREEN_HEIGHT/2, f"뽑기 쿠폰 +{ticket_amount}!", GOLD)
             return
 
         # [Fix] self.party_data(dict) 대신 self.battle_system의 실제 FighterData 객체를 수정합니다.
         player_fighters = self.battle_system.get_player_fighters()
-
-        for fighter in player_fighters:
-            # 살아있는 캐릭터에게만 보상 적용
-            if not fighter.is_alive:
-                continue
-
+        for fighter, text, color in RewardSystem.apply_stat_reward(player_fighters, reward_code):
             fighter_view = self.view.get_fighter_view(fighter.inv_id)
-            
-            if reward_code == "REWARD_HEAL":
-                heal_amount = int(fighter.max_hp * 0.3)
-                # 최대 체력을 초과하지 않도록 실제 회복량 계산
-                healed_amount = min(heal_amount, fighter.max_hp - fighter.hp)
-                fighter.hp += healed_amount
-                if fighter_view and healed_amount > 0:
-                    vfx_manager.add_text(fighter_view.rect.centerx, fighter_view.rect.y, f"+{healed_amount}", GREEN)
-            
-            elif reward_code == "REWARD_HP_UP":
-                fighter.max_hp += 20
-                fighter.hp += 20 # 최대 체력이 늘어난만큼 현재 체력도 채워줌
-                if fighter_view:
-                    vfx_manager.add_text(fighter_view.rect.centerx, fighter_view.rect.y, "MAX HP +20", GOLD)
-            
-            elif reward_code == "REWARD_ATK_UP":
-                fighter.atk += 5
-                if fighter_view:
-                    vfx_manager.add_text(fighter_view.rect.centerx, fighter_view.rect.y, "ATK +5", GOLD)
+            if fighter_view:
+                vfx_manager.add_text(fighter_view.rect.centerx, fighter_view.rect.y, text, color)
 
     def save_run_state(self, floor_to_save):
         """[수정] `FighterData` 객체 리스트를 전달하여 `agi`를 포함한 모든 스탯을 DB에 저장합니다."""
@@ -4,14 +4,18 @@ from scenes.base_scene import BaseScene
 from ui.components import Button, InputBox
 from game_systems.coupon import CouponManager
 from ui.audio_manager import AudioManager
+from ui.text_cache import render_text
+from ui.dirty_rects import DirtyRects
 from config import *
 
 class CouponScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, screen, shared_data):
         super().__init__()
         self.screen = screen
         self.shared_data = shared_data
-        self.user_id = DEFAULT_USER_ID
+        self.user_id = shared_data.get('user_id', DEFAULT_USER_ID)
         self.coupon_manager = CouponManager()
 
         # --- Background and Styles ---
@@ -47,6 +51,10 @@ class CouponScene(BaseScene):
 
     def update(self):
         self.input_box.update()
+        # [수정] 호버 확인은 draw()가 아닌 여기서 합니다. (더티 렉트 모드)
+        mouse_pos = pygame.mouse.get_pos()
+        self.submit_button.check_hover(mouse_pos)
+        self.back_button.check_hover(mouse_pos)
 
     def draw(self, screen):
         # 1. 배경 그리기
@@ -55,22 +63,18 @@ class CouponScene(BaseScene):
         else:
             screen.fill(BLACK)
         
-        mouse_pos = pygame.mouse.get_pos()
-        
         # 2. UI 요소 그리기 (재배치 및 스타일 적용)
         # '밝은 종이' 스타일 구현
         pygame.draw.rect(screen, self.paper_color, self.input_box.rect, border_radius=5)
         self.input_box.draw(screen)
 
-        self.submit_button.check_hover(mouse_pos)
         self.submit_button.draw(screen)
-        self.back_button.check_hover(mouse_pos)
         self.back_button.draw(screen)
 
         # 3. 메시지 표시 (입력창 근처로 이동)
         if self.message:
             msg_font = self.shared_data['info_font']
-            msg_text = msg_font.render(self.message, True, self.message_color)
+            msg_text = render_text(msg_font, self.message, self.message_color)
             # TODO: 이미지에 맞춰 조정 필요
             screen.blit(msg_text, (self.input_box.rect.left, self.input_box.rect.bottom + 15))
 
@@ -79,6 +83,7 @@ class CouponScene(BaseScene):
         if not code:
             self.message = "코드를 입력해주세요."
             self.message_color = RED
+            DirtyRects().invalidate_all()
             return
 
         is_valid, message = self.coupon_manager.redeem_coupon(code, self.user_id)
@@ -90,6 +95,7 @@ class CouponScene(BaseScene):
         self.message = message
         
         self.input_box.text = ""
+        DirtyRects().invalidate_all() # 메시지와 입력창이 바뀜
 
     def start(self):
         """씬이 시작될 때 메시지와 입력창을 초기화합니다."""
@@ -1,23 +1,31 @@
 import pygame
-import sqlite3
+from database import ConnectionManager, STATEMENTS
+from game_systems.user_state import UserState
+from game_systems.db_writer import DBWriter
 from scenes.base_scene import BaseScene
 from config import *
 from ui.components import CharacterCard, Action
 from ui.audio_manager import AudioManager
 from ui.popup import CharacterDetailPopup
+from ui.text_cache import render_text
+from ui.dirty_rects import DirtyRects
 from game_systems.fighter_data import FighterData
 
 class DeckScene(BaseScene):
     """
     '내 덱 보기' 화면. CharacterCard와 Popup을 사용하여 UI를 구성한다.
     """
+    supports_dirty_rects = True
+
     def __init__(self, screen, shared_data):
         super().__init__()
         self.screen = screen
         self.shared_data = shared_data
+        self.user_id = shared_data.get('user_id', DEFAULT_USER_ID)
         self.character_cards = []
         self.scroll_offset = 0
         self.popup = None
+        self._popup_shown = False # [신규] 팝업이 열리거나 닫히면 화면 전체를 다시 그림 (더티 렉트 모드)
 
         # --- Background and Overlay ---
         self.background = self.shared_data['background_manager'].get_ui_background('deck')
@@ -42,27 +50,11 @@ class DeckScene(BaseScene):
 
     def load_character_cards(self):
         """[FIXED] DB에서 캐릭터의 '영구 성장 스탯'을 포함하여 불러오도록 수정합니다."""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        # [수정] c.hp, c.atk 대신 i.total_max_hp, i.total_atk 등을 가져오도록 쿼리 변경
-        cur.execute("""
-            SELECT 
-                i.id as inv_id, i.level, i.exp, i.is_selected,
-                c.id as char_id, c.name, c.grade, c.description, c.image as image_path,
-                c.mp, c.sp_max, c.skill_name, c.sfx_type, c.ult_name,
-                COALESCE(i.total_max_hp, c.hp) as final_hp,
-                COALESCE(i.total_atk, c.atk) as final_atk,
-                COALESCE(i.total_agi, c.agi) as final_agi
-            FROM inventory i JOIN characters c ON i.char_id = c.id 
-            WHERE i.user_id=?
-            ORDER BY CASE UPPER(c.grade)
-                WHEN 'MYTHIC' THEN 0 WHEN 'LEGEND' THEN 1 WHEN 'SPECIAL' THEN 2
-                WHEN 'RARE' THEN 3 WHEN 'COMMON' THEN 4
-                ELSE 5 END, c.id
-        """, (DEFAULT_USER_ID,))
+        DBWriter().flush() # 아직 커밋되지 않은 선택 변경을 반영한 뒤 읽음
+        cur = ConnectionManager().connection.cursor()
+        # [수정] c.hp, c.atk 대신 i.total_max_hp, i.total_atk 등을 가져오도록 쿼리 변경 (STATEMENTS["deck_cards"])
+        cur.execute(STATEMENTS["deck_cards"], (self.user_id,))
         db_characters = cur.fetchall()
-        conn.close()
 
         self.character_cards = []
         
@@ -113,12 +105,11 @@ class DeckScene(BaseScene):
                 return  # DB에 저장하지 않고 함수 종료
         
         # 선택 해제는 항상 허용되거나, 선택 시 2명 이하인 경우에만 아래 코드가 실행됩니다.
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
         new_status = 1 if card.select_button.is_on else 0
-        cur.execute("UPDATE inventory SET is_selected=? WHERE id=?", (new_status, card.fighter_data.inv_id))
-        conn.commit()
-        conn.close()
+        # [수정] DB 쓰기 스레드에 맡김 (같은 캐릭터를 연달아 토글하면 마지막 값만 기록)
+        inv_id = card.fighter_data.inv_id
+        DBWriter().execute("set_selected", (new_status, inv_id), key=("set_selected", inv_id))
+        UserState.get(self.user_id).apply(selected_count=sum(1 for c in self.character_cards if c.select_button.is_on))
 
     def handle_events(self, events, mouse_pos):
         if self.popup:
@@ -144,6 +135,7 @@ class DeckScene(BaseScene):
                                 return # Stop processing further events
                             elif action == Action.SELECT:
                                 self.toggle_selection(card)
+                                DirtyRects().invalidate(draw_rect)
                                 return
                 
                 elif event.button == 3: # Right-click to go back
@@ -155,10 +147,16 @@ class DeckScene(BaseScene):
                 num_rows = (len(self.character_cards) + 4) // 5 # 5 cards per row
                 content_height = num_rows * (CharacterCard.CARD_HEIGHT + 30) # card_margin_y = 30
                 max_scroll = max(0, content_height - self.overlay_rect.height)
+                previous_offset = self.scroll_offset
                 self.scroll_offset -= event.y * 30
                 self.scroll_offset = max(0, min(self.scroll_offset, max_scroll))
+                if self.scroll_offset != previous_offset:
+                    DirtyRects().invalidate_all() # 카드가 패널 밖으로도 그려지므로 전체를 다시 그림
 
     def update(self):
+        if bool(self.popup) != self._popup_shown:
+            self._popup_shown = bool(self.popup)
+            DirtyRects().invalidate_all()
         mouse_pos = pygame.mouse.get_pos()
         if self.popup:
             self.popup.update()
@@ -178,13 +176,9 @@ class DeckScene(BaseScene):
 
         # 2. Title
         title_font = self.shared_data['title_font']
-        screen.blit(title_font.render("캐릭터 선택 (최대 2명)", True, WHITE), (self.overlay_rect.left + 20, self.overlay_rect.top - 60))
+        screen.blit(render_text(title_font, "캐릭터 선택 (최대 2명)", WHITE), (self.overlay_rect.left + 20, self.overlay_rect.top - 60))
 
         # 3. Character Cards
-        # Create a temporary surface for clipping the cards within the overlay
-        card_area = self.overlay_surface.copy()
-        card_area.fill((0,0,0,0)) # Make it transparent
-
         for card in self.character_cards:
             draw_rect = card.rect.move(0, -self.scroll_offset)
             if draw_rect.colliderect(self.overlay_rect):
@@ -199,4 +193,4 @@ class DeckScene(BaseScene):
             
         # 6. Footer hint
         info_font = self.shared_data['info_font']
-        screen.blit(info_font.render("우클릭/버튼: 나가기 | 카드 클릭: 상세정보/선택 | 휠: 스크롤", True, GRAY), (50, SCREEN_HEIGHT - 50))
\ No newline at end of file
+        screen.blit(render_text(info_font, "우클릭/버튼: 나가기 | 카드 클릭: 상세정보/선택 | 휠: 스크롤", GRAY), (50, SCREEN_HEIGHT - 50))
\ No newline at end of file
@@ -3,8 +3,11 @@ import os
 from scenes.base_scene import BaseScene
 from ui.components import Button, Action
 from ui.audio_manager import AudioManager
+from ui.text_cache import render_text
+from ui.sprite_cache import SpriteCache
+from ui.dirty_rects import DirtyRects
 from config import *
-from database import add_tickets, get_tickets
+from game_systems.user_state import UserState
 
 class GachaScene(BaseScene):
     def __init__(self, screen, shared_data, gacha_manager):
@@ -12,6 +15,7 @@ class GachaScene(BaseScene):
         self.screen = screen
         self.shared_data = shared_data
         self.gacha_manager = gacha_manager
+        self.user_id = shared_data.get('user_id', DEFAULT_USER_ID)
         self.mode = "SELECT"
         self.results = []
         self.character_images = {}
@@ -35,6 +39,11 @@ class GachaScene(BaseScene):
         self.ticket_panel_surface = pygame.Surface(self.ticket_panel_rect.size, pygame.SRCALPHA)
         self.ticket_panel_surface.fill((0, 0, 0, 150))
 
+    @property
+    def supports_dirty_rects(self):
+        """[신규] 상점(SELECT) 화면만 더티 렉트로 그립니다. (결과 화면은 매 프레임 전체를 그림)"""
+        return self.mode == "SELECT"
+
     def enter(self):
         """씬에 진입할 때 로비 BGM을 재생합니다."""
         super().enter()
@@ -46,18 +55,19 @@ class GachaScene(BaseScene):
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     self.mode = "SELECT"
                     self.results = []
+                    DirtyRects().invalidate_all() # 결과 화면을 지우고 선택 화면 전체를 다시 그림
                     return
             elif self.mode == "SELECT":
                 for btn in self.buttons:
                     action = btn.handle_event(event)
                     if action and action != Action.NO_ACTION:
-                        if action == "GACHA_1" and get_tickets() >= 1:
-                            self.results = self.gacha_manager.draw_1()
+                        if action == "GACHA_1" and UserState.get(self.user_id).tickets >= 1:
+                            self.results = self.gacha_manager.draw_1(self.user_id)
                             AudioManager().play_sfx('sfx_open_gacha_1.wav')
                             self.mode = "RESULT"
                             self.preload_character_images()
-                        elif action == "GACHA_10" and get_tickets() >= 10:
-                            self.results = self.gacha_manager.draw_10()
+                        elif action == "GACHA_10" and UserState.get(self.user_id).tickets >= 10:
+                            self.results = self.gacha_manager.draw_10(self.user_id)
                             AudioManager().play_sfx('sfx_open_gacha_10.wav')
                             self.mode = "RESULT"
                             self.preload_character_images()
@@ -69,29 +79,24 @@ class GachaScene(BaseScene):
                         break
 
     def preload_character_images(self):
+        """[수정] 결과 캐릭터 이미지를 SpriteCache로 미리 불러옵니다. (다시 뽑아도 디스크에서 다시 읽지 않음)"""
         self.character_images.clear()
         for result_info in self.results:
             char = result_info['char']
-            if 'image' in char and char['image']:
-                image_path = os.path.join(ASSETS_DIR, 'images', char['image'])
-                try:
-                    if os.path.exists(image_path):
-                        self.character_images[char['id']] = pygame.image.load(image_path).convert_alpha()
-                    else: self.character_images[char['id']] = None
-                except pygame.error as e:
-                    print(f"이미지 로드 오류 '{image_path}': {e}")
-                    self.character_images[char['id']] = None
+            self.character_images[char['id']] = SpriteCache().get(char.get('image'), None)
 
     def update(self):
-        pass
+        # [수정] 호버 확인은 draw()가 아닌 여기서 합니다. (더티 렉트 모드)
+        if self.mode == "SELECT":
+            mouse_pos = pygame.mouse.get_pos()
+            for btn in self.buttons:
+                btn.check_hover(mouse_pos)
 
     def _draw_character_on_altar(self, screen, font, result_info, position, scale=1.0):
         character = result_info['char']
-        char_img = self.character_images.get(character['id'])
-        if char_img:
-            original_size = char_img.get_size()
-            scaled_size = (int(original_size[0] * scale), int(original_size[1] * scale))
-            scaled_img = pygame.transform.scale(char_img, scaled_size)
+        if self.character_images.get(character['id']):
+            # [수정] 배율별 스케일 결과는 SpriteCache가 한 번만 만들어 둠 (매 프레임 transform.scale 없음)
+            scaled_img = SpriteCache().get_scaled(character['image'], scale)
             img_rect = scaled_img.get_rect(centerx=position[0], bottom=position[1])
             screen.blit(scaled_img, img_rect)
         else:
@@ -100,29 +105,29 @@ class GachaScene(BaseScene):
             placeholder_rect.centerx = position[0]
             placeholder_rect.bottom = position[1]
             pygame.draw.rect(screen, GRAY, placeholder_rect)
-            name_surf = font.render(character['name'], True, WHITE)
+            name_surf = render_text(font, character['name'], WHITE)
             name_rect = name_surf.get_rect(center=placeholder_rect.center)
             screen.blit(name_surf, name_rect)
         
         y_offset = position[1] + 5
         grade_color = GRADE_COLORS.get(character['grade'].upper(), WHITE)
-        grade_surf = font.render(f"[{character['grade']}]", True, grade_color)
+        grade_surf = render_text(font, f"[{character['grade']}]", grade_color)
         grade_rect = grade_surf.get_rect(centerx=position[0], y=y_offset)
         screen.blit(grade_surf, grade_rect)
         y_offset += 20
 
-        name_surf = font.render(character['name'], True, WHITE)
+        name_surf = render_text(font, character['name'], WHITE)
         name_rect = name_surf.get_rect(centerx=position[0], y=y_offset)
         screen.blit(name_surf, name_rect)
         y_offset += 20
         
         if result_info['is_duplicate']:
             exp_text = f"+{result_info['exp_gain']} EXP"
-            exp_surf = font.render(exp_text, True, GOLD)
+            exp_surf = render_text(font, exp_text, GOLD)
             exp_rect = exp_surf.get_rect(centerx=position[0], y=y_offset)
             screen.blit(exp_surf, exp_rect)
         else: # 신규 획득
-            new_surf = font.render("NEW!", True, (100, 255, 100))
+            new_surf = render_text(font, "NEW!", (100, 255, 100))
             new_rect = new_surf.get_rect(centerx=position[0], y=y_offset)
             screen.blit(new_surf, new_rect)
 
@@ -146,7 +151,7 @@ class GachaScene(BaseScene):
                     if i + 5 < len(self.results):
                         self._draw_character_on_altar(screen, info_font, self.results[i + 5], (front_row_x[i], front_row_y), scale=1.0)
             
-            msg_surf = info_font.render("화면을 클릭하면 상점으로 돌아갑니다", True, WHITE)
+            msg_surf = render_text(info_font, "화면을 클릭하면 상점으로 돌아갑니다", WHITE)
             msg_rect = msg_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT - 30))
             pygame.draw.rect(screen, (0,0,0,150), msg_rect.inflate(20,10))
             screen.blit(msg_surf, msg_rect)
@@ -154,20 +159,18 @@ class GachaScene(BaseScene):
         elif self.mode == "SELECT":
             screen.blit(self.bg_shop, (0, 0)) if self.bg_shop else screen.fill(BLACK)
 
-            tickets = get_tickets()
+            tickets = UserState.get(self.user_id).tickets
             screen.blit(self.ticket_panel_surface, self.ticket_panel_rect.topleft)
-            ticket_text = info_font.render(f"보유 티켓: {tickets}", True, (255, 255, 0))
+            ticket_text = render_text(info_font, f"보유 티켓: {tickets}", (255, 255, 0))
             text_rect = ticket_text.get_rect(center=self.ticket_panel_rect.center)
             screen.blit(ticket_text, text_rect)
             
-            mouse_pos = pygame.mouse.get_pos()
             for btn in self.buttons:
-                btn.check_hover(mouse_pos)
                 btn.draw(screen)
 
             system_message = self.shared_data.get('system_message')
             if system_message:
-                 msg_surf = info_font.render(system_message, True, RED)
+                 msg_surf = render_text(info_font, system_message, RED)
                  msg_rect = msg_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT - 30))
                  screen.blit(msg_surf, msg_rect)
                  self.shared_data['system_message'] = None
\ No newline at end of file
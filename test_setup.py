@@ -1,20 +1,19 @@
 import sqlite3
-from config import DB_PATH, DEFAULT_USER_ID
-from database import init_db # DB 초기화 함수 임포트
+from config import DEFAULT_USER_ID
+from database import init_db, update_master_data_from_csv, ConnectionManager # DB 초기화 함수 임포트
 
 def run_test_setup():
     """테스트를 위한 DB 상태를 조작하고, 필요한 경우 DB를 초기화합니다."""
     # 1. DB 초기화 (테이블이 없으면 생성)
     print("--- DB 초기화 확인 ---")
-    if init_db():
+    if init_db() and update_master_data_from_csv(): # 캐릭터 기본 스탯은 master.db에서 읽음
         print("[OK] DB 초기화 성공 또는 이미 존재함.")
     else:
         print("[FATAL] DB 초기화 실패. 스크립트를 중단합니다.")
         return
         
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
+        with ConnectionManager().transaction() as cursor:
             print("\n--- 테스트 설정 시작 ---")
             
             # 2. 티켓 999개 지급
@@ -45,7 +44,6 @@ def run_test_setup():
             cursor.execute("UPDATE inventory SET exp = 90 WHERE user_id = ? AND char_id = ?", (DEFAULT_USER_ID, mythic_char_id))
             print(f"[OK] MYTHIC(ID:{mythic_char_id}) 캐릭터 경험치 90으로 설정 (레벨업 직전).")
             
-            conn.commit()
             print("\n--- 테스트 설정 완료 ---")
 
     except sqlite3.Error as e:
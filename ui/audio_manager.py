@@ -1,3 +1,4 @@
+import io
 import pygame
 import os
 from config import BGM_PATH, SFX_PATH, SOUND_ON
@@ -22,6 +23,8 @@ class AudioManager:
                 print(f"[ERROR] Failed to initialize pygame.mixer: {e}")
 
         self.current_bgm = None
+        self._staged_bgm = None # [신규] (파일명, 파일 내용) - 작업 스레드가 미리 읽어 둔 다음 BGM
+        self._bgm_buffer = None # 재생 중인 BGM 스트림 (mixer가 읽는 동안 유지)
         self.sfx_cache = {} # SFX 사운드 객체를 캐싱하여 재사용
         self.bgm_muted = False
         self.sfx_muted = False
@@ -41,17 +44,27 @@ class AudioManager:
         if self.current_bgm == filename:
             return
 
-        path = os.path.join(BGM_PATH, filename)
-        if not os.path.exists(path):
-            print(f"[Audio Error] BGM file not found: {path}. Skipping.")
-            return
+        # [신규] stage_bgm()으로 미리 읽어 둔 곡이면 메모리에서 재생 (디스크 I/O 없음)
+        staged, self._staged_bgm = self._staged_bgm, None
+        source = None
+        if staged and staged[0] == filename:
+            source = io.BytesIO(staged[1])
+        else:
+            path = os.path.join(BGM_PATH, filename)
+            if not os.path.exists(path):
+                print(f"[Audio Error] BGM file not found: {path}. Skipping.")
+                return
 
         try:
             # 다른 음악이 재생 중일 경우 크로스페이드
             if pygame.mixer.music.get_busy():
                 pygame.mixer.music.fadeout(fade_ms)
 
-            pygame.mixer.music.load(path)
+            if source is not None:
+                pygame.mixer.music.load(source, filename)
+            else:
+                pygame.mixer.music.load(path)
+            self._bgm_buffer = source
             pygame.mixer.music.set_volume(volume)
             pygame.mixer.music.play(loops=-1, fade_ms=fade_ms)
             self.current_bgm = filename
@@ -59,6 +72,20 @@ class AudioManager:
             print(f"[ERROR] Could not play BGM '{filename}': {e}")
             self.current_bgm = None
 
+    def stage_bgm(self, filename):
+        """
+        [신규] 다음에 재생할 BGM 파일을 미리 메모리로 읽어 둡니다. (작업 스레드에서 호출 가능)
+        이미 재생 중인 곡이거나 파일이 없으면 아무것도 하지 않습니다.
+        """
+        if not SOUND_ON or self.current_bgm == filename:
+            return
+        path = os.path.join(BGM_PATH, filename)
+        try:
+            with open(path, "rb") as f:
+                self._staged_bgm = (filename, f.read())
+        except OSError:
+            pass # 재생 시점에 play_bgm이 경고를 출력
+
     def stop_bgm(self):
         if not SOUND_ON or not pygame.mixer.get_init():
             return
@@ -1,18 +1,10 @@
 import pygame
-import os
-from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, GRAY, GOLD, RED, BLUE, GREEN, ASSETS_DIR)
+from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, GRAY, GOLD, RED, BLUE, GREEN)
 from ui.components import Button
+from ui.text_cache import create_font, render_text # [수정] 중복 폰트 헬퍼 대신 공유 레지스트리 사용
+from ui.glyph_atlas import GlyphAtlas
+from ui.layer_cache import StaticLayer
 
-# --- Font Helper (Copied from components.py for standalone use) ---
-def create_font(size, is_bold=False):
-    """지정된 크기와 굵기로 폰트 객체를 생성합니다."""
-    font_name = "Maplestory Bold.ttf" if is_bold else "Maplestory Light.ttf"
-    font_path = os.path.join(ASSETS_DIR, "fonts", font_name)
-    try:
-        return pygame.font.Font(font_path, size)
-    except pygame.error:
-        print(f"Warning: Font '{font_name}' not found. Falling back to default font.")
-        return pygame.font.SysFont("malgungothic", size, bold=is_bold)
 
 class BattlePanel:
     """전투 화면 하단의 UI 패널. 3단 구조로 아군, 커맨드, 적군 정보를 표시한다."""
@@ -31,6 +23,9 @@ class BattlePanel:
         self.center_panel_width = SCREEN_WIDTH * 0.3
         self.right_panel_width = SCREEN_WIDTH * 0.35
 
+        # [신규] 패널 배경, 구분선, 'COMMAND' 제목은 바뀌지 않으므로 한 번만 그려 둠
+        self.chrome_layer = StaticLayer(self.rect.size, self._compose_chrome)
+
         # 데이터
         self.player_fighters = []
         self.enemy_fighters = []
@@ -65,19 +60,28 @@ class BattlePanel:
         self.target_fighter = target_fighter
 
     def draw(self, screen):
-        pygame.draw.rect(screen, (20, 20, 20), self.rect)
-        pygame.draw.line(screen, WHITE, (self.rect.left, self.rect.top), (self.rect.right, self.rect.top), 2)
-
-        line_y_end = self.rect.bottom
-        line1_x = self.left_panel_width
-        line2_x = self.left_panel_width + self.center_panel_width
-        pygame.draw.line(screen, (80, 80, 80), (line1_x, self.rect.top), (line1_x, line_y_end), 2)
-        pygame.draw.line(screen, (80, 80, 80), (line2_x, self.rect.top), (line2_x, line_y_end), 2)
+        # [수정] 정적인 부분은 캐시된 레이어 한 장으로 그리고, 수치/버튼만 매 프레임 그림
+        screen.blit(self.chrome_layer.get(), self.rect.topleft)
 
         self._draw_ally_panel(screen)
         self._draw_center_panel(screen)
         self._draw_right_panel(screen)
 
+    def _compose_chrome(self, surface, key):
+        """[신규] 패널의 정적인 부분을 패널 좌표계로 그립니다. (chrome_layer)"""
+        top, bottom = 0, self.rect.height
+        surface.fill((20, 20, 20))
+        pygame.draw.line(surface, WHITE, (0, top), (self.rect.width, top), 2)
+
+        line1_x = self.left_panel_width - self.rect.left
+        line2_x = self.left_panel_width + self.center_panel_width - self.rect.left
+        pygame.draw.line(surface, (80, 80, 80), (line1_x, top), (line1_x, bottom), 2)
+        pygame.draw.line(surface, (80, 80, 80), (line2_x, top), (line2_x, bottom), 2)
+
+        title_surf = render_text(self.font_command_title, "COMMAND", (150, 150, 150))
+        title_pos = title_surf.get_rect(centerx=self.left_panel_width + self.center_panel_width/2 - self.rect.left, y=10)
+        surface.blit(title_surf, title_pos)
+
 
 
     def _draw_gauge_bar(self, screen, x, y, width, height, current_val, max_val, color, text=""):
@@ -89,10 +93,13 @@ class BattlePanel:
         pygame.draw.rect(screen, color, (x, y, fill_width, height), border_radius=3)
         pygame.draw.rect(screen, WHITE, (x, y, width, height), 1, border_radius=3)
         
-        display_text = text if text else f"{int(current_val)}/{int(max_val)}"
-        text_surf = self.font_gauge.render(display_text, True, WHITE)
-        text_rect = text_surf.get_rect(center=(x + width / 2, y + height / 2))
-        screen.blit(text_surf, text_rect)
+        if text:
+            text_surf = render_text(self.font_gauge, text, WHITE)
+            screen.blit(text_surf, text_surf.get_rect(center=(x + width / 2, y + height / 2)))
+        else: # [수정] 'cur/max' 수치는 글리프 아틀라스로 그림 (값이 바뀌어도 래스터화 없음)
+            display_text = f"{int(current_val)}/{int(max_val)}"
+            atlas = GlyphAtlas.get(self.font_gauge, WHITE)
+            atlas.draw(screen, display_text, atlas.get_rect(display_text, center=(x + width / 2, y + height / 2)).topleft)
 
     def _draw_single_ally_info(self, screen, fighter, x, y, slot_width):
         """[재작성] 아군 한 명의 정보를 좌/우 분할된 슬롯 안에 세로로 나열합니다."""
@@ -101,7 +108,7 @@ class BattlePanel:
 
         # 1. 이름/레벨
         name_color = GOLD if is_active else WHITE
-        name_surf = self.font_name.render(f"[Lv.{fighter.level}] {fighter.name}", True, name_color)
+        name_surf = render_text(self.font_name, f"[Lv.{fighter.level}] {fighter.name}", name_color)
         name_rect = name_surf.get_rect(left=x + padding, top=y)
         screen.blit(name_surf, name_rect)
 
@@ -119,8 +126,8 @@ class BattlePanel:
 
         # 3. 스탯 텍스트
         stats_y = gauge_y + gauge_height + padding
-        atk_surf = self.font_stats.render(f"ATK: {fighter.atk}", True, WHITE)
-        agi_surf = self.font_stats.render(f"AGI: {fighter.agi}", True, WHITE)
+        atk_surf = render_text(self.font_stats, f"ATK: {fighter.atk}", WHITE)
+        agi_surf = render_text(self.font_stats, f"AGI: {fighter.agi}", WHITE)
         atk_rect = atk_surf.get_rect(left=gauge_x, top=stats_y)
         agi_rect = agi_surf.get_rect(left=atk_rect.right + 15, top=stats_y)
         screen.blit(atk_surf, atk_rect)
@@ -143,9 +150,6 @@ class BattlePanel:
             self._draw_single_ally_info(screen, fighter, x_start, y_start, slot_width)
 
     def _draw_center_panel(self, screen):
-        title_surf = self.font_command_title.render("COMMAND", True, (150, 150, 150))
-        title_pos = title_surf.get_rect(centerx=self.left_panel_width + self.center_panel_width/2, y=self.rect.top + 10)
-        screen.blit(title_surf, title_pos)
         for button in self.buttons:
             button.draw(screen)
 
@@ -156,12 +160,12 @@ class BattlePanel:
             x_start = self.left_panel_width + self.center_panel_width + 20 + (i * char_panel_width)
             is_target = self.target_fighter and self.target_fighter == fighter
             name_color = GOLD if is_target else WHITE
-            name_surf = self.font_name.render(fighter.name, True, name_color)
+            name_surf = render_text(self.font_name, fighter.name, name_color)
             screen.blit(name_surf, (x_start, y_start))
             hp_val = fighter.hp if fighter.is_alive else 0
             hp_text = f"HP: {int(hp_val)}/{int(fighter.max_hp)}"
             hp_color = RED if hp_val > 0 and hp_val / fighter.max_hp < 0.3 else WHITE
-            hp_surf = self.font_stats.render(hp_text, True, hp_color)
+            hp_surf = render_text(self.font_stats, hp_text, hp_color)
             screen.blit(hp_surf, (x_start, y_start + 30))
 
     def handle_event(self, event):
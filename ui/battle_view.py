@@ -6,13 +6,18 @@ from ui.vfx import VFXManager
 from ui.battle_panel import BattlePanel
 from ui.background_manager import BackgroundManager
 from ui.fighter_view import FighterView
-import random # For RewardPopup
+from ui.text_cache import get_sys_font, render_text
+from ui.glyph_atlas import GlyphAtlas
+from ui.layer_cache import StaticLayer, get_overlay
+from game_systems.reward_system import RewardSystem
 
 # battle_scene.py 에서 View 역할을 하는 RewardPopup 클래스를 이전
 class RewardPopup:
     def __init__(self, shared_data):
-        self.font = pygame.font.SysFont("malgungothic", 30, bold=True)
+        self.font = get_sys_font(30, is_bold=True)
         self.bg_rect = pygame.Rect(SCREEN_WIDTH//2 - 250, 200, 500, 400)
+        # [신규] 팝업 창과 제목은 보상 선택 여부가 바뀔 때만 다시 그림
+        self.frame_layer = StaticLayer(self.bg_rect.size, self._compose_frame, alpha=True)
         self.reward_buttons = []
         self.action_buttons = []
         self.reward_selected = False
@@ -23,15 +28,8 @@ class RewardPopup:
         self.action_buttons.clear()
         self.reward_selected = False
         self.selected_reward_code = None
-        all_rewards = {
-            "REWARD_HEAL": "[회복] 체력 30% 회복",
-            "REWARD_HP_UP": "[성장] 최대 체력 +20",
-            "REWARD_ATK_UP": "[강화] 공격력 +5",
-            "REWARD_TICKET": "[행운] 뽑기 쿠폰 1개"
-        }
-        if is_boss_floor:
-            all_rewards["REWARD_TICKET"] = "[대박] 뽑기 쿠폰 5개"
-        selected_codes = random.sample(list(all_rewards.keys()), 3)
+        all_rewards = RewardSystem.get_reward_labels(is_boss_floor)
+        selected_codes = RewardSystem.roll_rewards(is_boss_floor)
         for i, code in enumerate(selected_codes):
             self.reward_buttons.append(Button(SCREEN_WIDTH//2 - 200, 280 + i * 70, 400, 50, all_rewards[code], code))
         self.action_buttons.append(Button(SCREEN_WIDTH//2 - 200, 480, 190, 60, "다음 층으로 가기", "NEXT_FLOOR", color=GRAY))
@@ -46,17 +44,22 @@ class RewardPopup:
         self.action_buttons[1].color = (80, 80, 80)
 
     def draw(self, screen):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180); overlay.fill(BLACK); screen.blit(overlay, (0,0))
-        pygame.draw.rect(screen, (50, 50, 50), self.bg_rect, border_radius=15)
-        pygame.draw.rect(screen, WHITE, self.bg_rect, 2, border_radius=15)
-        title_text = "보상 획득! 다음은?" if self.reward_selected else "전투 승리! 보상을 선택하세요"
-        title = self.font.render(title_text, True, (255, 215, 0))
-        screen.blit(title, title.get_rect(center=(SCREEN_WIDTH//2, 240)))
+        # [수정] 매 프레임 전체 화면 오버레이를 새로 만들지 않고 캐시된 레이어를 사용
+        screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), 180), (0,0))
+        screen.blit(self.frame_layer.get(self.reward_selected), self.bg_rect.topleft)
         mouse_pos = pygame.mouse.get_pos()
         for btn in self.reward_buttons: btn.check_hover(mouse_pos); btn.draw(screen)
         for btn in self.action_buttons: btn.check_hover(mouse_pos); btn.draw(screen)
 
+    def _compose_frame(self, surface, reward_selected):
+        """[신규] 팝업 창 배경, 테두리, 제목을 팝업 좌표계로 그립니다. (frame_layer)"""
+        frame_rect = surface.get_rect()
+        pygame.draw.rect(surface, (50, 50, 50), frame_rect, border_radius=15)
+        pygame.draw.rect(surface, WHITE, frame_rect, 2, border_radius=15)
+        title_text = "보상 획득! 다음은?" if reward_selected else "전투 승리! 보상을 선택하세요"
+        title = render_text(self.font, title_text, (255, 215, 0))
+        surface.blit(title, title.get_rect(center=(SCREEN_WIDTH//2 - self.bg_rect.left, 240 - self.bg_rect.top)))
+
     def handle_click(self, mouse_pos):
         for btn in self.reward_buttons:
             if btn.is_clicked(mouse_pos):
@@ -81,6 +84,8 @@ class BattleView:
     def __init__(self, screen, shared_data):
         self.screen = screen
         self.font = shared_data['info_font']
+        self.floor_font = get_sys_font(24, is_bold=True) # [수정] 매 프레임 SysFont 생성 대신 공유 폰트 사용
+        self.level_atlas = GlyphAtlas.get(get_sys_font(18, is_bold=True), WHITE) # [수정] '[Lv.N]' HUD는 글리프 아틀라스로 그림
         
         # --- UI Components (owned by View) ---
         self.background_manager = BackgroundManager()
@@ -163,10 +168,10 @@ class BattleView:
                 return False # 아직 애니메이션이 끝나지 않음
         return True # 모든 사망 애니메이션이 끝남
 
-    def update_background(self, floor, stage_manager):
-        """현재 층 정보에 따라 배경을 업데이트합니다."""
-        stage_info = stage_manager.get_stage_info(floor)
-        self.background_manager.update_background(floor, stage_info['biome'])
+    def update_background(self, floor, run_plan):
+        """현재 층 정보에 따라 배경을 업데이트합니다. [수정] 등반 계획에 미리 정해진 배경 키 사용"""
+        stage_info = run_plan.get_stage_info(floor)
+        self.background_manager.update_background(floor, stage_info['background'])
 
 
     def process_event(self, event, battle_state, battle_system):
@@ -267,8 +272,7 @@ class BattleView:
         self.background_manager.draw(self.screen)
         
         # 기본 정보 (층, 로그 메시지)
-        floor_font = pygame.font.SysFont("malgungothic", 24, bold=True)
-        self.screen.blit(floor_font.render(f"Floor: {floor}F", True, GOLD), (20, 20))
+        self.screen.blit(render_text(self.floor_font, f"Floor: {floor}F", GOLD), (20, 20))
 
         # --- [New] 사운드 버튼 그리기 ---
         mouse_pos = pygame.mouse.get_pos()
@@ -279,7 +283,7 @@ class BattleView:
         # ---
         
         log_msg_text = battle_system.log_message if battle_system else "Loading..."
-        msg = self.font.render(log_msg_text, True, WHITE)
+        msg = render_text(self.font, log_msg_text, WHITE)
         msg_rect = msg.get_rect(center=(SCREEN_WIDTH//2, 40))
         pygame.draw.rect(self.screen, (0,0,0,150), (msg_rect.x-10, msg_rect.y-5, msg_rect.width+20, msg_rect.height+10), border_radius=5)
         self.screen.blit(msg, msg_rect)
@@ -290,14 +294,12 @@ class BattleView:
             # Draw level HUD
             if f_view.data.is_alive:
                 level_text = f"[Lv.{f_view.data.level}]"
-                level_font = pygame.font.SysFont("malgungothic", 18, bold=True)
-                level_surf = level_font.render(level_text, True, WHITE)
-                level_rect = level_surf.get_rect(center=(f_view.rect.centerx, f_view.rect.top - 20))
+                level_rect = self.level_atlas.get_rect(level_text, center=(f_view.rect.centerx, f_view.rect.top - 20))
                 
                 bg_rect = level_rect.inflate(8, 4)
                 pygame.draw.rect(self.screen, (0,0,0,180), bg_rect, border_radius=5)
 
-                self.screen.blit(level_surf, level_rect)
+                self.level_atlas.draw(self.screen, level_text, level_rect.topleft)
 
         # 타겟팅 커서 그리기
         self._draw_target_cursor(battle_system)
@@ -329,7 +331,6 @@ class BattleView:
 
     def _draw_end_screen(self, text, color):
         """게임 종료(패배, 에러) 화면을 그립니다."""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); overlay.set_alpha(200); overlay.fill(BLACK)
-        self.screen.blit(overlay, (0,0))
-        msg = self.font.render(text, True, color)
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), 200), (0,0))
+        msg = render_text(self.font, text, color)
         self.screen.blit(msg, msg.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
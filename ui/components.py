@@ -1,24 +1,14 @@
 import pygame
-import os
 from enum import Enum, auto
 
 from config import (WHITE, BLACK, GRAY, GREEN, GOLD, COLOR_BUTTON_NORMAL, COLOR_BUTTON_HOVER, 
                     COLOR_INPUT_INACTIVE, COLOR_INPUT_ACTIVE, FONT_SIZE_BUTTON, 
                     FONT_SIZE_INPUT, BUTTON_BORDER_RADIUS, BUTTON_BORDER_THICKNESS,
-                    INPUT_MAX_LENGTH, INPUT_TEXT_PADDING, GRADE_COLORS, ASSETS_DIR)
+                    INPUT_MAX_LENGTH, INPUT_TEXT_PADDING, GRADE_COLORS)
 from ui.audio_manager import AudioManager
-
-# --- Font Helper ---
-def create_font(size, is_bold=False):
-    """지정된 크기와 굵기로 폰트 객체를 생성합니다."""
-    font_name = "Maplestory Bold.ttf" if is_bold else "Maplestory Light.ttf"
-    font_path = os.path.join(ASSETS_DIR, "fonts", font_name)
-    try:
-        return pygame.font.Font(font_path, size)
-    except pygame.error:
-        print(f"Warning: Font '{font_name}' not found at '{font_path}'. Falling back to default font.")
-        # In case of error, use a default system font
-        return pygame.font.SysFont("malgungothic", size, bold=is_bold)
+from ui.text_cache import create_font, render_text # [수정] 폰트/텍스트 Surface 공유
+from ui.sprite_cache import SpriteCache
+from ui.dirty_rects import DirtyRects
 
 
 # --- [New] Action Enum for UI interactions ---
@@ -61,13 +51,16 @@ class Button:
             pygame.draw.rect(screen, border_color, self.rect, BUTTON_BORDER_THICKNESS, border_radius=BUTTON_BORDER_RADIUS)
 
             if self.text:
-                text_surf = self.font.render(self.text, True, WHITE)
+                text_surf = render_text(self.font, self.text, WHITE)
                 text_rect = text_surf.get_rect(center=self.rect.center)
                 screen.blit(text_surf, text_rect)
         # ---
 
     def check_hover(self, mouse_pos):
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
+        is_hovered = self.rect.collidepoint(mouse_pos)
+        if is_hovered != self.is_hovered:
+            self.is_hovered = is_hovered
+            DirtyRects().invalidate(self.rect) # [신규] 더티 렉트 렌더링: 호버가 바뀐 버튼만 다시 그림
 
     def is_clicked(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)
@@ -100,12 +93,13 @@ class ToggleButton(Button):
         pygame.draw.rect(screen, color, self.rect, border_radius=BUTTON_BORDER_RADIUS)
         pygame.draw.rect(screen, WHITE, self.rect, BUTTON_BORDER_THICKNESS, border_radius=BUTTON_BORDER_RADIUS)
         
-        text_surf = self.font.render(text, True, WHITE)
+        text_surf = render_text(self.font, text, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
     def toggle(self):
         self.is_on = not self.is_on
+        DirtyRects().invalidate(self.rect)
 
 # --- [New] CharacterCard Class ---
 class CharacterCard:
@@ -142,23 +136,22 @@ class CharacterCard:
     def _load_image(self):
         """Load character image or create a placeholder."""
         img_w, img_h = self.CARD_WIDTH - 10, self.IMG_HEIGHT - 10
-        try:
-            # Assuming ASSETS_DIR is configured to be the absolute path to the assets folder
-            image_path = os.path.join(ASSETS_DIR, 'images', self.fighter_data.image_path)
-            img = pygame.image.load(image_path).convert_alpha()
-            return pygame.transform.scale(img, (img_w, img_h))
-        except (pygame.error, FileNotFoundError, TypeError):
-            # [수정] 이미지가 없을 때 회색 배경과 캐릭터 이름을 포함하는 Placeholder 생성
-            placeholder = pygame.Surface((img_w, img_h))
-            placeholder.fill(GRAY)
-            
-            # Placeholder 위에 캐릭터 이름 텍스트 렌더링
-            name_font = create_font(18, is_bold=True)
-            name_surf = name_font.render(self.fighter_data.name, True, WHITE)
-            name_rect = name_surf.get_rect(center=(img_w / 2, img_h / 2))
-            placeholder.blit(name_surf, name_rect)
-            
-            return placeholder
+        # [수정] SpriteCache에서 공유 (덱 화면을 다시 열어도 디스크에서 다시 읽거나 스케일하지 않음)
+        image = SpriteCache().get(self.fighter_data.image_path, (img_w, img_h))
+        if image is not None:
+            return image
+
+        # [수정] 이미지가 없을 때 회색 배경과 캐릭터 이름을 포함하는 Placeholder 생성
+        placeholder = pygame.Surface((img_w, img_h))
+        placeholder.fill(GRAY)
+        
+        # Placeholder 위에 캐릭터 이름 텍스트 렌더링
+        name_font = create_font(18, is_bold=True)
+        name_surf = render_text(name_font, self.fighter_data.name, WHITE)
+        name_rect = name_surf.get_rect(center=(img_w / 2, img_h / 2))
+        placeholder.blit(name_surf, name_rect)
+        
+        return placeholder
 
     def handle_event(self, event, draw_rect=None):
         """Handles user input and returns an Action."""
@@ -189,7 +182,10 @@ class CharacterCard:
             offset_x = target_rect.left - self.rect.left
             offset_y = target_rect.top - self.rect.top
             component_rect = component.rect.move(offset_x, offset_y)
-            component.is_hovered = component_rect.collidepoint(mouse_pos)
+            is_hovered = component_rect.collidepoint(mouse_pos)
+            if is_hovered != component.is_hovered:
+                component.is_hovered = is_hovered
+                DirtyRects().invalidate(component_rect)
 
     def draw(self, screen, draw_rect=None):
         """Draw the entire card at a given position."""
@@ -210,17 +206,17 @@ class CharacterCard:
 
         # --- Draw Name, Grade, and Level ---
         # 1. Name
-        name_surf = self.font_name.render(self.fighter_data.name, True, grade_color)
+        name_surf = render_text(self.font_name, self.fighter_data.name, grade_color)
         name_rect = name_surf.get_rect(center=(target_rect.centerx, image_box_rect.bottom + 25))
         screen.blit(name_surf, name_rect)
         
         # 2. Grade
-        grade_text_surf = self.font_grade.render(self.fighter_data.grade, True, grade_color)
+        grade_text_surf = render_text(self.font_grade, self.fighter_data.grade, grade_color)
         grade_text_rect = grade_text_surf.get_rect(center=(target_rect.centerx, name_rect.bottom + 15))
         screen.blit(grade_text_surf, grade_text_rect)
 
         # 3. Level
-        level_text_surf = self.font_level.render(f"Lv. {self.fighter_data.level}", True, BLACK)
+        level_text_surf = render_text(self.font_level, f"Lv. {self.fighter_data.level}", BLACK)
         level_text_rect = level_text_surf.get_rect(center=(target_rect.centerx, grade_text_rect.bottom + 15))
         screen.blit(level_text_surf, level_text_rect)
         # ---
@@ -271,17 +267,25 @@ class InputBox:
 
     def handle_event(self, event):
         """[리팩토링] 이벤트를 받아 내부 메서드로 분기"""
+        before = (self.text, self.active)
+        result = None
         if event.type == pygame.MOUSEBUTTONDOWN:
             self._handle_mouse_event(event)
         elif event.type == pygame.KEYDOWN:
-            return self._handle_key_event(event)
-        return None
+            result = self._handle_key_event(event)
+        if (self.text, self.active) != before:
+            # [신규] 더티 렉트 렌더링: 상자와 이전/현재 텍스트 영역을 다시 그림 (텍스트가 상자 밖으로 나갈 수 있음)
+            DirtyRects().invalidate(self._text_rect(before[0]).union(self._text_rect(self.text)).union(self.rect))
+        return result
+
+    def _text_rect(self, text):
+        return pygame.Rect((self.rect.x + INPUT_TEXT_PADDING, self.rect.y + INPUT_TEXT_PADDING), self.font.size(text))
 
     def update(self):
         pass # 현재는 특별한 업데이트 로직 없음
 
     def draw(self, screen):
         # 텍스트 색상을 검은색으로 변경
-        txt_surface = self.font.render(self.text, True, BLACK)
+        txt_surface = render_text(self.font, self.text, BLACK)
         screen.blit(txt_surface, (self.rect.x + INPUT_TEXT_PADDING, self.rect.y + INPUT_TEXT_PADDING))
         pygame.draw.rect(screen, self.color, self.rect, BUTTON_BORDER_THICKNESS)
\ No newline at end of file
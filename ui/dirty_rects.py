@@ -0,0 +1,45 @@
+import threading
+import pygame
+
+
+class DirtyRects:
+    """
+    [신규] 다시 그려야 하는 화면 영역을 모으는 싱글톤. (더티 렉트 렌더링, config.DIRTY_RECT_RENDERING)
+    - 컴포넌트와 Scene은 보이는 상태가 바뀔 때(호버, 토글, 입력, 스크롤, 팝업 등) invalidate()로 영역을 알립니다.
+    - 화면 전체가 바뀌면 invalidate_all()을 호출합니다. (Scene 전환, 팝업 열기/닫기, 티켓 변경 등)
+    - 메인 루프는 매 프레임 take()로 모인 영역을 가져가 그 부분만 다시 그리고 display.update(rects)로 내보냅니다.
+    UserState 구독 콜백처럼 DB 쓰기 스레드에서도 호출될 수 있으므로 잠금으로 보호합니다.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(DirtyRects, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._rects = []
+        self._full = True # 첫 프레임은 전체를 그림
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def invalidate(self, rect):
+        with self._lock:
+            if not self._full:
+                self._rects.append(pygame.Rect(rect))
+
+    def invalidate_all(self):
+        with self._lock:
+            self._full = True
+            self._rects.clear()
+
+    def take(self):
+        """모인 영역을 반환하고 비웁니다. 화면 전체를 다시 그려야 하면 None, 바뀐 것이 없으면 빈 리스트"""
+        with self._lock:
+            rects = None if self._full else self._rects
+            self._rects = []
+            self._full = False
+        return rects
@@ -1,8 +1,9 @@
 import pygame
-import os
 import random
 from config import *
 from game_systems.fighter_data import FighterData
+from ui.sprite_cache import SpriteCache, PORTRAIT_SIZE
+from ui.text_cache import get_sys_font, render_text
 
 class FighterView(pygame.sprite.Sprite):
     """
@@ -19,7 +20,7 @@ class FighterView(pygame.sprite.Sprite):
         # Pygame 관련 속성
         self.image = None
         self.rect = pygame.Rect(self.data.x, self.data.y, 100, 100)
-        self.hud_font = pygame.font.Font(None, 20)
+        self.name_font = get_sys_font(12) # [수정] 이미지가 없을 때 이름 표시용 (매 프레임 생성하지 않음)
         
         # 애니메이션 상태
         self.offset_x = 0
@@ -30,18 +31,8 @@ class FighterView(pygame.sprite.Sprite):
         self._load_image(self.data.image_path)
 
     def _load_image(self, image_path):
-        if not image_path: return
-        full_path = os.path.join(ASSETS_DIR, "images", image_path)
-        if not os.path.exists(full_path):
-            print(f"[Warning] 이미지 파일을 찾을 수 없습니다: {full_path}")
-            self.image = None
-            return
-        try:
-            loaded_img = pygame.image.load(full_path).convert_alpha()
-            self.image = pygame.transform.smoothscale(loaded_img, (100, 120))
-        except pygame.error as e:
-            print(f"[Error] 이미지 로드 실패: {self.data.name} ({full_path}) - {e}")
-            self.image = None
+        """[수정] SpriteCache에서 가져옵니다. (미리 불러온 이미지는 디스크 I/O 없음)"""
+        self.image = SpriteCache().get(image_path, PORTRAIT_SIZE)
 
     def take_damage_animation(self):
         """피격 시 흔들리는 애니메이션을 재생합니다."""
@@ -79,14 +70,13 @@ class FighterView(pygame.sprite.Sprite):
         
         # 캐릭터 그리기
         if self.image:
-            temp_image = self.image.copy()
-            temp_image.set_alpha(self.alpha)
-            screen.blit(temp_image, draw_rect)
+            # [수정] 페이드 중에는 SpriteCache가 미리 구운 프레임을 사용 (매 프레임 copy() 없음)
+            image = self.image if self.alpha >= 255 else SpriteCache().get_faded(self.data.image_path, PORTRAIT_SIZE, self.alpha)
+            screen.blit(image, draw_rect)
         else: # 이미지가 없을 경우 사각형으로 대체
             color = RED if self.data.is_enemy else BLUE
             pygame.draw.rect(screen, color, draw_rect)
-            font = pygame.font.SysFont("malgungothic", 12)
-            screen.blit(font.render(self.data.name, True, WHITE), (draw_rect.x, draw_rect.y + 40))
+            screen.blit(render_text(self.name_font, self.data.name, WHITE), (draw_rect.x, draw_rect.y + 40))
 
         # 상태 바 그리기
         bar_width = 100
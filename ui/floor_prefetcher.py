@@ -0,0 +1,52 @@
+import threading
+from database import ConnectionManager
+from ui.audio_manager import AudioManager
+from ui.sprite_cache import SpriteCache, PORTRAIT_SIZE
+
+
+class FloorPrefetcher:
+    """
+    [신규] 보상 팝업이 떠 있는 동안 다음 층에 필요한 자원을 작업 스레드에서 미리 준비합니다.
+    - 등반 계획(RunPlan)에서 적 데이터를 확정하고, 적 이미지를 디코딩/스케일하고, 다음 BGM 파일을 읽어 둡니다.
+    - 배경 이미지는 BackgroundManager가 시작할 때 모두 불러 두므로 별도 작업이 없습니다.
+    BattleScene은 다음 층 전투를 준비할 때 take()로 결과만 받아 가므로 메인 스레드에서 I/O가 생기지 않습니다.
+    """
+    TAKE_TIMEOUT = 0.1 # take()가 렌더링 스레드에서 작업 완료를 기다리는 최대 시간(초)
+
+    def __init__(self):
+        self._job = None
+
+    def start(self, run_plan, floor):
+        """floor 층의 자원 준비를 시작합니다. 이전 작업의 결과는 버립니다."""
+        job = {"floor": floor, "enemy_data": None, "done": threading.Event()}
+        self._job = job
+        threading.Thread(target=self._run, args=(run_plan, job), name=f"prefetch-{floor}F", daemon=True).start()
+
+    @staticmethod
+    def _run(run_plan, job):
+        floor = job["floor"]
+        try:
+            enemy_data = run_plan.get_enemy_data(floor)
+            sprite_cache = SpriteCache()
+            for data in enemy_data:
+                sprite_cache.prefetch(data['image'], PORTRAIT_SIZE)
+            AudioManager().stage_bgm(run_plan.get_current_bgm_name(floor))
+            job["enemy_data"] = enemy_data
+        except Exception as e:
+            print(f"[Warning] {floor}층 미리 불러오기 실패: {e}")
+        finally:
+            ConnectionManager().close() # MasterData 재로드 등으로 이 스레드에서 연 연결 정리
+            job["done"].set()
+
+    def take(self, floor):
+        """
+        floor 층의 미리 준비된 적 데이터를 반환합니다. 작업이 아직 진행 중이면 TAKE_TIMEOUT까지만 기다립니다.
+        다른 층을 준비했거나, 실패했거나, 시간 안에 끝나지 않은 경우 None (호출한 쪽에서 직접 준비)
+        """
+        job, self._job = self._job, None
+        if job is None or job["floor"] != floor:
+            return None
+        if not job["done"].wait(self.TAKE_TIMEOUT):
+            print(f"[Warning] {floor}층 미리 불러오기가 끝나지 않아 직접 준비합니다.")
+            return None
+        return job["enemy_data"]
@@ -0,0 +1,80 @@
+import pygame
+
+
+class GlyphAtlas:
+    """
+    [신규] 숫자/기호 글리프를 (폰트, 색상) 단위로 미리 구워 두고,
+    문자열을 Surface.blits로 이어 붙여 그리는 렌더러.
+    - 데미지 숫자, 게이지 'cur/max', '[Lv.N]'처럼 값이 자주 바뀌는 짧은 수치 텍스트용입니다.
+      값이 바뀔 때마다 font.render로 래스터화하거나 새 Surface를 만들지 않습니다.
+    - 글리프는 각각 RLE로 인코딩해 투명한 부분의 블렌딩을 건너뜁니다.
+      (한 장의 시트에서 영역을 잘라 그리면 RLE 행을 매번 처음부터 풀어야 해서 오히려 느림)
+    - 반투명(페이드 아웃)은 ALPHA_STEP 단위로 미리 구운 글리프 세트로 그립니다. (set_alpha로 RLE를 다시 만들지 않음)
+    - CHARSET에 없는 문자가 섞인 문자열은 supports()가 False이므로 TextCache(render_text)로 그립니다.
+    - 글자 단위로 이어 붙이므로 커닝은 적용되지 않습니다. (숫자/기호는 차이가 없음)
+    메인 스레드에서만 사용합니다. (convert_alpha()가 디스플레이 포맷에 의존)
+    """
+    CHARSET = "0123456789+-/.:%[]Lv "
+    ALPHA_STEP = 15 # FloatingText의 프레임당 알파 감소량과 같음
+    _atlases = {} # (폰트, 색상) → GlyphAtlas
+
+    @classmethod
+    def get(cls, font, color):
+        """(폰트, 색상)에 해당하는 아틀라스를 반환합니다. 처음 요청할 때 한 번만 굽습니다."""
+        key = (font, tuple(color))
+        atlas = cls._atlases.get(key)
+        if atlas is None:
+            atlas = cls._atlases[key] = cls(font, color)
+        return atlas
+
+    @classmethod
+    def supports(cls, text):
+        return all(ch in cls.CHARSET for ch in text)
+
+    def __init__(self, font, color):
+        glyphs = {ch: self._encode(font.render(ch, True, color)) for ch in self.CHARSET}
+        self.height = max(glyph.get_height() for glyph in glyphs.values())
+        self._advances = {ch: glyph.get_width() for ch, glyph in glyphs.items()} # 문자 → 가로 폭
+        self._glyphs = {255: glyphs} # 알파 → {문자: 글리프 Surface}
+
+    @staticmethod
+    def _encode(surface):
+        surface = surface.convert_alpha()
+        surface.set_alpha(255, pygame.RLEACCEL) # None이면 픽셀 알파 블렌딩이 꺼지므로 255
+        return surface
+
+    def _glyphs_for(self, alpha):
+        alpha = min(255, round(alpha / self.ALPHA_STEP) * self.ALPHA_STEP)
+        glyphs = self._glyphs.get(alpha)
+        if glyphs is None:
+            glyphs = {}
+            for ch, glyph in self._glyphs[255].items():
+                faded = glyph.copy()
+                faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                glyphs[ch] = self._encode(faded)
+            self._glyphs[alpha] = glyphs
+        return glyphs
+
+    def width(self, text):
+        advances = self._advances
+        return sum(advances[ch] for ch in text)
+
+    def get_rect(self, text, **kwargs):
+        """text를 그렸을 때의 Rect를 반환합니다. (Surface.get_rect처럼 center=, topleft= 등 지정)"""
+        rect = pygame.Rect(0, 0, self.width(text), self.height)
+        for attr, value in kwargs.items():
+            setattr(rect, attr, value)
+        return rect
+
+    def draw(self, surface, text, pos, alpha=255):
+        """text를 pos(왼쪽 위)부터 그립니다."""
+        if alpha <= 0:
+            return
+        glyphs = self._glyphs[255] if alpha >= 255 else self._glyphs_for(alpha)
+        advances = self._advances
+        x, y = pos
+        sequence = []
+        for ch in text:
+            sequence.append((glyphs[ch], (x, y)))
+            x += advances[ch]
+        surface.blits(sequence, doreturn=False)
@@ -0,0 +1,52 @@
+import pygame
+from config import BLACK
+
+_overlays = {} # (크기, 알파, 색상) → 반투명 단색 Surface
+
+
+def get_overlay(size, alpha, color=BLACK):
+    """
+    [신규] 화면을 어둡게 덮는 반투명 단색 Surface를 반환합니다. (크기, 알파, 색상) 단위로 한 번만 만들어 공유합니다.
+    팝업 배경, 시스템 메시지 배경, 피격 이펙트처럼 매 프레임 같은 오버레이를 새로 만들던 곳에서 사용합니다.
+    반환된 Surface는 공유되므로 수정하지 않습니다.
+    """
+    key = (tuple(size), alpha, tuple(color))
+    overlay = _overlays.get(key)
+    if overlay is None:
+        overlay = pygame.Surface(size).convert()
+        overlay.fill(color)
+        overlay.set_alpha(alpha)
+        _overlays[key] = overlay
+    return overlay
+
+
+class StaticLayer:
+    """
+    [신규] 입력이 바뀔 때만 다시 그리는 정적 레이어.
+    - compose(surface, key)로 레이어를 그려 두고, get(key)의 key가 이전과 같으면 그려 둔 Surface를 그대로 반환합니다.
+    - key에는 레이어 모양을 결정하는 값(배경 Surface, 선택 상태 등)을 넣습니다.
+    - alpha=True이면 투명한 부분이 있는 레이어(SRCALPHA), 아니면 화면 포맷의 불투명 레이어입니다.
+    매 프레임 선, 사각형, 고정 텍스트를 다시 그리지 않고 Surface 한 장을 blit 합니다.
+    """
+    _UNSET = object()
+
+    def __init__(self, size, compose, alpha=False):
+        self.size = size
+        self._compose = compose
+        self._alpha = alpha
+        self._key = self._UNSET
+        self.surface = None
+
+    def get(self, key=None):
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size, pygame.SRCALPHA).convert_alpha() if self._alpha else pygame.Surface(self.size).convert()
+        if self._key is self._UNSET or key != self._key:
+            if self._alpha:
+                self.surface.fill((0, 0, 0, 0))
+            self._compose(self.surface, key)
+            self._key = key
+        return self.surface
+
+    def invalidate(self):
+        """다음 get()에서 다시 그리도록 합니다."""
+        self._key = self._UNSET
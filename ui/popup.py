@@ -1,11 +1,6 @@
 import pygame
-import os
 from ui.components import Button, Action
-
-# Font paths
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-FONT_PATH_LIGHT = os.path.join(BASE_DIR, "assets", "fonts", "Maplestory Light.ttf")
-FONT_PATH_BOLD = os.path.join(BASE_DIR, "assets", "fonts", "Maplestory Bold.ttf")
+from ui.text_cache import create_font, render_text
 
 class BasePopup:
     def __init__(self, scene):
@@ -34,8 +29,9 @@ class CharacterDetailPopup(BasePopup):
         self.fighter_data = fighter_data
         
         # Define colors and fonts
-        self.font = pygame.font.Font(FONT_PATH_BOLD, 36)
-        self.small_font = pygame.font.Font(FONT_PATH_LIGHT, 28)
+        self.font = create_font(36, is_bold=True)
+        self.small_font = create_font(28)
+        self.desc_font = create_font(24)
         self.text_color = (255, 255, 255)
         self.bar_color = (0, 128, 255)
         self.bar_bg_color = (50, 50, 50)
@@ -78,7 +74,7 @@ class CharacterDetailPopup(BasePopup):
         pygame.draw.rect(self.screen, (100, 100, 120), self.popup_rect, 2, border_radius=10)
 
         # Draw Title
-        title_text = self.font.render(f"{self.fighter_data.name} (Lv. {self.fighter_data.level})", True, self.text_color)
+        title_text = render_text(self.font, f"{self.fighter_data.name} (Lv. {self.fighter_data.level})", self.text_color)
         self.screen.blit(title_text, (self.popup_rect.centerx - title_text.get_width() // 2, self.popup_rect.top + 20))
 
         # Draw Stats
@@ -91,20 +87,20 @@ class CharacterDetailPopup(BasePopup):
         }
         y_offset = self.popup_rect.top + 70
         for i, (stat, value) in enumerate(stats.items()):
-            stat_text = self.small_font.render(f"{stat}: {value}", True, self.text_color)
+            stat_text = render_text(self.small_font, f"{stat}: {value}", self.text_color)
             self.screen.blit(stat_text, (self.popup_rect.left + 40, y_offset + i * 35))
 
         # Draw Skill
-        skills_title = self.font.render("Skill", True, self.text_color)
+        skills_title = render_text(self.font, "Skill", self.text_color)
         self.screen.blit(skills_title, (self.popup_rect.left + 40, y_offset + len(stats) * 35 + 20))
         y_offset += len(stats) * 35 + 50
 
-        skill_name_surf = self.small_font.render(f"[{self.fighter_data.skill_name}]", True, (255, 215, 0))
+        skill_name_surf = render_text(self.small_font, f"[{self.fighter_data.skill_name}]", (255, 215, 0))
         self.screen.blit(skill_name_surf, (self.popup_rect.left + 40, y_offset))
 
         # Basic text wrapping for description
         if self.fighter_data.skill_description:
-            desc_font = pygame.font.Font(FONT_PATH_LIGHT, 24)
+            desc_font = self.desc_font
             words = self.fighter_data.skill_description.split(' ')
             lines = []
             current_line = ""
@@ -120,7 +116,7 @@ class CharacterDetailPopup(BasePopup):
             lines.append(current_line)
 
             for i, line in enumerate(lines):
-                desc_surf = desc_font.render(line, True, (200, 200, 200))
+                desc_surf = render_text(desc_font, line, (200, 200, 200))
                 self.screen.blit(desc_surf, (self.popup_rect.left + 50, y_offset + 35 + i * 25))
         
         
@@ -148,7 +144,7 @@ class CharacterDetailPopup(BasePopup):
         pygame.draw.rect(self.screen, self.text_color, self.exp_bar_rect, 2)
 
         # Text
-        exp_text = self.small_font.render(f"EXP: {self.fighter_data.exp} / {self.fighter_data.max_exp}", True, self.text_color)
+        exp_text = render_text(self.small_font, f"EXP: {self.fighter_data.exp} / {self.fighter_data.max_exp}", self.text_color)
         self.screen.blit(exp_text, (self.exp_bar_rect.centerx - exp_text.get_width() // 2, self.exp_bar_rect.top - 25))
 
     def handle_event(self, event):
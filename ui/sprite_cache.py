@@ -0,0 +1,113 @@
+import os
+import threading
+from collections import OrderedDict
+import pygame
+from config import ASSETS_DIR
+
+PORTRAIT_SIZE = (100, 120) # 전투 화면 캐릭터/적 이미지 크기
+FADE_STEP = 5 # FighterView 사망 페이드의 프레임당 알파 감소량 (미리 굽는 페이드 프레임의 간격)
+
+
+class SpriteCache:
+    """
+    [신규] 전투 이미지(초상화)의 디코딩/스케일 결과를 경로와 크기 단위로 캐싱하는 싱글톤.
+    - prefetch(): 작업 스레드에서 파일을 읽어 디코딩하고 스케일까지 끝내 둡니다. (디스크 I/O)
+    - get(): 메인 스레드에서 호출. 준비된 이미지는 convert_alpha()만 하고(I/O 없음), 없으면 그 자리에서 로드합니다.
+    - get_scaled(): 원본 크기 이미지를 배율로 스케일한 결과를 캐싱합니다. (뽑기 결과 화면)
+    - get_faded(): 알파를 픽셀에 미리 곱한 페이드 프레임을 FADE_STEP 단위로 캐싱합니다.
+      매 프레임 copy() + set_alpha()로 Surface를 새로 만들지 않습니다.
+      [수정] 페이드 프레임은 MAX_FADED_FRAMES개까지만 LRU로 보관합니다. (등반 중 만나는 적마다 쌓이지 않도록)
+    FighterView, CharacterCard, 뽑기 결과 화면이 같은 캐시를 공유합니다.
+    convert_alpha()는 디스플레이 포맷에 의존하므로 메인 스레드에서만 수행합니다.
+    """
+    _instance = None
+    MAX_FADED_FRAMES = 256 # 초상화 한 장의 페이드 전체(255 / FADE_STEP = 51장)를 5명분 정도 보관
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SpriteCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._surfaces = {} # (경로, 크기) → 화면 포맷으로 변환된 Surface (없는 파일은 None)
+        self._staged = {}   # (경로, 크기) → 작업 스레드가 디코딩/스케일한 Surface
+        self._faded = OrderedDict() # (경로, 크기, 알파) → 알파를 미리 곱한 Surface (최근에 쓴 것이 뒤)
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    @staticmethod
+    def _decode(image_path, size):
+        """파일을 읽어 size로 스케일한 Surface를 반환합니다. (size가 None이면 원본 크기) 파일이 없거나 실패하면 None"""
+        full_path = os.path.join(ASSETS_DIR, "images", image_path)
+        if not os.path.exists(full_path):
+            print(f"[Warning] 이미지 파일을 찾을 수 없습니다: {full_path}")
+            return None
+        try:
+            image = pygame.image.load(full_path)
+            return pygame.transform.smoothscale(image, size) if size else image
+        except pygame.error as e:
+            print(f"[Error] 이미지 로드 실패: ({full_path}) - {e}")
+            return None
+
+    def prefetch(self, image_path, size=PORTRAIT_SIZE):
+        """[작업 스레드] 아직 캐시에 없는 이미지를 미리 디코딩/스케일해 둡니다."""
+        if not image_path:
+            return
+        key = (image_path, size)
+        with self._lock:
+            if key in self._surfaces or key in self._staged:
+                return
+        surface = self._decode(image_path, size)
+        with self._lock:
+            self._staged[key] = surface
+
+    def get(self, image_path, size=PORTRAIT_SIZE):
+        """[메인 스레드] 화면에 바로 그릴 수 있는 Surface를 반환합니다. 이미지가 없으면 None"""
+        if not image_path:
+            return None
+        key = (image_path, size)
+        if key in self._surfaces:
+            return self._surfaces[key]
+        with self._lock:
+            staged = self._staged.pop(key, False)
+        surface = staged if staged is not False else self._decode(image_path, size)
+        if surface is not None:
+            surface = surface.convert_alpha()
+        self._surfaces[key] = surface
+        return surface
+
+    def get_scaled(self, image_path, scale):
+        """[메인 스레드] 원본 크기 이미지를 scale배 한 Surface를 반환합니다. (원본은 한 번만 디코딩)"""
+        original = self.get(image_path, None)
+        if original is None or scale == 1:
+            return original
+        width, height = original.get_size()
+        key = (image_path, (int(width * scale), int(height * scale)))
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = pygame.transform.smoothscale(original, key[1])
+        return surface
+
+    def get_faded(self, image_path, size, alpha):
+        """
+        [메인 스레드] alpha만큼 투명해진 이미지를 반환합니다. 이미지가 없으면 None
+        알파는 FADE_STEP 단위로 맞추고, 단계마다 처음 요청할 때 한 번만 만듭니다.
+        """
+        surface = self.get(image_path, size)
+        if surface is None or alpha >= 255:
+            return surface
+        alpha = max(0, round(alpha / FADE_STEP) * FADE_STEP)
+        key = (image_path, size, alpha)
+        faded = self._faded.get(key)
+        if faded is not None:
+            self._faded.move_to_end(key)
+            return faded
+        faded = surface.copy()
+        faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        self._faded[key] = faded
+        if len(self._faded) > self.MAX_FADED_FRAMES:
+            self._faded.popitem(last=False)
+        return faded
@@ -0,0 +1,117 @@
+import os
+from collections import OrderedDict
+import pygame
+from config import ASSETS_DIR
+
+SYSTEM_FONT_NAME = "malgungothic" # 게임 폰트 파일이 없을 때, 또는 시스템 폰트를 직접 요청할 때 사용
+
+
+class FontRegistry:
+    """
+    [신규] 폰트 객체를 (서체, 크기, 굵기) 단위로 한 번만 생성해 공유하는 싱글톤.
+    pygame.font.SysFont는 호출할 때마다 시스템 폰트 목록을 검색하고 파일을 다시 열기 때문에
+    draw()에서 직접 생성하지 않고 여기서 받아 씁니다.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FontRegistry, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._fonts = {} # (시스템 폰트 이름 또는 None, 크기, 굵기) → pygame.font.Font
+        self._initialized = True
+
+    def get(self, size, is_bold=False, sys_name=None):
+        """
+        폰트를 반환합니다. sys_name이 없으면 게임 폰트(Maplestory)를,
+        있으면 해당 시스템 폰트를 사용합니다.
+        """
+        key = (sys_name, size, is_bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._load(size, is_bold) if sys_name is None else pygame.font.SysFont(sys_name, size, bold=is_bold)
+            self._fonts[key] = font
+        return font
+
+    @staticmethod
+    def _load(size, is_bold):
+        font_name = "Maplestory Bold.ttf" if is_bold else "Maplestory Light.ttf"
+        font_path = os.path.join(ASSETS_DIR, "fonts", font_name)
+        try:
+            return pygame.font.Font(font_path, size)
+        except (pygame.error, FileNotFoundError):
+            print(f"[Warning] 폰트 '{font_name}'을(를) 찾을 수 없습니다: '{font_path}'. 기본 폰트를 사용합니다.")
+            return pygame.font.SysFont(SYSTEM_FONT_NAME, size, bold=is_bold)
+
+
+class TextCache:
+    """
+    [신규] 렌더링된 텍스트 Surface를 (폰트, 문자열, 색상, 안티앨리어싱) 단위로 캐싱하는 LRU 싱글톤.
+    - 매 프레임 같은 문자열을 다시 래스터화하지 않습니다. (버튼 라벨, 이름, 스탯 등)
+    - MAX_ENTRIES를 넘으면 가장 오래 쓰이지 않은 Surface부터 버립니다. (바뀌는 수치 텍스트가 쌓이지 않도록)
+    - hits/misses로 적중률을 확인할 수 있습니다.
+    반환된 Surface는 여러 곳에서 공유하므로 set_alpha() 등으로 수정하지 말고, 필요하면 copy()해서 씁니다.
+    메인 스레드에서만 사용합니다.
+    """
+    _instance = None
+    MAX_ENTRIES = 512
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TextCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._surfaces = OrderedDict() # (폰트, 문자열, 색상, 안티앨리어싱) → Surface (최근에 쓴 것이 뒤)
+        self.hits = 0
+        self.misses = 0
+        self._initialized = True
+
+    def render(self, font, text, color, antialias=True):
+        """font.render(text, antialias, color)와 같은 Surface를 반환합니다. (캐시에 있으면 재사용)"""
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.MAX_ENTRIES:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def create_font(size, is_bold=False):
+    """지정된 크기와 굵기의 게임 폰트를 반환합니다. [수정] FontRegistry에서 공유"""
+    return FontRegistry().get(size, is_bold)
+
+
+def get_sys_font(size, is_bold=False, name=SYSTEM_FONT_NAME):
+    """[신규] 시스템 폰트를 반환합니다. (FontRegistry에서 공유)"""
+    return FontRegistry().get(size, is_bold, sys_name=name)
+
+
+def render_text(font, text, color, antialias=True):
+    """[신규] TextCache를 거쳐 텍스트를 렌더링합니다."""
+    return TextCache().render(font, text, color, antialias)
@@ -1,5 +1,7 @@
-import pygame
 from config import RED
+from ui.text_cache import get_sys_font, render_text
+from ui.glyph_atlas import GlyphAtlas
+from ui.layer_cache import get_overlay
 
 class FloatingText:
     def __init__(self, x, y, text, color, duration=60, speed=-1):
@@ -10,7 +12,9 @@ class FloatingText:
         self.duration = duration
         self.speed = speed
         self.alpha = 255
-        self.font = pygame.font.SysFont("malgungothic", 36)
+        self.font = get_sys_font(36)
+        # [신규] 데미지 숫자처럼 숫자/기호로만 된 텍스트는 글리프 아틀라스로 그림
+        self.atlas = GlyphAtlas.get(self.font, color) if GlyphAtlas.supports(text) else None
 
     def update(self):
         self.y += self.speed
@@ -19,8 +23,13 @@ class FloatingText:
             self.alpha = max(0, self.alpha - 15)
 
     def draw(self, surface):
-        text_surface = self.font.render(self.text, True, self.color)
-        text_surface.set_alpha(self.alpha)
+        if self.atlas:
+            self.atlas.draw(surface, self.text, (self.x, self.y), self.alpha)
+            return
+        text_surface = render_text(self.font, self.text, self.color)
+        if self.alpha < 255: # 캐시된 Surface는 공유되므로 알파를 바꿀 때는 복사본에 적용
+            text_surface = text_surface.copy()
+            text_surface.set_alpha(self.alpha)
         surface.blit(text_surface, (self.x, self.y))
 
 class HitEffect:
@@ -39,10 +48,8 @@ class HitEffect:
 
     def draw(self, surface):
         if self.alpha > 0:
-            # 알파 값을 적용하기 위해 별도의 Surface에 그림
-            effect_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-            effect_surface.fill((self.color[0], self.color[1], self.color[2], self.alpha))
-            surface.blit(effect_surface, self.rect.topleft)
+            # [수정] 알파 단계별 반투명 Surface를 공유 (매 프레임 SRCALPHA Surface를 새로 만들지 않음)
+            surface.blit(get_overlay(self.rect.size, self.alpha, self.color), self.rect.topleft)
 
 class VFXManager:
     """[Refactored] 모든 시각 효과(텍스트, 도형 등)를 관리"""